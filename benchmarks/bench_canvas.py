@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Terminal preview cost per frame: TerminalCanvas differential redraw against
+printing every row in full, for a moving rainbow over a mostly static layout.
+
+    $ python benchmarks/bench_canvas.py [-W 160] [-H 90] [-f 300]
+
+Output goes to a StringIO, so this is the cost of building the frames plus
+the characters that would cross the wire.
+"""
+import argparse
+import io
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.tools.canvas import TerminalCanvas
+
+
+def frames(width, height, count, moving):
+    "a static background with a `moving` pixel wide rainbow band sweeping across"
+    y, x = np.mgrid[0:height, 0:width]
+    hsv = np.empty((height, width, 3))
+    hsv[..., 0] = (x + y) / float(width + height)
+    hsv[..., 1] = 0.6
+    hsv[..., 2] = 0.3
+    base = batch.hsv_to_rgb(hsv.reshape(-1, 3)).reshape(height, width, 3)
+    for i in range(count):
+        frame = base.copy()
+        band = (np.arange(moving) + i) % width
+        hsv_band = np.stack(
+            [(band / width + i / 50.0) % 1.0, np.ones(moving), np.ones(moving)], axis=-1
+        )
+        frame[:, band] = batch.hsv_to_rgb(hsv_band)[None, :, :]
+        yield frame
+
+
+def full_rows(frame):
+    "every cell's escapes and block, every frame, the way printing lines does"
+    out = []
+    for r in range(0, frame.shape[0] - 1, 2):
+        for top, bottom in zip(frame[r].tolist(), frame[r + 1].tolist()):
+            out.append("\x1b[38;2;%d;%d;%dm\x1b[48;2;%d;%d;%dm▀" % (*top, *bottom))
+        out.append("\x1b[0m\n")
+    return "".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-W", "--width", type=int, default=160)
+    parser.add_argument("-H", "--height", type=int, default=90)
+    parser.add_argument("-f", "--frames", type=int, default=300)
+    parser.add_argument("-m", "--moving", type=int, default=8, help="band width")
+    args = parser.parse_args()
+
+    todo = list(frames(args.width, args.height, args.frames, args.moving))
+    print(f"{args.width}x{args.height} pixels, {args.frames} frames")
+
+    t0 = time.perf_counter()
+    chars = sum(len(full_rows(f)) for f in todo)
+    t = time.perf_counter() - t0
+    print(
+        f"  full rows   {t / len(todo) * 1e3:8.2f} ms/frame{chars / len(todo):10.0f} chars/frame"
+    )
+
+    canvas = TerminalCanvas(args.width, args.height, stream=io.StringIO())
+    t0 = time.perf_counter()
+    for f in todo:
+        canvas.draw(f)
+    t = time.perf_counter() - t0
+    print(
+        f"  canvas      {t / len(todo) * 1e3:8.2f} ms/frame"
+        f"{canvas.chars_written / len(todo):10.0f} chars/frame"
+    )
+
+
+if __name__ == "__main__":
+    main()
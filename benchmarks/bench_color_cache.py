@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Per object memory and repeated access cost of Color, against a copy of the
+pre-cache (dict based, recompute on every access) Color kept here as LegacyColor.
+
+    $ python benchmarks/bench_color_cache.py [-n 20000]
+"""
+import argparse
+import random
+import timeit
+import tracemalloc
+
+from rgbw_colorspace_converter.colors.converters import (
+    Color,
+    clamp,
+    constrain,
+    hsi_to_rgbw,
+    hsv_to_hsl,
+    hsv_to_rgb,
+    is_hsv_tuple,
+    rgb_to_hsi,
+)
+
+
+class LegacyColor:
+    "Color as it was before __slots__ and caching, minus the setters"
+
+    def __init__(self, hsv_tuple):
+        assert is_hsv_tuple(hsv_tuple)
+        self.hsv_t = list(hsv_tuple)
+
+    def __repr__(self):
+        return f"rgb={self.rgb} rgbw={self.rgbw} hsv={self.hsv} hsl={self.hsl} hsi={self.hsi} hex={self.hex}"
+
+    @property
+    def rgbw(self):
+        hsi = rgb_to_hsi(self.rgb[0], self.rgb[1], self.rgb[2])
+        return hsi_to_rgbw(hsi[0], hsi[1], hsi[2])
+
+    @property
+    def hsi(self):
+        return rgb_to_hsi(self.rgb[0], self.rgb[1], self.rgb[2])
+
+    @property
+    def rgb(self):
+        return hsv_to_rgb((self.hsv_t[0], self.hsv_t[1], self.hsv_t[2]))
+
+    @property
+    def hsv(self):
+        return (self.hsv_t[0], self.hsv_t[1], self.hsv_t[2])
+
+    @property
+    def hex(self):
+        return "#%02x%02x%02x" % self.rgb
+
+    @property
+    def hsl(self):
+        (h, s, l) = hsv_to_hsl(self.hsv_t[0], self.hsv_t[1], self.hsv_t[2])
+        return (constrain(h * 360.0, 0.0, 360.0), s, l)
+
+    @property
+    def hsv_h(self):
+        return self.hsv_t[0]
+
+    @hsv_h.setter
+    def hsv_h(self, val):
+        self.hsv_t[0] = round(clamp(val, 0.0, 1.0), 8)
+
+
+def bytes_per_object(cls, hsvs, warm):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objs = [cls(t) for t in hsvs]
+    if warm:
+        for o in objs:
+            o.rgbw, o.hsl, o.hex
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    del objs
+    return size / len(hsvs)
+
+
+def per_call_us(stmt, number, **names):
+    return (
+        min(timeit.repeat(stmt, number=number, repeat=5, globals=names)) / number * 1e6
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=20000, help="objects to allocate")
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    hsvs = [(rnd.random(), rnd.random(), rnd.random()) for _ in range(args.n)]
+
+    print(f"{'':28}{'legacy':>12}{'slotted':>12}")
+    for label, warm in (("bytes/object, fresh", False), ("bytes/object, warm", True)):
+        old = bytes_per_object(LegacyColor, hsvs, warm)
+        new = bytes_per_object(Color, hsvs, warm)
+        print(f"{label:28}{old:12.0f}{new:12.0f}")
+
+    old, new = LegacyColor(hsvs[0]), Color(hsvs[0])
+    for prop in ("c.rgb", "c.rgbw", "c.hsi", "c.hsl", "c.hex", "repr(c)"):
+        o = per_call_us(prop, 20000, c=old)
+        n = per_call_us(prop, 20000, c=new)
+        print(f"{'us/access, ' + prop:28}{o:12.2f}{n:12.2f}")
+
+    def legacy_dim():
+        old.hsv_h = (old.hsv_h + 0.001) % 1.0
+        return old.rgbw
+
+    def slotted_dim():
+        new.hsv_h = (new.hsv_h + 0.001) % 1.0
+        return new.rgbw
+
+    o = per_call_us(legacy_dim, 20000)
+    n = per_call_us(slotted_dim, 20000)
+    print(f"{'us/set hsv_h + rgbw':28}{o:12.2f}{n:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+HSV -> RGBW for one frame, the chained path (hsv_to_rgb -> rgb_to_hsi ->
+hsi_to_rgbw) against the fused hsv_to_rgbw, scalar and batch.
+
+    $ python benchmarks/bench_fused.py [-n 40000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors.converters import (
+    hsi_to_rgbw,
+    hsv_to_rgb,
+    hsv_to_rgbw,
+    rgb_to_hsi,
+)
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=40000, help="pixels per frame")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    hsv = np.random.default_rng(5).random((args.n, 3))
+    rows = [tuple(t) for t in hsv.tolist()]
+    out = np.empty((args.n, 4), dtype=np.uint8)
+
+    def scalar_chain():
+        for t in rows:
+            r, g, b = hsv_to_rgb(t)
+            hsi = rgb_to_hsi(r, g, b)
+            hsi_to_rgbw(hsi[0], hsi[1], hsi[2])
+
+    def scalar_fused():
+        for h, s, v in rows:
+            hsv_to_rgbw(h, s, v)
+
+    def batch_chain():
+        batch.rgb_to_rgbw(batch.hsv_to_rgb(hsv))
+
+    def batch_fused():
+        batch.hsv_to_rgbw(hsv, out=out)
+
+    results = {}
+    for name, fn in (
+        ("scalar chain", scalar_chain),
+        ("scalar fused", scalar_fused),
+        ("batch chain", batch_chain),
+        ("batch fused", batch_fused),
+    ):
+        results[name] = best_of(fn, args.repeat)
+
+    base = results["scalar chain"]
+    print(f"{args.n} pixels per frame")
+    for name, secs in results.items():
+        print(
+            f"{name:14}{secs * 1e3:10.2f} ms/frame{1 / secs:10.1f} fps"
+            f"{base / secs:8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
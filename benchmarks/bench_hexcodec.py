@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Per item throughput of hex parsing and formatting: Hex() / Color.hex one at a
+time against parse_hex / format_hex in bulk.
+
+    $ python benchmarks/bench_hexcodec.py [-n 200000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors.batch import unpack_rgb
+from rgbw_colorspace_converter.colors.converters import Hex, hex_to_rgb
+from rgbw_colorspace_converter.colors.hexcodec import format_hex, parse_hex
+
+
+def legacy_hex(value):
+    "Hex() as it was: a generator, a temporary RGB Color, then the real one"
+    from rgbw_colorspace_converter.colors.converters import RGB, Color
+
+    value = value.lstrip("#")
+    lv = len(value)
+    rgb_t = (int(value[i : i + int(lv / 3)], 16) for i in range(0, lv, int(lv / 3)))
+    return Color(RGB(*rgb_t).hsv_t)
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=200000, help="hex codes per run")
+    args = parser.parse_args()
+
+    rgb = unpack_rgb(np.random.default_rng(1).integers(0, 1 << 24, args.n))
+    text = format_hex(rgb).tolist()
+    blob = b"\n".join(format_hex(rgb, as_bytes=True))
+    tuples = [tuple(t) for t in rgb.tolist()]
+
+    rows = [
+        ("parse: legacy Hex()", lambda: [legacy_hex(t) for t in text]),
+        ("parse: Hex()", lambda: [Hex(t) for t in text]),
+        ("parse: hex_to_rgb", lambda: [hex_to_rgb(t) for t in text]),
+        ("parse: parse_hex(list)", lambda: parse_hex(text)),
+        ("parse: parse_hex(bytes)", lambda: parse_hex(blob)),
+        ("format: '#%02x%02x%02x'", lambda: ["#%02x%02x%02x" % t for t in tuples]),
+        ("format: format_hex", lambda: format_hex(rgb)),
+        ("format: format_hex bytes", lambda: format_hex(rgb, as_bytes=True)),
+    ]
+    base = {}
+    print(f"{args.n} hex codes")
+    for name, fn in rows:
+        rate = args.n / best_of(fn)
+        kind = name.split(":")[0]
+        base.setdefault(kind, rate)
+        print(f"  {name:28}{rate / 1e6:8.2f} M/s{rate / base[kind]:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
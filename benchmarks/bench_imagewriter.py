@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Capture cost per frame: PNG and animated GIF frames written in process by
+tools.imagewriter, for a smooth rainbow (few colors per row, exact GIF
+palette) and for noise (the 3-3-2 fallback and the LZW worst case).
+
+    $ python benchmarks/bench_imagewriter.py [-W 160] [-H 90] [-f 50]
+
+Output goes to a BytesIO, so this is encoding only.
+"""
+import argparse
+import io
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.tools.imagewriter import GIFWriter, write_png
+
+
+def rainbow(width, height, count):
+    x = np.arange(width)
+    for i in range(count):
+        hsv = np.stack(
+            [(x // 8 * 8 / width + i / 50.0) % 1.0, np.ones(width), np.ones(width)],
+            axis=-1,
+        )
+        yield np.broadcast_to(batch.hsv_to_rgb(hsv), (height, width, 3))
+
+
+def noise(width, height, count):
+    rng = np.random.default_rng(0)
+    for _ in range(count):
+        yield rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-W", "--width", type=int, default=160)
+    parser.add_argument("-H", "--height", type=int, default=90)
+    parser.add_argument("-f", "--frames", type=int, default=50)
+    args = parser.parse_args()
+    print(f"{args.width}x{args.height} pixels, {args.frames} frames")
+
+    for name, source in (("rainbow", rainbow), ("noise", noise)):
+        todo = list(source(args.width, args.height, args.frames))
+
+        t0 = time.perf_counter()
+        size = 0
+        for frame in todo:
+            out = io.BytesIO()
+            write_png(out, frame)
+            size += len(out.getvalue())
+        t = time.perf_counter() - t0
+        print(
+            f"  {name:8s} png {t / len(todo) * 1e3:8.2f} ms/frame"
+            f"{size / len(todo) / 1024:8.1f} KiB/frame"
+        )
+
+        out = io.BytesIO()
+        t0 = time.perf_counter()
+        with GIFWriter(out, args.width, args.height) as gif:
+            for frame in todo:
+                gif.add_frame(frame)
+        t = time.perf_counter() - t0
+        print(
+            f"  {name:8s} gif {t / len(todo) * 1e3:8.2f} ms/frame"
+            f"{len(out.getvalue()) / len(todo) / 1024:8.1f} KiB/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
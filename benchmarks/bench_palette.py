@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+xterm-256 quantization per frame: tools.palette's precomputed cube against
+searching the palette for every pixel.
+
+    $ python benchmarks/bench_palette.py [-W 160] [-H 90] [-f 20]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.tools.palette import XTERM_256, cube, quantize
+
+
+def search(frame):
+    "the nearest of the 240 cube and gray entries by exhaustive search"
+    pal = XTERM_256[16:].astype(np.float64)
+    px = frame.reshape(-1, 3).astype(np.float64)
+    d = (pal**2).sum(axis=-1) - 2.0 * (px @ pal.T)
+    return (np.argmin(d, axis=1) + 16).astype(np.uint8).reshape(frame.shape[:2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-W", "--width", type=int, default=160)
+    parser.add_argument("-H", "--height", type=int, default=90)
+    parser.add_argument("-f", "--frames", type=int, default=20)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    todo = [
+        rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+        for _ in range(args.frames)
+    ]
+    print(f"{args.width}x{args.height} pixels, {args.frames} frames")
+
+    t0 = time.perf_counter()
+    cube(256)
+    print(f"  cube build  {(time.perf_counter() - t0) * 1e3:8.2f} ms (once)")
+    for name, fn in (("search", search), ("cube", quantize)):
+        t0 = time.perf_counter()
+        for frame in todo:
+            fn(frame)
+        t = time.perf_counter() - t0
+        print(f"  {name:10s}  {t / len(todo) * 1e3:8.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
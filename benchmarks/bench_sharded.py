@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Frame render time for the sharded renderer at 1, 2, 4 and 8 workers,
+against rendering in the parent process.
+
+    $ python benchmarks/bench_sharded.py [-n 400000] [-w 1 2 4 8]
+
+Scaling stops at the number of cores, past that workers just take turns.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.output.sharded import ShardedRenderer
+
+
+def plasma(index, t):
+    "a few sines per pixel, about what a real effect costs"
+    x = (index % 640) / 640.0
+    y = (index // 640) / 640.0
+    hsv = np.empty((len(index), 3))
+    hsv[:, 0] = (np.sin(x * 7.0 + t) + np.sin(y * 5.0 - t) + 2.0) / 4.0
+    hsv[:, 1] = 1.0
+    hsv[:, 2] = (np.sin((x + y) * 3.0 + t * 2.0) + 1.0) / 2.0
+    return hsv
+
+
+def best_of(renderer, repeat):
+    renderer.render(0.0)  # warm up
+    times = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        renderer.render(i / 30.0)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=400000, help="pixels per frame")
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.n} pixels, {os.cpu_count()} cpus")
+    with ShardedRenderer(plasma, args.n, workers=0) as renderer:
+        base = best_of(renderer, args.repeat)
+    print(f"{'in process':>12}: {base * 1000:8.2f}ms")
+    for workers in args.workers:
+        with ShardedRenderer(plasma, args.n, workers=workers) as renderer:
+            t = best_of(renderer, args.repeat)
+        print(f"{workers:>4} workers: {t * 1000:8.2f}ms  {base / t:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
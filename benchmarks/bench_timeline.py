@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Seeking in a show: a Timeline sampled at frame k against iterating
+multistep_color_transition up to step k, and whole frames of offset pixels
+sampled at once.
+
+    $ python benchmarks/bench_timeline.py [-k 64] [-s 40] [-p 1000]
+"""
+import argparse
+import itertools
+import random
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors.converters import HSV
+from rgbw_colorspace_converter.colors.util.morph import multistep_color_transition
+from rgbw_colorspace_converter.colors.util.timeline import Timeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", "--keyframes", type=int, default=64)
+    parser.add_argument("-s", "--steps", type=int, default=40, help="per segment")
+    parser.add_argument("-p", "--pixels", type=int, default=1000)
+    parser.add_argument("-n", "--seeks", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    keys = [
+        HSV(rng.random(), rng.random(), rng.random()) for _ in range(args.keyframes)
+    ]
+    total = (args.keyframes - 1) * args.steps
+    frames = [rng.randrange(total) for _ in range(args.seeks)]
+    tl = Timeline(keys, durations=float(args.steps))
+    print(f"{args.keyframes} keyframes, {total} steps, {args.seeks} random seeks")
+
+    t0 = time.perf_counter()
+    for k in frames:
+        chain = multistep_color_transition(list(keys), args.steps)
+        next(itertools.islice(chain, k, None)).rgbw
+    t = time.perf_counter() - t0
+    print(f"  multistep, iterate to k {t / len(frames) * 1e6:10.1f} us/seek")
+
+    t0 = time.perf_counter()
+    for k in frames:
+        tl.sample(k).rgbw
+    t = time.perf_counter() - t0
+    print(f"  timeline.sample(k)      {t / len(frames) * 1e6:10.1f} us/seek")
+
+    offsets = np.linspace(0, 10, args.pixels)
+    t0 = time.perf_counter()
+    for k in frames:
+        tl.pixels(k, offsets)
+    t = time.perf_counter() - t0
+    print(
+        f"  timeline.pixels, {args.pixels} px {t / len(frames) * 1e3:8.2f} ms/frame"
+        f" ({t / len(frames) / args.pixels * 1e9:.0f} ns/pixel)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Accuracy and throughput of trig="table" against trig="exact" for hsi_to_rgbw
+and hsi_to_rgb, scalar and batch.
+
+Accuracy is measured over the hsi of every 8 bit rgb (the Color.rgbw path)
+plus random hsi covering the whole input range.
+
+    $ python benchmarks/bench_trig_table.py [-n 40000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors.converters import hsi_to_rgb, hsi_to_rgbw
+
+
+def error_report(name, fn, inputs):
+    worst = 0
+    hist = np.zeros(256, dtype=np.int64)
+    total = 0
+    for hsi in inputs:
+        exact = fn(hsi, trig="exact").astype(np.int16)
+        table = fn(hsi, trig="table").astype(np.int16)
+        err = np.abs(exact - table).max(axis=-1)
+        hist += np.bincount(err, minlength=256)
+        worst = max(worst, int(err.max()))
+        total += len(err)
+    print(f"{name}: max error {worst} LSB over {total} colors")
+    for e in range(worst + 1):
+        print(f"    +/-{e}: {hist[e]:10d} ({100.0 * hist[e] / total:.4f}%)")
+    return worst
+
+
+def all_8bit_hsi():
+    chunk = 1 << 20
+    for start in range(0, 1 << 24, chunk):
+        yield batch.rgb_to_hsi(batch.unpack_rgb(np.arange(start, start + chunk)))
+
+
+def random_hsi(n=1 << 20):
+    rng = np.random.default_rng(9)
+    return [np.stack((rng.uniform(0, 360, n), rng.random(n), rng.random(n)), -1)]
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=40000, help="pixels per frame")
+    parser.add_argument(
+        "--skip-accuracy", action="store_true", help="only time the two modes"
+    )
+    args = parser.parse_args()
+
+    if not args.skip_accuracy:
+        for name, fn in (
+            ("hsi_to_rgbw", batch.hsi_to_rgbw),
+            ("hsi_to_rgb", batch.hsi_to_rgb),
+        ):
+            error_report(f"{name}, every 8 bit rgb", fn, all_8bit_hsi())
+            error_report(f"{name}, random hsi", fn, random_hsi())
+
+    hsi = random_hsi(args.n)[0]
+    rows = [tuple(t) for t in hsi.tolist()]
+    print(f"\n{args.n} pixels per frame{'exact':>14}{'table':>14}")
+    for name, scalar, vector in (
+        ("hsi_to_rgbw", hsi_to_rgbw, batch.hsi_to_rgbw),
+        ("hsi_to_rgb", hsi_to_rgb, batch.hsi_to_rgb),
+    ):
+        t = [
+            best_of(lambda: [scalar(h, s, i, trig) for (h, s, i) in rows], 3)
+            for trig in ("exact", "table")
+        ]
+        print(f"  scalar {name:14}{t[0] * 1e3:11.2f}ms{t[1] * 1e3:11.2f}ms")
+        t = [best_of(lambda: vector(hsi, trig=trig)) for trig in ("exact", "table")]
+        print(f"  batch  {name:14}{t[0] * 1e3:11.2f}ms{t[1] * 1e3:11.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
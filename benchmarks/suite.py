@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: every converter, every Color property and setter, the morph
+transitions and random_color, across input sizes, saved as JSON.
+
+    $ python benchmarks/suite.py run -o baseline.json
+    $ python benchmarks/suite.py run -o now.json -k Color. --sizes 1 1000
+    $ python benchmarks/suite.py compare baseline.json now.json
+
+Each case does `size` operations per run (calls, colors, transition steps or
+rows for the batch functions).  A run is repeated until --min-time has passed
+(at least --repeat times) and the best one is kept, reported as seconds per
+operation.  The input of every run is built fresh and untimed, so Color
+properties are measured cold (computed) unless the case says warm (cached).
+
+compare prints the ratio of every case present in both files, and exits 1 if
+any got slower by more than --threshold (0.15 == 15%).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors import converters as cv
+from rgbw_colorspace_converter.colors.util import morph
+from rgbw_colorspace_converter.randomcolor import random_color
+
+SCHEMA = 1
+
+
+def _hsv_rows(n, seed=1):
+    rng = random.Random(seed)
+    return [(rng.random(), rng.random(), rng.random()) for _ in range(n)]
+
+
+def _rgb_rows(n, seed=2):
+    rng = random.Random(seed)
+    return [
+        (rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(n)
+    ]
+
+
+def _hsi_rows(n):
+    return [cv.rgb_to_hsi(*rgb) for rgb in _rgb_rows(n)]
+
+
+def _rgbw_rows(n):
+    return [cv.hsi_to_rgbw(*hsi) for hsi in _hsi_rows(n)]
+
+
+def _calls(fn, make_args):
+    "a case calling fn(*args) once per prepared argument tuple"
+
+    def prepare(n):
+        return make_args(n)
+
+    def run(args):
+        for a in args:
+            fn(*a)
+
+    return prepare, run
+
+
+def _colors(n):
+    return [cv.HSV(*hsv) for hsv in _hsv_rows(n)]
+
+
+def _get(prop, warm=False):
+    "a case reading a Color property off n fresh colors"
+
+    def prepare(n):
+        colors = _colors(n)
+        if warm:
+            for c in colors:
+                getattr(c, prop)
+        return colors
+
+    def run(colors):
+        for c in colors:
+            getattr(c, prop)
+
+    return prepare, run
+
+
+def _set(prop, values, read):
+    "a case setting a Color property on n colors, then reading `read` back"
+
+    def prepare(n):
+        colors = _colors(n)
+        for c in colors:
+            c.rgbw
+        return [(c, values[i % len(values)]) for i, c in enumerate(colors)]
+
+    def run(pairs):
+        for c, v in pairs:
+            setattr(c, prop, v)
+            getattr(c, read)
+
+    return prepare, run
+
+
+def _batch(fn, make_rows):
+    def prepare(n):
+        return make_rows(n)
+
+    def run(rows):
+        fn(rows)
+
+    return prepare, run
+
+
+def _transition(n):
+    return cv.RGB(255, 255, 0), cv.RGB(0, 0, 255), n
+
+
+def _multistep(n):
+    # n steps in total, over 4 legs
+    stops = [
+        cv.RGB(255, 0, 0),
+        cv.RGB(0, 255, 0),
+        cv.RGB(0, 0, 255),
+        cv.RGB(255, 255, 255),
+        cv.RGB(255, 0, 0),
+    ]
+    return stops, max(1, n // 4)
+
+
+def cases():
+    "{name: (prepare(size) -> state, run(state))}"
+    hsv = lambda n: _hsv_rows(n)
+    hsi = lambda n: _hsi_rows(n)
+    rgb = lambda n: _rgb_rows(n)
+    rgbw = lambda n: _rgbw_rows(n)
+    ints = lambda n: [(r << 16 | g << 8 | b,) for r, g, b in _rgb_rows(n)]
+    hexes = lambda n: [("#%02x%02x%02x" % t,) for t in _rgb_rows(n)]
+    c = {
+        "rgb_to_hsv": _calls(cv.rgb_to_hsv, lambda n: [(t,) for t in rgb(n)]),
+        "hsv_to_rgb": _calls(cv.hsv_to_rgb, lambda n: [(t,) for t in hsv(n)]),
+        "hsv_to_hsl": _calls(cv.hsv_to_hsl, hsv),
+        "hsl_to_hsv": _calls(
+            cv.hsl_to_hsv, lambda n: [cv.hsv_to_hsl(*t) for t in hsv(n)]
+        ),
+        "rgb_to_hsi": _calls(cv.rgb_to_hsi, rgb),
+        "hsi_to_rgb": _calls(cv.hsi_to_rgb, hsi),
+        "hsi_to_rgb_2nd": _calls(cv.hsi_to_rgb_2nd, hsi),
+        "hsi_to_rgbw": _calls(cv.hsi_to_rgbw, hsi),
+        "hsi_to_rgbw[table]": _calls(
+            lambda H, S, I: cv.hsi_to_rgbw(H, S, I, trig="table"), hsi
+        ),
+        "hsv_to_rgbw": _calls(cv.hsv_to_rgbw, hsv),
+        "rgbw_to_hsi": _calls(cv.rgbw_to_hsi, rgbw),
+        "rgbw_to_rgb": _calls(cv.rgbw_to_rgb, rgbw),
+        "rgb_to_int": _calls(cv.rgb_to_int, rgb),
+        "int_to_rgb": _calls(cv.int_to_rgb, ints),
+        "rgbw_to_int": _calls(cv.rgbw_to_int, rgbw),
+        "int_to_rgbw": _calls(
+            cv.int_to_rgbw, lambda n: [(cv.rgbw_to_int(*t),) for t in rgbw(n)]
+        ),
+        "hex_to_rgb": _calls(cv.hex_to_rgb, hexes),
+        "RGB": _calls(cv.RGB, rgb),
+        "HSV": _calls(cv.HSV, hsv),
+        "HSL": _calls(cv.HSL, lambda n: [cv.hsv_to_hsl(*t) for t in hsv(n)]),
+        "HSI": _calls(cv.HSI, hsi),
+        "Hex": _calls(cv.Hex, hexes),
+        "RGBW": _calls(cv.RGBW, rgbw),
+        "Color.from_int": _calls(cv.Color.from_int, ints),
+    }
+    for prop in ("rgb", "rgbw", "hsv", "hsi", "hsl", "hex"):
+        c[f"Color.{prop}"] = _get(prop)
+        c[f"Color.{prop}[warm]"] = _get(prop, warm=True)
+    c["Color.to_int"] = _calls(cv.Color.to_int, lambda n: [(x,) for x in _colors(n)])
+    c["Color.to_rgbw_int"] = _calls(
+        cv.Color.to_rgbw_int, lambda n: [(x,) for x in _colors(n)]
+    )
+    c["Color.copy"] = _calls(cv.Color.copy, lambda n: [(x,) for x in _colors(n)])
+    for prop in ("hsv_h", "hsv_s", "hsv_v"):
+        c[f"Color.{prop}=+rgbw"] = _set(prop, [0.1, 0.5, 0.9], "rgbw")
+    for prop in ("rgb_r", "rgb_g", "rgb_b"):
+        c[f"Color.{prop}=+rgb"] = _set(prop, [0, 128, 255], "rgb")
+        c[f"Color.{prop}=+rgbw"] = _set(prop, [0, 128, 255], "rgbw")
+
+    c["morph.color_transition"] = (
+        _transition,
+        lambda s: [x.rgbw for x in morph.color_transition(*s)],
+    )
+    c["morph.color_ramp"] = (
+        _transition,
+        lambda s: (morph.ramp_cache_clear(), morph.color_ramp(*s)),
+    )
+    c["morph.color_ramp[warm]"] = (_transition, lambda s: morph.color_ramp(*s))
+    c["morph.multistep_color_transition"] = (
+        _multistep,
+        lambda s: [x.rgbw for x in morph.multistep_color_transition(list(s[0]), s[1])],
+    )
+    c["randomcolor.random_color"] = (
+        lambda n: n,
+        lambda n: [random_color().rgbw for _ in range(n)],
+    )
+
+    np_rgb = lambda n: np.random.default_rng(3).integers(0, 256, (n, 3))
+    np_hsv = lambda n: np.random.default_rng(4).random((n, 3))
+    np_rgbw = lambda n: batch.rgb_to_rgbw(np_rgb(n))
+    c.update(
+        {
+            "batch.rgb_to_hsv": _batch(batch.rgb_to_hsv, np_rgb),
+            "batch.hsv_to_rgb": _batch(batch.hsv_to_rgb, np_hsv),
+            "batch.rgb_to_hsi": _batch(batch.rgb_to_hsi, np_rgb),
+            "batch.hsi_to_rgbw": _batch(
+                batch.hsi_to_rgbw, lambda n: batch.rgb_to_hsi(np_rgb(n))
+            ),
+            "batch.rgb_to_rgbw": _batch(batch.rgb_to_rgbw, np_rgb),
+            "batch.rgb_to_rgbw[fixed]": _batch(
+                lambda a: batch.rgb_to_rgbw(a, engine="fixed"), np_rgb
+            ),
+            "batch.hsv_to_rgbw": _batch(batch.hsv_to_rgbw, np_hsv),
+            "batch.rgbw_to_rgb": _batch(batch.rgbw_to_rgb, np_rgbw),
+            "batch.pack_rgbw": _batch(batch.pack_rgbw, np_rgbw),
+        }
+    )
+    return c
+
+
+def measure(prepare, run, size, repeat, min_time):
+    "best seconds per operation over at least `repeat` runs and `min_time` seconds"
+    best = float("inf")
+    spent = 0.0
+    runs = 0
+    while runs < repeat or spent < min_time:
+        state = prepare(size)
+        t0 = time.perf_counter()
+        run(state)
+        t = time.perf_counter() - t0
+        best = min(best, t)
+        spent += t
+        runs += 1
+    return best / size, runs
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def cmd_run(args):
+    selected = {
+        k: v for k, v in cases().items() if not args.k or any(f in k for f in args.k)
+    }
+    results = {}
+    for name, (prepare, run) in selected.items():
+        for size in args.sizes:
+            per_op, runs = measure(prepare, run, size, args.repeat, args.min_time)
+            key = f"{name}@{size}"
+            results[key] = {
+                "case": name,
+                "size": size,
+                "seconds_per_op": per_op,
+                "runs": runs,
+            }
+            print(f"{key:44}{per_op * 1e6:12.3f} us/op", flush=True)
+    out = {"schema": SCHEMA, "environment": environment(), "results": results}
+    if args.output == "-":
+        json.dump(out, sys.stdout, indent=1)
+    else:
+        with open(args.output, "w") as fh:
+            json.dump(out, fh, indent=1)
+        print(f"wrote {len(results)} results to {args.output}")
+
+
+def _load(path):
+    with open(path) as fh:
+        data = json.load(fh)
+    assert (
+        data.get("schema") == SCHEMA
+    ), f"{path}: not a suite results file (schema {SCHEMA})"
+    return data["results"]
+
+
+def compare(baseline, current, threshold):
+    "[(key, base, now, ratio, verdict)] for the keys in both, sorted by ratio"
+    rows = []
+    for key in baseline.keys() & current.keys():
+        base = baseline[key]["seconds_per_op"]
+        now = current[key]["seconds_per_op"]
+        ratio = now / base if base else float("inf")
+        if ratio > 1.0 + threshold:
+            verdict = "REGRESSION"
+        elif ratio < 1.0 / (1.0 + threshold):
+            verdict = "faster"
+        else:
+            verdict = ""
+        rows.append((key, base, now, ratio, verdict))
+    return sorted(rows, key=lambda r: -r[3])
+
+
+def cmd_compare(args):
+    baseline, current = _load(args.baseline), _load(args.current)
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'case':44}{'base us':>12}{'now us':>12}{'ratio':>8}")
+    for key, base, now, ratio, verdict in rows:
+        print(f"{key:44}{base * 1e6:12.3f}{now * 1e6:12.3f}{ratio:8.2f}  {verdict}")
+    for key in sorted(baseline.keys() - current.keys()):
+        print(f"{key:44} only in {args.baseline}")
+    for key in sorted(current.keys() - baseline.keys()):
+        print(f"{key:44} only in {args.current}")
+    regressions = [r for r in rows if r[4] == "REGRESSION"]
+    print(
+        f"{len(rows)} compared, {len(regressions)} regressions over {args.threshold:.0%}"
+    )
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and save the results")
+    run.add_argument(
+        "-o", "--output", default="bench_results.json", help="JSON file, - for stdout"
+    )
+    run.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000])
+    run.add_argument(
+        "-k", nargs="+", help="only cases whose name contains one of these"
+    )
+    run.add_argument(
+        "-r", "--repeat", type=int, default=3, help="minimum runs per case"
+    )
+    run.add_argument(
+        "--min-time", type=float, default=0.1, help="minimum seconds per case"
+    )
+    run.add_argument(
+        "-l", "--list", action="store_true", help="list the cases and exit"
+    )
+
+    cmp = sub.add_parser("compare", help="compare results against a baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("-t", "--threshold", type=float, default=0.15)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        if args.list:
+            print("\n".join(cases()))
+            return 0
+        cmd_run(args)
+        return 0
+    return cmd_compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
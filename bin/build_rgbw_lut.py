@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+import argparse
+import time
+
+from rgbw_colorspace_converter.colors.lut import build_lut, default_lut_path, load_lut
+
+my_parser = argparse.ArgumentParser(
+    description="Precompute the full 8 bit RGB -> RGBW lookup table (64MB) for memory mapped lookups."
+)
+my_parser.add_argument(
+    "-o",
+    "--output",
+    action="store",
+    default=default_lut_path(),
+    help="Where to write the table.  Defaults to the path load_lut() reads from.",
+)
+my_parser.add_argument(
+    "-w",
+    "--workers",
+    action="store",
+    type=int,
+    default=None,
+    help="Number of processes building the table, defaults to one per cpu.",
+)
+my_parser.add_argument(
+    "-f",
+    "--force",
+    action="store_true",
+    default=False,
+    help="Rebuild even if an up to date table is already there.",
+)
+
+args = my_parser.parse_args()
+
+if not args.force:
+    try:
+        load_lut(args.output)
+        print(f"{args.output} is up to date, use -f to rebuild it anyway.")
+        raise SystemExit(0)
+    except (OSError, ValueError):
+        pass
+
+t0 = time.time()
+path = build_lut(args.output, workers=args.workers)
+load_lut(path, verify=True)
+print(f"wrote {path} in {time.time() - t0:.1f}s")
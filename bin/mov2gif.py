@@ -5,17 +5,21 @@
 """
 DEPENDENCIES:
 $ brew install ffmpeg
-$ brew install imagemagick
 $ python ./mov2gif.py input.mov output.gif 15
+
+ffmpeg decodes the movie to raw rgb on a pipe and each frame is encoded into
+the gif as it is read (tools/imagewriter.py), no temp pngs and no ImageMagick.
 """
 
-import sys
+import json
 import os
-import tempfile
-import shutil
 import subprocess
+import sys
+
+import numpy as np
+
+from rgbw_colorspace_converter.tools.imagewriter import GIFWriter
 
-print("aaaa")
 if len(sys.argv) <= 2:
     print(
         "usage: ", sys.argv[0], "[INPUT_MOV_FILENAME]", "[OUTPUT_GIF_FILENAME]", "[FPS]"
@@ -34,25 +38,54 @@ except Exception as e:
     del e
     FPS = 10
 
-temp = tempfile.mkdtemp()
-
-cmd = "ffmpeg -loglevel quiet -i %(INPUT_MOV_FILENAME)s -r %(FPS)i %(TEMP)s" % {
-    "INPUT_MOV_FILENAME": INPUT_MOV_FILENAME,
-    "FPS": FPS,
-    "TEMP": os.path.join(temp, "%5d.png"),
-}
-subprocess.check_call(cmd, shell=True)
-
-cmd = "convert -delay 1x%(FPS)i %(TEMP)s %(OUTPUT_GIF_FILENAME)s" % {
-    "FPS": FPS,
-    "TEMP": os.path.join(temp, "*.png"),
-    "OUTPUT_GIF_FILENAME": OUTPUT_GIF_FILENAME,
-}
-subprocess.check_call(cmd, shell=True)
+probe = subprocess.run(
+    [
+        "ffprobe",
+        "-loglevel",
+        "quiet",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=width,height",
+        "-of",
+        "json",
+        INPUT_MOV_FILENAME,
+    ],
+    check=True,
+    capture_output=True,
+)
+stream = json.loads(probe.stdout)["streams"][0]
+WIDTH, HEIGHT = int(stream["width"]), int(stream["height"])
 
-shutil.rmtree(temp)
+decoder = subprocess.Popen(
+    [
+        "ffmpeg",
+        "-loglevel",
+        "quiet",
+        "-i",
+        INPUT_MOV_FILENAME,
+        "-r",
+        str(FPS),
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "rgb24",
+        "-",
+    ],
+    stdout=subprocess.PIPE,
+)
+frame_size = WIDTH * HEIGHT * 3
+with GIFWriter(OUTPUT_GIF_FILENAME, WIDTH, HEIGHT, fps=FPS) as gif:
+    while True:
+        buf = decoder.stdout.read(frame_size)
+        if len(buf) < frame_size:
+            break
+        gif.add_frame(np.frombuffer(buf, dtype=np.uint8).reshape(HEIGHT, WIDTH, 3))
+decoder.stdout.close()
+if decoder.wait() != 0:
+    sys.exit(decoder.returncode)
 
-cmd = "open -R %(OUTPUT_GIF_FILENAME)s" % {"OUTPUT_GIF_FILENAME": OUTPUT_GIF_FILENAME}
-subprocess.check_call(cmd, shell=True)
+if sys.platform == "darwin":
+    subprocess.call(["open", "-R", OUTPUT_GIF_FILENAME])
 
-print("done")
+print(f"done, {gif.frames} frames")
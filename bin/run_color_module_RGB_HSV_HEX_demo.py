@@ -7,11 +7,17 @@ import argparse
 
 from rgbw_colorspace_converter.colors.converters import RGB, HSV
 from rgbw_colorspace_converter.tools.color_printer import print_colors
+from rgbw_colorspace_converter.tools.frame_scheduler import FrameScheduler
+from rgbw_colorspace_converter.tools.imagewriter import PNGWriter
+
+import numpy as np
 
 # This is all meant to work in even basic teminal sessions that do not
 # have X11 running.  So, I loose a lot of flexibility in color range
 # but, it is a fun challenege.  Below, I'm doing some terminal prep.
-os.environ["TERM"] = "xterm-256color"  # screen
+# only when unset: overriding a real TERM would make the ANSI output
+# (tools.palette.color_depth) drop a truecolor terminal to 256 colors
+os.environ.setdefault("TERM", "xterm-256color")  # screen
 os.system("tput clear; tput init; tput civis;stty -echo; stty 100000; ")
 
 # First a hello
@@ -99,6 +105,14 @@ my_parser.add_argument(
     help="Skip white to red hue/saturation test",
 )
 
+my_parser.add_argument(
+    "--fps",
+    action="store",
+    type=float,
+    default=20.0,
+    help="Rows of color printed per second.",
+)
+
 my_parser.add_argument(
     "-d", "--debug", action="store_true", default=False, help="Turn on debugging."
 )
@@ -118,7 +132,6 @@ my_parser.add_argument(
     default=False,
     help="Reverse the direction of characters cycling every 100 lines.",
 )
-os.environ["rgbw_char_dir"] = "R"
 
 my_parser.add_argument(
     "-u",
@@ -195,8 +208,6 @@ args = my_parser.parse_args()
 if not args.skip_intro:
     os.system(intro_cmd)
 
-os.environ["zag_ctr"] = "0"
-
 if args.full_experience and args.meep:
     ec = """echo '
 
@@ -249,6 +260,9 @@ MAX_COL_WIDTH = 0
 
 N_ROWS = 0
 
+# (rgb, col_width) of every row printed, for the session png
+SESSION_ROWS = []
+
 print_bars = True
 if args.no_color_bars is True:
     print_bars = False
@@ -257,6 +271,18 @@ if args.no_capture_output is True:
     capture_output = False
 
 
+def _write_session_png(path, rows, col_width, cell=(8, 16)):
+    """Each printed row as a bar of its color, a cell of pixels per character"""
+    cw, ch = cell
+    width = (int(col_width) + 2) * cw
+    with PNGWriter(path, width, len(rows) * ch) as png:
+        bar = np.zeros((ch, width, 3), dtype=np.uint8)
+        for rgb, cols in rows:
+            bar[...] = 0
+            bar[:, : (cols + 2) * cw] = rgb
+            png.write_rows(bar)
+
+
 def main(**kwargs):
     # reset terminal for printing.
 
@@ -310,6 +336,9 @@ def main(**kwargs):
         if MAX_COL_WIDTH < int(COL_WIDTH):
             MAX_COL_WIDTH = COL_WIDTH
 
+        if capture_output:
+            SESSION_ROWS.append((color.rgb, int(col_width)))
+
         # track number of rows
         N_ROWS += 1
         return (ret_code, COL_WIDTH)
@@ -318,183 +347,204 @@ def main(**kwargs):
         if args.debug:
             os.system(f"""echo '''{msg}'''""")
 
-    color = RGB(255, 255, 255)
-    _write_msg(
-        f"""EXAMPLE OF RGB WHITE: {color.rgb}. Then cycling through each of h,s,v-- white for HSV is {color.hsv} -- Note, the RGB values do not change as hsv.h changes ---- THIS    WILL    REMAIN    WHITE ----   """
-    )
-    try:
-        if args.skip_intro:
-            color.hsv_h = 2.0
-
-        while color.hsv_h < 1.0:
-            (ret_code, col_w) = _write_color(color)
-
-            color.hsv_h = color.hsv_h + 0.2
-
-            if color.hsv_h > 0.99:
-                if color.hsv_s == 0.0:
-                    _write_msg("DONE CYCLING THROUGH (H)sv, NOW CYCLING THROUGH h(S)v")
-
-                    while color.hsv_s < 1.0:
-                        (ret_code, col_w) = _write_color(color)
-                        color.hsv_s = color.hsv_s + 0.03
-                        if ret_code != 0:
-                            raise
-                        if color.hsv_s > 0.99:
-                            if color.hsv_v == 1.0:
-                                _write_msg(
-                                    "DONE CYCLING THROUGH S, NOW CYCLING THROUGH hs(V)"
-                                )
-                            while color.hsv_v > 0.0:
-                                (ret_code, col_w) = _write_color(color)
-                                if color.hsv_v < 0.1:
-                                    color.hsv_v -= 0.005
-                                else:
-                                    color.hsv_v -= 0.01
-                                if ret_code != 0:
-                                    raise
-            if ret_code != 0:
-                raise
-    except Exception as e:
-        print(e)
+    def frames():
+        """The whole show, one row of color per step"""
+        color = RGB(255, 255, 255)
+        _write_msg(
+            f"""EXAMPLE OF RGB WHITE: {color.rgb}. Then cycling through each of h,s,v-- white for HSV is {color.hsv} -- Note, the RGB values do not change as hsv.h changes ---- THIS    WILL    REMAIN    WHITE ----   """
+        )
+        try:
+            if args.skip_intro:
+                color.hsv_h = 2.0
+
+            while color.hsv_h < 1.0:
+                (ret_code, col_w) = _write_color(color)
+                yield
+
+                color.hsv_h = color.hsv_h + 0.2
+
+                if color.hsv_h > 0.99:
+                    if color.hsv_s == 0.0:
+                        _write_msg(
+                            "DONE CYCLING THROUGH (H)sv, NOW CYCLING THROUGH h(S)v"
+                        )
+
+                        while color.hsv_s < 1.0:
+                            (ret_code, col_w) = _write_color(color)
+                            yield
+                            color.hsv_s = color.hsv_s + 0.03
+                            if ret_code != 0:
+                                raise
+                            if color.hsv_s > 0.99:
+                                if color.hsv_v == 1.0:
+                                    _write_msg(
+                                        "DONE CYCLING THROUGH S, NOW CYCLING THROUGH hs(V)"
+                                    )
+                                while color.hsv_v > 0.0:
+                                    (ret_code, col_w) = _write_color(color)
+                                    yield
+                                    if color.hsv_v < 0.1:
+                                        color.hsv_v -= 0.005
+                                    else:
+                                        color.hsv_v -= 0.01
+                                    if ret_code != 0:
+                                        raise
+                if ret_code != 0:
+                    raise
+        except Exception as e:
+            print(e)
 
-    _write_msg(
-        "And that is cycling through each of the H/S/V properties  independently"
-    )
-    _write_msg("We are starting with H and V at 0 and S at 1 and cycling")
-
-    color = HSV(h=1.0, s=0.0, v=1.0)
-    while color.hsv_h < 1.0:
-        _write_color(color)
-        color.hsv_h = color.hsv_h + 0.025
-        color.hsv_s = color.hsv_s - 0.025
-        color.hsv_v = color.hsv_v + 0.025
-
-    _write_msg("WHAT THE HELL... Slightly Random Fading!")
-    oper2 = "+"  # noqa
-    try:
-        # I'm cycling through colors in order, but chosing the steps to move forward for H/S/V semi-randomly so some nice patterns emerge. Also, generally a good idea to throw in some negative space here and there.
-
-        (h, s, v) = (0.5, 0.75, 0.232)
-        if random_color_start:
-            (h, s, v) = (
-                float(random.randint(1, 1000)) / float(1000),
-                float(random.randint(1, 1000)) / float(1000),
-                float(random.randint(1, 1000)) / float(1000),
-            )
+        _write_msg(
+            "And that is cycling through each of the H/S/V properties  independently"
+        )
+        _write_msg("We are starting with H and V at 0 and S at 1 and cycling")
 
-        color = HSV(h, s, v)
-        ctr = 0.0
-        xctr = 90
-        oper = "+"
-        while ctr < 10.0:
-            # from IPython import embed; embed();
-            (ret_code, col_w) = _write_color(color)
-            if color.hsv_h >= 1.0:
-                color.hsv_h = 0.0  # random.uniform(0, 1)
-            else:
-                if oper == "+":
-                    color.hsv_h = color.hsv_h + 0.007
+        color = HSV(h=1.0, s=0.0, v=1.0)
+        while color.hsv_h < 1.0:
+            _write_color(color)
+            yield
+            color.hsv_h = color.hsv_h + 0.025
+            color.hsv_s = color.hsv_s - 0.025
+            color.hsv_v = color.hsv_v + 0.025
+
+        _write_msg("WHAT THE HELL... Slightly Random Fading!")
+        oper2 = "+"  # noqa
+        try:
+            # I'm cycling through colors in order, but chosing the steps to move forward for H/S/V semi-randomly so some nice patterns emerge. Also, generally a good idea to throw in some negative space here and there.
+
+            (h, s, v) = (0.5, 0.75, 0.232)
+            if random_color_start:
+                (h, s, v) = (
+                    float(random.randint(1, 1000)) / float(1000),
+                    float(random.randint(1, 1000)) / float(1000),
+                    float(random.randint(1, 1000)) / float(1000),
+                )
+
+            color = HSV(h, s, v)
+            ctr = 0.0
+            xctr = 90
+            oper = "+"
+            while ctr < 10.0:
+                # from IPython import embed; embed();
+                (ret_code, col_w) = _write_color(color)
+                yield
+                if color.hsv_h >= 1.0:
+                    color.hsv_h = 0.0  # random.uniform(0, 1)
                 else:
-
-                    color.hsv_h = color.hsv_h - 0.003  # random.uniform(0.002, 0.008)
-            if random.randint(0, 30) == 7:
-                oper = "-"
-            if random.randint(0, 30) == 7:
-                oper = "+"
-
-            color.hsv_s = [
-                1.0,
-                1.0,
-                1.0,
-                1.0,
-                1.0,
-                0.95,
-                0.9,
-                1.0,
-                1.0,
-                1.0,
-                1.0,
-                0.85,
-                0.79,
-                0.8,
-                0.77,
-                1.0,
-                0.41,
-                0.47,
-                0.55,
-            ][random.randint(0, 18)]
-            if random.randint(0, 180) == 7:
-                color.hsv_s = 0.0
-            # color.hsv_v = color.hsv_v + [0.5, 0.03, 0.7, 0.3][random.randint(0, 3)]
-            r = [
-                130,
-                120,
-                377.0,
-                500.0,
-                500,
-                490.0,
-                390.0,
-                500.0,
-                422.0,
-                401.0,
-                455.0,
-                470.0,
-                480.0,
-                500,
-                500,
-                500,
-                500,
-                485.0,
-                420,
-                170,
-                500.0,
-                500,
-                490.0,
-                400.0,
-                500.0,
-                352.0,
-                451.0,
-                475.0,
-                420.0,
-                490.0,
-                455.0,
-                444,
-                380,
-                440,
-                380.0,
-                200.0,
-                152.0,
-            ]
-            rr = r[random.randint(0, len(r) - 1)] / 600.0
-            if random.randint(0, 275) == 7:
-                rr = 0.0
-
-            color.hsv_v = rr
-
-            ctr = ctr + 0.005
+                    if oper == "+":
+                        color.hsv_h = color.hsv_h + 0.007
+                    else:
+
+                        color.hsv_h = (
+                            color.hsv_h - 0.003
+                        )  # random.uniform(0.002, 0.008)
+                if random.randint(0, 30) == 7:
+                    oper = "-"
+                if random.randint(0, 30) == 7:
+                    oper = "+"
+
+                color.hsv_s = [
+                    1.0,
+                    1.0,
+                    1.0,
+                    1.0,
+                    1.0,
+                    0.95,
+                    0.9,
+                    1.0,
+                    1.0,
+                    1.0,
+                    1.0,
+                    0.85,
+                    0.79,
+                    0.8,
+                    0.77,
+                    1.0,
+                    0.41,
+                    0.47,
+                    0.55,
+                ][random.randint(0, 18)]
+                if random.randint(0, 180) == 7:
+                    color.hsv_s = 0.0
+                # color.hsv_v = color.hsv_v + [0.5, 0.03, 0.7, 0.3][random.randint(0, 3)]
+                r = [
+                    130,
+                    120,
+                    377.0,
+                    500.0,
+                    500,
+                    490.0,
+                    390.0,
+                    500.0,
+                    422.0,
+                    401.0,
+                    455.0,
+                    470.0,
+                    480.0,
+                    500,
+                    500,
+                    500,
+                    500,
+                    485.0,
+                    420,
+                    170,
+                    500.0,
+                    500,
+                    490.0,
+                    400.0,
+                    500.0,
+                    352.0,
+                    451.0,
+                    475.0,
+                    420.0,
+                    490.0,
+                    455.0,
+                    444,
+                    380,
+                    440,
+                    380.0,
+                    200.0,
+                    152.0,
+                ]
+                rr = r[random.randint(0, len(r) - 1)] / 600.0
+                if random.randint(0, 275) == 7:
+                    rr = 0.0
+
+                color.hsv_v = rr
+
+                ctr = ctr + 0.005
+                if ret_code != 0:
+                    raise
+            _write_msg(
+                "-------------|| Note how often the RGB and RGBW codes differ ||-----------------"
+            )
+            # hold for a second's worth of frames
+            for _ in range(int(args.fps)):
+                yield
+            _write_msg(" Finally, 90 lines of random RGB. ")
+
+        except Exception as e:
+            del e
+            _write_msg(" Thank You For Watching.")
+            xctr = 100
+
+        while xctr < 100:
+            # and this is truly printing random colors 100 times.  Random can sometimes be the most dissapointing b/c,
+            # with no patterns to lure you in, they are often boring.
+            ret_code = _write_color(
+                RGB(
+                    random.randint(0, 254),
+                    random.randint(0, 254),
+                    random.randint(0, 254),
+                )
+            )
+            yield
+            xctr = xctr + 1
             if ret_code != 0:
-                raise
-        _write_msg(
-            "-------------|| Note how often the RGB and RGBW codes differ ||-----------------"
-        )
-        os.system("sleep 1;")
-        _write_msg(" Finally, 90 lines of random RGB. ")
+                cxtr = 100  # noqa
 
-    except Exception as e:
-        del e
-        _write_msg(" Thank You For Watching.")
-        xctr = 100
-
-    while xctr < 100:
-        # and this is truly printing random colors 100 times.  Random can sometimes be the most dissapointing b/c,
-        # with no patterns to lure you in, they are often boring.
-        ret_code = _write_color(
-            RGB(random.randint(0, 254), random.randint(0, 254), random.randint(0, 254))
-        )
-        xctr = xctr + 1
-        if ret_code != 0:
-            cxtr = 100  # noqa
+    stats = FrameScheduler(fps=args.fps).play(frames())
+    _write_msg(f"{stats.frames} rows, {stats.late} late, {stats.dropped} dropped")
 
     exit_cmd = f"""
     echo "
@@ -523,12 +573,8 @@ def main(**kwargs):
         f"cat {ansi_bat_f} | ansi2html -i  | perl -pe 's/\/span/\/span\>\<br/g;' >> {ansi_html_f} "
     )
 
-    iwidth = int((MAX_COL_WIDTH * 8))
-    ilength = int((N_ROWS * 16))
-
-    os.system(
-        f"hti -H {ansi_html_f} --chrome_path ./ -o ./rgbw_pnggen/ -s {iwidth},{ilength}; mv ./rgbw_pnggen/screenshot.png {ansi_png_f}; rm -rf ./rbgw_pnggen/"
-    )
+    if capture_output and SESSION_ROWS:
+        _write_session_png(kwargs["ansi_png_f"], SESSION_ROWS, MAX_COL_WIDTH)
     os.system(exit_cmd)
 
 
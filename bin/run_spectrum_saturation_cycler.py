@@ -3,13 +3,19 @@
 import os
 import sys
 import random
+import time
 
 from rgbw_colorspace_converter.colors.converters import RGB, HSV
+from rgbw_colorspace_converter.tools.ansi import AnsiPrinter
+from rgbw_colorspace_converter.tools.frame_scheduler import FrameScheduler
+from rgbw_colorspace_converter.tools.palette import TRUECOLOR, color_depth, color_index
 
 sleep = 0.3  # sleep = sys.argv[1]  ## Not sure what I was intending with this.
 
 # Do what I can to get the terminal to maybe show colors, hopefullyt more than 8....
-os.environ["TERM"] = "xterm-256color"  # screen
+# only when unset: overriding a real TERM would make the ANSI output
+# (tools.palette.color_depth) drop a truecolor terminal to 256 colors
+os.environ.setdefault("TERM", "xterm-256color")  # screen
 os.system("reset; tput clear; tput init; tput civis;stty -echo; ")
 
 col_width = os.get_terminal_size().columns
@@ -19,14 +25,12 @@ os.system("tput clear; ")
 ## The following code is basically a mess as it grew from a small testing example to somethign that made pretty patterns.
 # But until is needs more features, or stops working, here it is :-)
 
-intro_cmd = """
-export COL=`tput colors` || echo COLORSfail                                                                                        
-if [[ "$COL" == "" ]]; then                                                                                                        
-    export COL=16                                                                                                                  
-fi;                                                                                                                                
-     
-echo $COL > num_cols
+# truecolor, 256 or 16, the ANSI output quantizes to the terminal's palette
+# when it has to
+num_colors = color_depth()
+printer = AnsiPrinter(colors=num_colors)
 
+intro_cmd = f"""
 colr -c 0 "                                    ╦ ╦╔╗ ╔═╗                                  " "ff3100" "#6400ff";
 colr -c 0 "                                    ╠═╣╠╩╗╠═╝                                  " "ff3100" "#6400ff";
 colr -c 0 "                                    ╩ ╩╚═╝╩                                    " "ff3100" "#6400ff";
@@ -36,7 +40,7 @@ sleep 1;
 colr -c 0 " ----- ALERT ALERT ALERT ----- " "ff0000" "00ffff"
 colr -c 0 " ----- ALERT ALERT ALERT ----- " "ff0000" "00ffff"
 colr -c 0 " ----- terminal color support ----- " "ff0000" "00ffff"
-colr -c 0 " --- $COL SUPPORTED  COLORS (( $COL )) COLORS SUPPORTED $COL --- " "ff0000" "00ffff" "flash"
+colr -c 0 " --- {num_colors} SUPPORTED  COLORS (( {num_colors} )) COLORS SUPPORTED {num_colors} --- " "ff0000" "00ffff" "flash"
 
 echo "
 
@@ -53,62 +57,51 @@ sleep 1
 
 os.system(intro_cmd)
 
-# Abandoned math
-# Try to establish the terminal color space so i can increment the colors properly and not send too fine grain codes that just look like repeated colors.  This is a hack :-)
-num_colors = float(int(os.popen("tput colors").readline().rstrip()))
-nc = int(os.popen("cat num_cols").readline().rstrip())
+# The hue step.  Steps too small for the terminal to show are skipped when
+# displaying (see _shown), rather than sizing the step to a guess at the
+# terminal's color count.
+b = 1.0 / 360
 
-if nc < num_colors:
-    num_colors = nc
 
-
-# fractional_360 = float(num_colors)/360.0
-b = 1.0 / num_colors
+def _shown(color):
+    "what the terminal will actually draw for color"
+    if num_colors == TRUECOLOR:
+        return color.to_int()
+    return color_index(color, num_colors)
 
 
 def display_color(color, show_values=None):
     """Use Color to hijack the users display and make it into a demo device for simple color manipulations"""
 
     col_width = os.get_terminal_size().columns
-    ret_code = 0
-    l = " " * col_width
-    cmd = ""
     if show_values is None:
-        cmd = f"""colr  -r 0  "{l}" "{color.hex}" "{color.hex}"  2>/dev/null;"""
-    else:
-        l = show_values
-        cmd = f"""colr  -r 0 "{l}" "000000" "{color.hex}"  2>/dev/null; """
-
-    ret_code = os.system(cmd)
-    return int(ret_code)
+        return printer.write_row(" " * col_width, color, color)
+    return printer.write_row(show_values, RGB(0, 0, 0), color, rjust=col_width)
 
 
 def color_whirler(color, codes=False):
-    """Take a color object and spin around the HUE and SATURATION 1 time"""
+    """Take a color object and spin around the HUE and SATURATION 1 time, one frame per step"""
     # ASSUMPTION: that hsv_h is set to 0.  IRL, we'd want to get the
     # current hsv_h and hsv_svalue  and loop starting from there.
-    ctr = 0
+    # the step this was tuned with on a 256 color terminal
+    w = 1.0 / 256
     txt = None
-    rolling = True
     color.hsv_h = 1
     color.hsv_s = 0.3
     color.hsv_v = 0.23
     cctr = 0
-    while rolling:
-        ctr = ctr + 1
+    while True:
         # I modify both 'h' and 's' before submitting for display
-        color.hsv_h = color.hsv_h + b * [6, 12, 5, 3][random.randint(0, 3)]
-        color.hsv_s = color.hsv_s + b * [2, 6, 4, 3][random.randint(0, 3)]
-        color.hsv_v = color.hsv_v - b * 1.2
+        color.hsv_h = color.hsv_h + w * [6, 12, 5, 3][random.randint(0, 3)]
+        color.hsv_s = color.hsv_s + w * [2, 6, 4, 3][random.randint(0, 3)]
+        color.hsv_v = color.hsv_v - w * 1.2
 
-        sleep_time = 0.1
         if codes is True:
             txt = f"{color}"
-            sleep_time = 0.2
         rc = display_color(color, txt)
         if rc != 0:
             raise Exception("escape detected")
-        os.system(f"sleep {sleep_time}")
+        yield
         if color.hsv_s >= 1.0:
             color.hsv_s = 0.00
         if (
@@ -116,37 +109,39 @@ def color_whirler(color, codes=False):
         ):  # It is not allowed to go above 1.0, so test for equality
             cctr = cctr + 1
             if cctr == 18:
-                rolling = False
+                return
             color.hsv_h = 0.0
         if color.hsv_v < 0.15:
             color.hsv_v = 1.0
-    print(ctr)
 
 
 def color_spinner(color, codes=False):
-    """Take a color object and spin around HUE"""
+    """Take a color object and spin around HUE, one frame per step"""
     # ASSUMPTION: that hsv_h is set to 0.  IRL, we'd want to get the current hsv_h value
     # and loop starting from there.
     txt = None
-    rolling = True
-    sleep_time = 0.00
-    ctr = 0
-    while rolling:
+    last = None
+    while True:
         # Assumption
         color.hsv_h = color.hsv_h + b  # num_cov_increments
         if codes is True:
             txt = f"{color}"
-            sleep_time = 0.2
-        rc = display_color(color, txt)
-        if rc != 0:
-            raise Exception("escape detected")
-        os.system(f"sleep {sleep_time}")
+        if _shown(color) != last:
+            last = _shown(color)
+            rc = display_color(color, txt)
+            if rc != 0:
+                raise Exception("escape detected")
+            yield
 
         if color.hsv_h >= 1.0:
             color.hsv_h = 0.0
-            rolling = False
-        ctr = ctr + 1
-    print(ctr)
+            return
+
+
+def play(frames, fps):
+    """Show the frames of a generator at a steady rate, rather than sleeping a subprocess between them"""
+    stats = FrameScheduler(fps=fps).play(frames)
+    print(f"{stats.frames} frames, {stats.late} late, {stats.dropped} dropped")
 
 
 color = RGB(255, 0, 0)
@@ -160,11 +155,12 @@ try:
         display_color(
             color, f"Starting Cycle {i} with no codes, cycle 2 will have codes."
         )
-        os.system("sleep 1")
+        time.sleep(1)
         codes = False
         if i == 2:
             codes = True
-        color_spinner(color, codes)
+        # codes take longer to read, slow down for them
+        play(color_spinner(color, codes), fps=5 if codes else 30)
 
     # "This simple demo exercised a few parts of this package.  First, I created a color object using RGB.  I then manipulated that object using the corresponding HSV properties(h in particular) to roll around the color wheel.  Then, the cool terminal rendering s/w 'Colr' was hijacked as my display to colorize each row-- and Colr uses Hex.  So, I began in RGB, manipulated things in HSV, and interacted with the display in HEX.  This is the primary motivator to build this module, allowing working in one space and emitting in another.  The second time around I printed out the color codes so you could see how they all change in relation to each other if you wished.",
 
@@ -173,7 +169,7 @@ try:
         "Ok!  last demo.  This time, I'm going to move around the color wheel using the 'h' value again, and at the same time move through the saturation value too 's'.  I'm not going to cover V b/c it represents 'brightness', which is not conveyed well in this format.  Again, 2 rounds, the second with color codes, with the changes in RGB and RGBW particularly non-intuitive.",
     )
 
-    os.system(f"sleep {sleep}")
+    time.sleep(sleep)
 
     # This one I'm changing H, S, V with each iteration, semi-randomply.  You gat much more diverse colors than the first example.
     color = RGB(255, 0, 0)
@@ -181,11 +177,11 @@ try:
         display_color(
             color, f"Starting Cycle {i} with no codes, cycle 2 will have codes."
         )
-        os.system(f"sleep {sleep}")
+        time.sleep(sleep)
         codes = False
         if i == 2:
             codes = True
-        color_whirler(color, codes)
+        play(color_whirler(color, codes), fps=5 if codes else 10)
 
 
 except Exception as e:
@@ -27,7 +27,8 @@ setuptools.setup(
         "bin/run_spectrum_saturation_cycler.py",
         "bin/path_between_2_colors.py",
         "bin/print_colored_txt.py",
+        "bin/build_rgbw_lut.py",
     ],
     python_requires=">=3.7",
-    install_requires=["colr", "docopt", "html2image", "ansi2html"],
+    install_requires=["colr", "docopt", "ansi2html", "numpy"],
 )
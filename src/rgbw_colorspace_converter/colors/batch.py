@@ -0,0 +1,499 @@
+"""
+Batch
+
+Array versions of the conversions in converters.py, for driving whole frames of
+pixels at once instead of one Color at a time.
+
+Every function takes an (N,3) array (anything numpy.asarray accepts, and any
+leading shape works, ie: an (H,W,3) image) and returns an array of the same
+leading shape.  The math is a line for line transcription of the scalar
+functions, including their odd constants, the int() truncation and the x3
+scaling in hsi_to_rgbw, so results match the scalar versions exactly.  Hue
+sectors are selected with index arithmetic rather than if/else, so there is no
+per pixel python work.
+
+8 bit outputs (RGB, RGBW) are returned as uint8, everything else as float64.
+The hsi -> rgb(w) functions take the same trig="table" option as the scalar
+ones, and use the same precomputed hue table.
+
+    >>> rgb = np.array([[255, 0, 0], [176, 205, 230]])
+    >>> hsi_to_rgbw(rgb_to_hsi(rgb))
+    array([[254,   0,   0,   0],
+           [  0,  28,  54, 176]], dtype=uint8)
+
+Validation is vectorized as well.  The is_*_array functions return a boolean
+mask with one entry per row, and bad_rows() turns a mask into the indices of
+the offending rows, which is what the assertion messages report.
+"""
+import numpy as np
+
+from rgbw_colorspace_converter.colors import fixed
+from rgbw_colorspace_converter.colors.converters import (
+    HUE_TABLE_STEP,
+    _HUE_RATIO_TABLE,
+    _RGB_NUDGES,
+)
+
+__all__ = [
+    "is_hsv_array",
+    "is_rgb_array",
+    "is_rgbw_array",
+    "is_hsi_hsl_array",
+    "bad_rows",
+    "rgb_to_hsv",
+    "hsv_to_rgb",
+    "rgb_to_hsi",
+    "hsi_to_rgb",
+    "hsi_to_rgb_2nd",
+    "hsi_to_rgbw",
+    "hsv_to_hsl",
+    "hsl_to_hsv",
+    "rgb_to_rgbw",
+    "hsv_to_rgbw",
+    "rgbw_to_hsi",
+    "rgbw_to_rgb",
+    "rgbw_to_hsv",
+    "pack_rgb",
+    "unpack_rgb",
+    "pack_rgbw",
+    "unpack_rgbw",
+    "int_to_rgbw_int",
+]
+
+# hsi sector start (in the radians hsi_to_rgb* use) for sectors 0, 1 and 2
+_SECTOR_OFFSET = np.array([0.0, 2.09439, 4.188787])
+
+
+def _as_triples(a, what="values"):
+    a = np.asarray(a, dtype=np.float64)
+    assert a.shape[-1:] == (3,), f"expected an (N,3) array of {what}, got {a.shape}"
+    return a
+
+
+def _stack(a, b, c):
+    return np.stack((a, b, c), axis=-1)
+
+
+def _to_uint8(a):
+    "clamp to 0-255 and truncate like int(), which is a floor for values >= 0"
+    return np.clip(a, 0, 255).astype(np.uint8)
+
+
+def bad_rows(mask):
+    "return the (flat) row indices where a validation mask is False"
+    return np.flatnonzero(~np.asarray(mask))
+
+
+def is_hsv_array(hsv):
+    "check that each row contains 3 values between 0.0 and 1.0"
+    hsv = np.asarray(hsv, dtype=np.float64)
+    return ((hsv >= 0.0) & (hsv <= 1.0)).all(axis=-1)
+
+
+def is_rgb_array(rgb):
+    "check that each row contains 3 values between 0 and 255"
+    rgb = np.asarray(rgb)
+    return ((rgb >= 0) & (rgb <= 255)).all(axis=-1)
+
+
+def is_rgbw_array(rgbw):
+    "check that each row contains 4 values between 0 and 255"
+    rgbw = np.asarray(rgbw)
+    return ((rgbw >= 0) & (rgbw <= 255)).all(axis=-1)
+
+
+def is_hsi_hsl_array(hsi):
+    "check that each row has H in 0-360 and S, I/L in 0.0-1.0"
+    hsi = np.asarray(hsi, dtype=np.float64)
+    h, s, i = hsi[..., 0], hsi[..., 1], hsi[..., 2]
+    return (h >= 0) & (h <= 360) & (s >= 0.0) & (s <= 1.0) & (i >= 0.0) & (i <= 1.0)
+
+
+def rgb_to_hsv(rgb):
+    "convert rgb[0-255] rows to hsv[0.0-1.0] rows (colorsys.rgb_to_hsv)"
+    rgb = _as_triples(rgb, "rgb") / float(255)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+    maxc = rgb.max(axis=-1)
+    minc = rgb.min(axis=-1)
+    rangec = maxc - minc
+    grey = minc == maxc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = rangec / maxc
+        rc = (maxc - r) / rangec
+        gc = (maxc - g) / rangec
+        bc = (maxc - b) / rangec
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.mod(h / 6.0, 1.0)
+
+    return _stack(np.where(grey, 0.0, h), np.where(grey, 0.0, s), maxc)
+
+
+def _hsv_to_rgb_channels(h, s, v):
+    "colorsys.hsv_to_rgb scaled to 0-255 and truncated, as uint8 r, g, b arrays"
+    i = np.trunc(h * 6.0)
+    f = (h * 6.0) - i
+    i = i.astype(np.intp) % 6
+    # colorsys short circuits greys to (v, v, v), which sector 0 with t and
+    # p replaced by v gives
+    grey = s == 0.0
+    i = np.where(grey, 0, i)
+    v8 = _to_uint8(v * 0xFF)
+    p = np.where(grey, v8, _to_uint8(v * (1.0 - s) * 0xFF))
+    q = _to_uint8(v * (1.0 - s * f) * 0xFF)
+    t = np.where(grey, v8, _to_uint8(v * (1.0 - s * (1.0 - f)) * 0xFF))
+    return (
+        np.choose(i, (v8, q, p, p, t, v8)),
+        np.choose(i, (t, v8, v8, q, p, p)),
+        np.choose(i, (p, p, t, v8, v8, q)),
+    )
+
+
+def hsv_to_rgb(hsv):
+    "convert hsv[0.0-1.0] rows to rgb[0-255] uint8 rows"
+    hsv = _as_triples(hsv, "hsv")
+    ok = is_hsv_array(hsv)
+    assert ok.all(), "malformed hsv rows:" + str(bad_rows(ok))
+    return _to_uint8(
+        _stack(*_hsv_to_rgb_channels(hsv[..., 0], hsv[..., 1], hsv[..., 2]))
+    )
+
+
+# https://www.neltnerlabs.com/saikoled/how-to-convert-from-hsi-to-rgb-white
+def _hsi_sectors(H):
+    "fold H (degrees) into a radian offset within one of the three hsi sectors"
+    H = np.fmod(H, 360.0)
+    H = 3.14159 * H / 180.0
+    sector = np.where(H < 2.09439, 0, np.where(H < 4.188787, 1, 2))
+    return H - _SECTOR_OFFSET[sector], sector
+
+
+_HUE_RATIO_ARRAY = np.array(_HUE_RATIO_TABLE)
+
+
+def _hue_cosines(H, trig="exact"):
+    """
+    (cos(H), cos(1.047196667 - H)) arrays for H radians into an hsi sector, or
+    in table mode (ratio, 1.0) with the ratio looked up, as converters does
+    """
+    assert trig in ("exact", "table"), "trig must be 'exact' or 'table'"
+    if trig == "exact":
+        return np.cos(H), np.cos(1.047196667 - H)
+    k = np.floor(H / HUE_TABLE_STEP + 0.5)
+    ok = (H >= 0.0) & (k < len(_HUE_RATIO_ARRAY))
+    ratio = _HUE_RATIO_ARRAY[np.where(ok, k, 0).astype(np.intp)]
+    if not ok.all():
+        # out of the table's range (negative hues), fall back to exact
+        ratio = np.where(ok, ratio, np.cos(H) / np.cos(1.047196667 - H))
+    return ratio, 1.0
+
+
+def _place(sector, first, second, third):
+    """
+    Rotate per sector channel values into r, g, b: sector 0 puts `first` in
+    r, sector 1 in g and sector 2 in b, with `second` and `third` following
+    around the wheel.
+    """
+    return (
+        np.choose(sector, (first, third, second)),
+        np.choose(sector, (second, first, third)),
+        np.choose(sector, (third, second, first)),
+    )
+
+
+def hsi_to_rgb(hsi, trig="exact"):
+    "convert hsi rows (H 0-360, S/I 0.0-1.0) to rgb[0-255] uint8 rows"
+    hsi = _as_triples(hsi, "hsi")
+    H, sector = _hsi_sectors(hsi[..., 0])
+    S = np.clip(hsi[..., 1], 0.0, 1.0)
+    I = np.clip(hsi[..., 2], 0.0, 1.0)
+
+    cos_h, cos_1047_h = _hue_cosines(H, trig)
+    base = 255.0 * I / 3.0
+    first = base * (1.0 + S * cos_h / cos_1047_h)
+    second = base * (1.0 + S * (1.0 - cos_h / cos_1047_h))
+    third = base * (1.0 - S)
+
+    # for some reason, the rgb numbers need to be X3...
+    first, second, third = (
+        _to_uint8(np.trunc(x * 3.0)) for x in (first, second, third)
+    )
+    return _stack(*_place(sector, first, second, third))
+
+
+hsi_to_rgb_2nd = hsi_to_rgb
+
+
+def _hsi_to_rgbw_into(H, S, I, out, trig="exact"):
+    "hsi_to_rgbw on H, S, I arrays, written into the (..., 4) uint8 `out`"
+    H, sector = _hsi_sectors(H)
+    S = np.clip(S, 0.0, 1.0)
+    I = np.clip(I, 0.0, 1.0)
+
+    cos_h, cos_1047_h = _hue_cosines(H, trig)
+    first = S * 255.0 * I / 3.0 * (1.0 + cos_h / cos_1047_h)
+    second = S * 255.0 * I / 3.0 * (1.0 + (1.0 - cos_h / cos_1047_h))
+    w = 255.0 * (1.0 - S) * I
+
+    # for some reason, the rgb numbers need to be X3...
+    first = _to_uint8(first * 3)
+    second = _to_uint8(second * 3)
+    for c, val in enumerate(_place(sector, first, second, np.zeros_like(first))):
+        out[..., c] = val
+    out[..., 3] = _to_uint8(w)
+    return out
+
+
+def hsi_to_rgbw(hsi, trig="exact"):
+    "convert hsi rows (H 0-360, S/I 0.0-1.0) to rgbw[0-255] uint8 rows"
+    hsi = _as_triples(hsi, "hsi")
+    out = np.empty(hsi.shape[:-1] + (4,), dtype=np.uint8)
+    return _hsi_to_rgbw_into(hsi[..., 0], hsi[..., 1], hsi[..., 2], out, trig)
+
+
+# https://en.wikipedia.org/wiki/HSL_and_HSV
+def hsv_to_hsl(hsv):
+    "convert hsv rows to hsl rows, H passes through unscaled like the scalar version"
+    hsv = _as_triples(hsv, "hsv")
+    h = np.clip(hsv[..., 0], 0.0, 360.0)
+    s = np.clip(hsv[..., 1], 0.0, 1.0)
+    v = np.clip(hsv[..., 2], 0.0, 1.0)
+
+    Lhsl = v - (v * s / 2.0)
+    inside = (Lhsl > 0.0) & (Lhsl < 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Shsl = np.where(inside, (v - Lhsl) / np.minimum(Lhsl, 1.0 - Lhsl), 0.0)
+
+    return _stack(h, Shsl, Lhsl)
+
+
+# https://en.wikipedia.org/wiki/HSL_and_HSV
+def hsl_to_hsv(hsl):
+    "convert hsl rows to hsv rows, H passes through unscaled like the scalar version"
+    hsl = _as_triples(hsl, "hsl")
+    h = np.clip(hsl[..., 0], 0.0, 360.0)
+    s = np.clip(hsl[..., 1], 0.0, 1.0)
+    l = np.clip(hsl[..., 2], 0.0, 1.0)
+
+    Vhsv = l + (s * np.minimum(l, 1.0 - l))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Shsv = np.where(Vhsv > 0.0, 2.0 - (2.0 * l / Vhsv), 0.0)
+
+    return _stack(h, Shsv, Vhsv)
+
+
+# https://en.wikipedia.org/wiki/HSL_and_HSV
+def _rgb_to_hsi_channels(r, g, b):
+    "rgb_to_hsi on r, g, b[0-255] arrays, returns hue, saturation, intensity"
+    r = np.clip(r / 255.0, 0.0, 1.0)
+    g = np.clip(g / 255.0, 0.0, 1.0)
+    b = np.clip(b / 255.0, 0.0, 1.0)
+    intensity = 0.33333 * (r + g + b)
+
+    M = np.maximum(np.maximum(r, g), b)
+    m = np.minimum(np.minimum(r, g), b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        saturation = np.where(intensity == 0.0, 0.0, 1.0 - (m / intensity))
+        hue_r = 60.0 * (0.0 + ((g - b) / (M - m)))
+        hue_g = 60.0 * (2.0 + ((b - r) / (M - m)))
+        hue_b = 60.0 * (4.0 + ((r - g) / (M - m)))
+
+    # later channels win ties, same as the chain of ifs in the scalar version
+    hue = np.where(M == b, hue_b, np.where(M == g, hue_g, hue_r))
+    hue = np.where(M == m, 0.0, hue)
+    hue = np.where(hue < 0.0, hue + 360, hue)
+
+    return hue, np.abs(saturation), intensity
+
+
+def rgb_to_hsi(rgb):
+    "convert rgb[0-255] rows to hsi rows (H 0-360, S/I 0.0-1.0)"
+    rgb = _as_triples(rgb, "rgb")
+    return _stack(*_rgb_to_hsi_channels(rgb[..., 0], rgb[..., 1], rgb[..., 2]))
+
+
+def rgb_to_rgbw(rgb, trig="exact", engine="float"):
+    """
+    convert rgb[0-255] rows to rgbw[0-255] uint8 rows, the Color.rgbw path.
+    engine="fixed" does it in integers instead, see fixed.py.
+    """
+    assert engine in ("float", "fixed"), "engine must be 'float' or 'fixed'"
+    if engine == "fixed":
+        return fixed.rgb_to_rgbw(rgb)
+    rgb = _as_triples(rgb, "rgb")
+    out = np.empty(rgb.shape[:-1] + (4,), dtype=np.uint8)
+    hsi = _rgb_to_hsi_channels(rgb[..., 0], rgb[..., 1], rgb[..., 2])
+    return _hsi_to_rgbw_into(*hsi, out, trig)
+
+
+def hsv_to_rgbw(hsv, out=None, trig="exact", engine="float"):
+    """
+    convert hsv[0.0-1.0] rows straight to rgbw[0-255] uint8 rows, bit for bit
+    what Color.rgbw gives (hsv_to_rgb -> rgb_to_hsi -> hsi_to_rgbw) but without
+    building the intermediate rgb and hsi arrays.  Pass a preallocated (N,4)
+    uint8 `out` to fill it in place.  engine="fixed" rounds hsv to Q15 and
+    does the rest in integers, see fixed.py; integer hsv rows are taken as
+    Q15 already (fixed.HSV_ONE == 1.0) and never go through float at all.
+    Q15 input lands within 1 of the float path, float input (after rounding
+    to Q15) within 3.
+    """
+    assert engine in ("float", "fixed"), "engine must be 'float' or 'fixed'"
+    if engine == "fixed":
+        # fixed checks Q15 rows itself
+        q15 = np.asarray(hsv)
+        if q15.dtype.kind not in "ui":
+            hsv = _as_triples(hsv, "hsv")
+            ok = is_hsv_array(hsv)
+            assert ok.all(), "malformed hsv rows:" + str(bad_rows(ok))
+            q15 = fixed.to_q15(hsv)
+        rgbw = fixed.hsv_to_rgbw(q15)
+        if out is None:
+            return rgbw
+        out[...] = rgbw
+        return out
+    hsv = _as_triples(hsv, "hsv")
+    ok = is_hsv_array(hsv)
+    assert ok.all(), "malformed hsv rows:" + str(bad_rows(ok))
+    if out is None:
+        out = np.empty(hsv.shape[:-1] + (4,), dtype=np.uint8)
+    rgb = _hsv_to_rgb_channels(hsv[..., 0], hsv[..., 1], hsv[..., 2])
+    return _hsi_to_rgbw_into(*_rgb_to_hsi_channels(*rgb), out, trig)
+
+
+def _rgbw_to_hsi_channels(rgbw):
+    "rgbw_to_hsi on (..., 4) rows, returns hue, saturation, intensity arrays"
+    rgbw = np.asarray(rgbw)
+    ok = is_rgbw_array(rgbw)
+    assert ok.all(), "malformed rgbw rows:" + str(bad_rows(ok))
+    rgbw = rgbw.astype(np.float64)
+    m = rgbw[..., :3].min(axis=-1)
+    r, g, b = (rgbw[..., c] - m for c in range(3))
+    w = rgbw[..., 3] + m
+    # hsi_to_rgbw truncates, so a lit channel was on average half a step higher
+    r, g, b = (np.where(c > 0, c + 0.5, 0.0) for c in (r, g, b))
+
+    sector = np.where((r == 0) & (g != 0), 1, np.where((b == 0) & (r != 0), 0, 2))
+    first = np.choose(sector, (r, g, b))
+    second = np.choose(sector, (g, b, r))
+
+    chroma = (first + second) / 765.0
+    intensity = chroma + w / 255.0
+    colored = (chroma > 0.0) & (intensity > 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = 3.0 * first / (first + second) - 1.0
+        saturation = np.where(colored, chroma / intensity, 0.0)
+    H = np.arctan2(1.0 - ratio * np.cos(1.047196667), ratio * np.sin(1.047196667))
+    H = (np.maximum(H, 0.0) + _SECTOR_OFFSET[sector]) * 180.0 / 3.14159
+    hue = np.where(colored, np.fmod(H, 360.0), 0.0)
+    return hue, saturation, intensity
+
+
+def _hsi_hue_to_rgb_channels(H, S, I):
+    "undo rgb_to_hsi, float r, g, b[0-255] arrays"
+    total = I / 0.33333
+    m = (1.0 - S) * I  # rgb_to_hsi has S = 1 - min / I
+    sector = np.trunc(H / 60.0)
+    f = H / 60.0 - sector
+    sector = sector.astype(np.intp) % 6
+    f = np.where(sector % 2 == 1, 1.0 - f, f)
+    C = (total - 3.0 * m) / (1.0 + f)
+    M, mid = m + C, m + C * f
+    return (
+        np.choose(sector, (M, mid, m, m, mid, M)) * 255.0,
+        np.choose(sector, (mid, M, M, mid, m, m)) * 255.0,
+        np.choose(sector, (m, m, mid, M, M, mid)) * 255.0,
+    )
+
+
+def rgbw_to_hsi(rgbw):
+    "decode rgbw[0-255] rows to the hsi rows hsi_to_rgbw would encode to them"
+    return _stack(*_rgbw_to_hsi_channels(rgbw))
+
+
+_NUDGES = np.array(_RGB_NUDGES)
+
+
+def rgbw_to_rgb(rgbw):
+    "decode rgbw[0-255] rows to rgb[0-255] uint8 rows, see converters.rgbw_to_rgb"
+    rgbw = np.asarray(rgbw)
+    rgb = _hsi_hue_to_rgb_channels(*_rgbw_to_hsi_channels(rgbw))
+    rgb = _to_uint8(np.round(_stack(*rgb)))
+
+    # where that rgb doesn't encode back to rgbw, try its neighbours
+    flat, want = rgb.reshape(-1, 3), rgbw.reshape(-1, 4)
+    miss = np.flatnonzero((rgb_to_rgbw(flat) != want).any(axis=-1))
+    found = np.zeros(len(miss), dtype=bool)
+    best = flat[miss]
+    for nudge in _NUDGES[1:]:
+        todo = ~found
+        if not todo.any():
+            break
+        cand = np.clip(flat[miss[todo]].astype(np.int16) + nudge, 0, 255)
+        hit = (rgb_to_rgbw(cand) == want[miss[todo]]).all(axis=-1)
+        idx = np.flatnonzero(todo)[hit]
+        best[idx] = cand[hit]
+        found[idx] = True
+    flat[miss] = best
+    return rgb
+
+
+def rgbw_to_hsv(rgbw):
+    "decode rgbw[0-255] rows to hsv[0.0-1.0] rows, what Color.from_rgbw holds"
+    return rgb_to_hsv(rgbw_to_rgb(rgbw))
+
+
+def pack_rgb(rgb):
+    "pack rgb[0-255] rows into 0xRRGGBB uint32 values"
+    rgb = np.asarray(rgb)
+    if rgb.dtype != np.uint8:
+        ok = is_rgb_array(rgb)
+        assert ok.all(), "malformed rgb rows:" + str(bad_rows(ok))
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def unpack_rgb(packed):
+    "unpack 0xRRGGBB values into rgb uint8 rows"
+    packed = np.asarray(packed, dtype=np.uint32)
+    return np.stack(
+        ((packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF), axis=-1
+    ).astype(np.uint8)
+
+
+def pack_rgbw(rgbw):
+    """
+    pack rgbw[0-255] rows into 0xRRGGBBWW uint32 values.  These are host order
+    words, .astype(">u4").tobytes() gives the R, G, B, W byte stream.
+    """
+    rgbw = np.asarray(rgbw)
+    if rgbw.dtype != np.uint8:
+        ok = is_rgbw_array(rgbw)
+        assert ok.all(), "malformed rgbw rows:" + str(bad_rows(ok))
+    rgbw = np.ascontiguousarray(rgbw, dtype=np.uint8)
+    # the rows are R, G, B, W bytes in order, so they are big endian words
+    return rgbw.view(">u4")[..., 0].astype(np.uint32)
+
+
+def unpack_rgbw(packed):
+    "unpack 0xRRGGBBWW values into rgbw uint8 rows"
+    packed = np.asarray(packed, dtype=np.uint32)
+    return packed.astype(">u4")[..., None].view(np.uint8)
+
+
+def int_to_rgbw_int(packed, out=None, trig="exact"):
+    """
+    convert packed 0xRRGGBB values (a uint32 array, array('I'), any sequence of
+    ints) to packed 0xRRGGBBWW uint32 values, the Color.rgbw path.  Pass a
+    preallocated uint32 `out` to fill it in place.
+    """
+    packed = np.asarray(packed, dtype=np.uint32)
+    assert not (packed >> 24).any(), "packed rgb values must be 0xRRGGBB"
+    r = (packed >> 16 & 0xFF).astype(np.float64)
+    g = (packed >> 8 & 0xFF).astype(np.float64)
+    b = (packed & 0xFF).astype(np.float64)
+    rgbw = np.empty(packed.shape + (4,), dtype=np.uint8)
+    _hsi_to_rgbw_into(*_rgb_to_hsi_channels(r, g, b), rgbw, trig)
+    if out is None:
+        return pack_rgbw(rgbw)
+    out[...] = pack_rgbw(rgbw)
+    return out
@@ -0,0 +1,213 @@
+"""
+Calibration
+
+hsi_to_rgbw assumes ideal LEDs.  Real fixtures need gamma correction, a
+per-channel gain (to balance channels, or cap power), and their white LED is
+rarely neutral.  A FixtureProfile describes one fixture type, compile_profile
+turns it into 256 entry lookup tables, and apply_calibration runs a whole
+frame through them in one vectorized pass:
+
+    >>> warm = FixtureProfile("warm strip", gamma=2.2, white_tint=(1.0, 0.85, 0.6))
+    >>> cal = compile_profile(warm)
+    >>> apply_calibration(frame_rgbw, cal)
+
+For frames mixing fixture types, pass a list of compiled profiles and the
+fixture index of every pixel:
+
+    >>> apply_calibration(frame_rgbw, [cal_a, cal_b], fixtures=pixel_fixture)
+
+The white tint is the color the white LED really gives, relative to the
+white the conversion wanted (1.0 being full).  The channels it falls short
+on are topped up from the rgb LEDs in proportion to w, then every channel
+goes through its gamma / gain table:
+
+    out[c] = table[c][min(255, in[c] + tint[c][w])]    (w itself: table[3][w])
+    table[c][x] = round(255 * gain[c] * (x / 255) ** gamma[c])
+
+Compiled profiles are cached on disk (under lut.default_cache_dir()) keyed
+by a hash of the profile, so a show with many fixture types starts without
+recompiling them.
+"""
+import hashlib
+import json
+import numbers
+import os
+import tempfile
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors.batch import bad_rows, is_rgbw_array
+from rgbw_colorspace_converter.colors.lut import default_cache_dir
+
+__all__ = [
+    "CALIBRATION_VERSION",
+    "FixtureProfile",
+    "CompiledProfile",
+    "compile_profile",
+    "apply_calibration",
+]
+
+# Bump this whenever the way profiles compile to tables changes
+CALIBRATION_VERSION = 1
+
+_compiled = {}
+
+
+def _per_channel(value, n, what):
+    # numbers.Real covers numpy's scalars (np.uint8, np.float32, ...) too
+    if isinstance(value, numbers.Real):
+        return (float(value),) * n
+    value = tuple(float(v) for v in value)
+    assert len(value) == n, f"{what} needs 1 or {n} values, got {len(value)}"
+    return value
+
+
+class FixtureProfile:
+    """
+    How one fixture type renders rgbw.  gamma and gain are a single value or
+    one per r, g, b, w channel, white_tint is the (r, g, b) the white LED
+    gives, each 0.0-1.0.
+    """
+
+    def __init__(self, name, gamma=1.0, gain=1.0, white_tint=(1.0, 1.0, 1.0)):
+        self.name = name
+        self.gamma = _per_channel(gamma, 4, "gamma")
+        self.gain = _per_channel(gain, 4, "gain")
+        self.white_tint = _per_channel(white_tint, 3, "white_tint")
+        assert all(g > 0.0 for g in self.gamma), "gamma must be > 0"
+        assert all(0.0 <= g <= 1.0 for g in self.gain), "gain must be 0.0-1.0"
+        assert all(0.0 <= t <= 1.0 for t in self.white_tint), "tint must be 0.0-1.0"
+        assert max(self.white_tint) > 0.0, "the white LED has to give some light"
+
+    def __repr__(self):
+        return f"FixtureProfile({self.name!r}, gamma={self.gamma}, gain={self.gain}, white_tint={self.white_tint})"
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "gamma": list(self.gamma),
+            "gain": list(self.gain),
+            "white_tint": list(self.white_tint),
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["name"], d["gamma"], d["gain"], d["white_tint"])
+
+    def digest(self):
+        "hex sha256 of everything that goes into the tables (not the name)"
+        d = self.to_dict()
+        del d["name"]
+        d["version"] = CALIBRATION_VERSION
+        return hashlib.sha256(json.dumps(d, sort_keys=True).encode()).hexdigest()
+
+
+class CompiledProfile:
+    """
+    A profile as lookup tables: `tables` (4, 256) uint8 gamma / gain per rgbw
+    channel, `tint` (3, 256) uint8 top up of r, g, b per w value.
+    """
+
+    def __init__(self, tables, tint, digest=None):
+        self.tables = np.asarray(tables, dtype=np.uint8)
+        self.tint = np.asarray(tint, dtype=np.uint8)
+        assert self.tables.shape == (4, 256) and self.tint.shape == (3, 256)
+        self.digest = digest
+
+    def apply(self, rgbw, out=None):
+        return apply_calibration(rgbw, self, out=out)
+
+    __call__ = apply
+
+
+def _build_tables(profile):
+    x = np.arange(256, dtype=np.float64) / 255.0
+    tables = np.stack(
+        [
+            np.floor(255.0 * gain * x**gamma + 0.5)
+            for gamma, gain in zip(profile.gamma, profile.gain)
+        ]
+    )
+    brightest = max(profile.white_tint)
+    w = np.arange(256, dtype=np.float64)
+    tint = np.stack(
+        [np.floor(w * (1.0 - t / brightest) + 0.5) for t in profile.white_tint]
+    )
+    return tables.astype(np.uint8), tint.astype(np.uint8)
+
+
+def _cache_path(cache_dir, digest):
+    return os.path.join(cache_dir, "calibration", f"{digest}.npz")
+
+
+def compile_profile(profile, cache_dir=None, use_cache=True):
+    """
+    The CompiledProfile for `profile`.  Compiled tables are kept in memory and
+    in cache_dir (default_cache_dir() if None) under the profile's digest, so
+    each distinct profile is only ever built once.  use_cache=False builds
+    from scratch and touches neither.
+    """
+    digest = profile.digest()
+    if not use_cache:
+        return CompiledProfile(*_build_tables(profile), digest=digest)
+    path = _cache_path(cache_dir or default_cache_dir(), digest)
+    if path in _compiled:
+        return _compiled[path]
+
+    try:
+        with np.load(path) as cached:
+            compiled = CompiledProfile(cached["tables"], cached["tint"], digest)
+    except (OSError, KeyError, ValueError, AssertionError):
+        compiled = CompiledProfile(*_build_tables(profile), digest=digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(fh, tables=compiled.tables, tint=compiled.tint)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    _compiled[path] = compiled
+    return compiled
+
+
+def apply_calibration(rgbw, compiled, fixtures=None, out=None):
+    """
+    Run (..., 4) rgbw[0-255] rows through a CompiledProfile, or through a list
+    of them with `fixtures` giving each pixel's index into the list.  Returns
+    uint8 rows, written into `out` if given.
+    """
+    rgbw = np.asarray(rgbw)
+    if rgbw.dtype != np.uint8:
+        ok = is_rgbw_array(rgbw)
+        assert ok.all(), "malformed rgbw rows:" + str(bad_rows(ok))
+        rgbw = rgbw.astype(np.uint8)
+    assert rgbw.shape[-1:] == (4,), f"expected an (N,4) array of rgbw, got {rgbw.shape}"
+    if out is None:
+        out = np.empty_like(rgbw)
+
+    if fixtures is None:
+        tables, tint = compiled.tables, compiled.tint
+        w = rgbw[..., 3]
+        for c in range(3):
+            topped = np.minimum(rgbw[..., c].astype(np.uint16) + tint[c][w], 255)
+            out[..., c] = tables[c][topped]
+        out[..., 3] = tables[3][w]
+        return out
+
+    # one table per fixture stacked up, then indexed by (fixture, value)
+    tables = np.stack([p.tables for p in compiled])
+    tint = np.stack([p.tint for p in compiled])
+    fixtures = np.asarray(fixtures, dtype=np.intp)
+    assert fixtures.shape == rgbw.shape[:-1], "need one fixture index per pixel"
+    assert fixtures.size == 0 or (
+        0 <= fixtures.min() and fixtures.max() < len(compiled)
+    ), "fixture index out of range"
+    w = rgbw[..., 3]
+    for c in range(3):
+        topped = np.minimum(rgbw[..., c].astype(np.uint16) + tint[fixtures, c, w], 255)
+        out[..., c] = tables[fixtures, c, topped]
+    out[..., 3] = tables[fixtures, 3, w]
+    return out
@@ -0,0 +1,236 @@
+"""
+ColorArray
+
+A frame's worth of colors kept as one contiguous (N,3) float64 HSV buffer
+instead of N Color objects, each with its own hsv_t list.  The surface follows
+Color, but every property returns an array with one row (or value) per pixel,
+computed by the batch kernels:
+
+    >>> frame = ColorArray.from_colors([RGB(255, 0, 0), HSV(0.5, 1.0, 1.0)])
+    >>> frame.rgbw
+    array([[254,   0,   0,   0],
+           [  0, 254, 254,   0]], dtype=uint8)
+    >>> frame.hsv_v = frame.hsv_v * 0.5       # dim every pixel at once
+
+Slicing with a slice returns a ColorArray that is a view onto the same buffer
+(so writes through it land in the parent), indexing with an int returns a
+standalone Color copy, and fancy indexing returns a copy, like numpy does.
+
+The HSV buffer itself is exposed through __array_interface__ and the buffer
+protocol (`memoryview(frame)` on python 3.12+, `frame.data` everywhere), so a
+frame can go to numpy, a socket or a file without being copied.
+"""
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch, hexcodec
+from rgbw_colorspace_converter.colors.converters import Color
+
+__all__ = ["ColorArray"]
+
+
+class ColorArray:
+    __slots__ = ("_hsv",)
+
+    def __init__(self, hsv):
+        hsv = np.array(hsv, dtype=np.float64, order="C", ndmin=2)
+        if hsv.size == 0:
+            # [] (no colors) comes out as (1, 0)
+            hsv = hsv.reshape(0, 3)
+        assert hsv.ndim == 2 and hsv.shape[1] == 3, "expected (N,3) hsv rows"
+        ok = batch.is_hsv_array(hsv)
+        assert ok.all(), "malformed hsv rows:" + str(batch.bad_rows(ok))
+        self._hsv = hsv
+
+    @classmethod
+    def _wrap(cls, hsv):
+        "a ColorArray over an existing (N,3) float64 buffer, no copy or checks"
+        new = cls.__new__(cls)
+        new._hsv = hsv
+        return new
+
+    @classmethod
+    def zeros(cls, n):
+        "n black pixels"
+        return cls._wrap(np.zeros((n, 3), dtype=np.float64))
+
+    @classmethod
+    def from_colors(cls, colors):
+        "build from a sequence of Color objects"
+        return cls([c.hsv_t for c in colors])
+
+    @classmethod
+    def from_rgb(cls, rgb):
+        "build from rgb[0-255] rows"
+        return cls._wrap(batch.rgb_to_hsv(rgb).reshape(-1, 3))
+
+    @classmethod
+    def from_rgbw(cls, rgbw):
+        "decode rgbw[0-255] rows, ie: a recorded frame, see batch.rgbw_to_rgb"
+        return cls._wrap(batch.rgbw_to_hsv(rgbw).reshape(-1, 3))
+
+    @classmethod
+    def from_int(cls, packed):
+        "build from packed 0xRRGGBB values (uint32 array, array('I'), ints)"
+        return cls.from_rgb(batch.unpack_rgb(packed))
+
+    def to_int(self):
+        "(N,) uint32 rgb packed as 0xRRGGBB"
+        return batch.pack_rgb(self.rgb)
+
+    def to_rgbw_int(self):
+        """
+        (N,) uint32 rgbw packed as 0xRRGGBBWW.  In memory these are host order
+        words, .astype(">u4").tobytes() gives the R, G, B, W byte stream.
+        """
+        return batch.pack_rgbw(batch.hsv_to_rgbw(self._hsv))
+
+    def to_colors(self):
+        "a list with one standalone Color per pixel"
+        return [Color(t) for t in self._hsv.tolist()]
+
+    def copy(self):
+        return self._wrap(self._hsv.copy())
+
+    def __len__(self):
+        return len(self._hsv)
+
+    def __iter__(self):
+        return iter(self.to_colors())
+
+    def __repr__(self):
+        return f"ColorArray({len(self)} colors)"
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return Color(tuple(self._hsv[idx].tolist()))
+        return self._wrap(self._hsv[idx])
+
+    def __setitem__(self, idx, value):
+        if isinstance(value, Color):
+            value = value.hsv_t
+        elif isinstance(value, ColorArray):
+            value = value._hsv
+        else:
+            value = np.asarray(value, dtype=np.float64)
+            ok = batch.is_hsv_array(value)
+            assert np.all(ok), "malformed hsv rows:" + str(batch.bad_rows(ok))
+        self._hsv[idx] = value
+
+    """
+    Buffer access, the HSV storage without a copy
+    """
+
+    @property
+    def __array_interface__(self):
+        return self._hsv.__array_interface__
+
+    def __buffer__(self, flags):
+        return memoryview(self._hsv)
+
+    @property
+    def data(self):
+        "a memoryview of the (N,3) float64 hsv buffer"
+        return memoryview(self._hsv)
+
+    """
+    Color spaces, one row per pixel
+    """
+
+    @property
+    def hsv(self):
+        "the (N,3) hsv[0.0-1.0] buffer itself (a view, not a copy)"
+        return self._hsv
+
+    @property
+    def rgb(self):
+        "(N,3) rgb[0-255] uint8"
+        return batch.hsv_to_rgb(self._hsv)
+
+    @property
+    def rgbw(self):
+        "(N,4) rgbw[0-255] uint8"
+        return batch.hsv_to_rgbw(self._hsv)
+
+    @property
+    def hsi(self):
+        "(N,3) hsi, H in 0-360"
+        return batch.rgb_to_hsi(self.rgb)
+
+    @property
+    def hsl(self):
+        "(N,3) hsl, H in 0-360"
+        hsl = batch.hsv_to_hsl(self._hsv)
+        hsl[:, 0] = np.clip(hsl[:, 0] * 360.0, 0.0, 360.0)
+        return hsl
+
+    @property
+    def hex(self):
+        "(N,) array of '#rrggbb' strings"
+        return hexcodec.format_hex(self.rgb)
+
+    """
+    Individual HSV components, as views into the buffer.  Setting one
+    clamps and rounds the values the same way the Color setters do.
+    """
+
+    def _set_hsv_component(self, i, val):
+        self._hsv[:, i] = np.round(np.clip(val, 0.0, 1.0), 8)
+
+    @property
+    def hsv_h(self):
+        return self._hsv[:, 0]
+
+    @hsv_h.setter
+    def hsv_h(self, val):
+        self._set_hsv_component(0, val)
+
+    @property
+    def hsv_s(self):
+        return self._hsv[:, 1]
+
+    @hsv_s.setter
+    def hsv_s(self, val):
+        self._set_hsv_component(1, val)
+
+    @property
+    def hsv_v(self):
+        return self._hsv[:, 2]
+
+    @hsv_v.setter
+    def hsv_v(self, val):
+        self._set_hsv_component(2, val)
+
+    """
+    Individual RGB components
+    """
+
+    def _set_rgb_component(self, i, val):
+        val = np.asarray(val)
+        assert ((0 <= val) & (val <= 255)).all()
+        rgb = self.rgb
+        rgb[:, i] = val
+        self._hsv[:] = batch.rgb_to_hsv(rgb)
+
+    @property
+    def rgb_r(self):
+        return self.rgb[:, 0]
+
+    @rgb_r.setter
+    def rgb_r(self, val):
+        self._set_rgb_component(0, val)
+
+    @property
+    def rgb_g(self):
+        return self.rgb[:, 1]
+
+    @rgb_g.setter
+    def rgb_g(self, val):
+        self._set_rgb_component(1, val)
+
+    @property
+    def rgb_b(self):
+        return self.rgb[:, 2]
+
+    @rgb_b.setter
+    def rgb_b(self, val):
+        self._set_rgb_component(2, val)
@@ -1,7 +1,7 @@
 """
 Color
 
-Color class that allows you to initialize a color in any of HSV, HSL, HSI, RGB, Hex color spaces.  Once initialized, the corresponding RGBW values are calculated and you may modify the object in RGB or HSV color spaces( ie: by re-setting any component of HSV or RGB (ie, just resetting the R value) and all RGB/HSV/RGBW values will be recalculated.  As of now, you can not work in RGBW directly as we have not written the conversions from RGBW back to one of the standard color spaces. (annoying, but so it goes).
+Color class that allows you to initialize a color in any of HSV, HSL, HSI, RGB, Hex color spaces.  Once initialized, the corresponding RGBW values are calculated and you may modify the object in RGB or HSV color spaces( ie: by re-setting any component of HSV or RGB (ie, just resetting the R value) and all RGB/HSV/RGBW values will be recalculated.  RGBW values can be decoded back into a Color too (RGBW() / Color.from_rgbw), to within a few steps of the original RGB, see rgbw_to_hsi.
 
 
 The main goal of this class is to translate various color spaces into RGBW for use in RGBW pixels.
@@ -25,6 +25,9 @@ HSL/HSI values range from 0-360 for H, 0-1 for S/[L|I]
 Colors may also be specified as hexadecimal string:
 
     >>> blue  = Hex('#0000ff')
+    >>> blue  = Hex('00f')
+
+(for thousands of them at once, see hexcodec.parse_hex / format_hex)
 
 Both RGB and HSV components are available as attributes
 and may be set.
@@ -75,11 +78,14 @@ For example: to gradually dim a color
 RGBW
 
 To get the (r,g,b,w) tuples back from a Color object, simpy call Color.rgbw and you will return the (r,g,b,w) tuple.
+Going the other way, RGBW(r, g, b, w) returns the Color that produces (or comes closest to producing) that rgbw.
+
+Colors can also be passed around as packed ints, 0xRRGGBB in (Color.from_int, Color.to_int) and 0xRRGGBBWW out (Color.to_rgbw_int).  Colors compare and hash by their packed rgb value.
 
 """
 import colorsys
 import math
-from copy import deepcopy
+import os
 
 __all__ = ["RGB", "HSV", "Hex", "Color", "HSI", "RGBW", "HSL"]
 
@@ -142,94 +148,59 @@ def constrain(val, min, max):
     return ret
 
 
-# https://www.neltnerlabs.com/saikoled/how-to-convert-from-hsi-to-rgb-white
-def hsi_to_rgb(H, S, I):
-    r = 0.0
-    g = 0.0
-    b = 0.0
+# trig="table" mode for the hsi conversions: the cos(H) / cos(1.047196667 - H)
+# ratio they need, precomputed every 0.1 degree across one 120 degree sector.
+# H is snapped to the nearest entry, which keeps every 8 bit output within
+# +/-1 of trig="exact" (see benchmarks/bench_trig_table.py for the report).
+HUE_TABLE_STEP = 3.14159 / 180.0 / 10.0  # radians, in the 3.14159 units used below
+_HUE_RATIO_TABLE = [
+    math.cos(k * HUE_TABLE_STEP) / math.cos(1.047196667 - k * HUE_TABLE_STEP)
+    for k in range(int(2.09439 / HUE_TABLE_STEP) + 2)
+]
 
-    H = math.fmod(H, 360.0)
-    H = 3.14159 * H / 180.0
-    S = constrain(S, 0.0, 1.0)
-    I = constrain(I, 0.0, 1.0)
 
+def _hsi_sector(H):
+    "fold H (degrees) into (sector 0-2, radians from the start of that sector)"
+    H = float(math.fmod(H, 360))  # cycle H around to 0-360 degrees
+    H = 3.14159 * H / 180.0  # Convert to radians.
     if H < 2.09439:
-        r = 255.0 * I / 3.0 * (1.0 + S * math.cos(H) / math.cos(1.047196667 - H))
-        g = (
-            255.0
-            * I
-            / 3.0
-            * (1.0 + S * (1.0 - math.cos(H) / math.cos(1.047196667 - H)))
-        )
-        b = 255.0 * I / 3.0 * (1.0 - S)
+        return 0, H
     elif H < 4.188787:
-        H = H - 2.09439
-        g = 255.0 * I / 3.0 * (1.0 + S * math.cos(H) / math.cos(1.047196667 - H))
-        b = (
-            255.0
-            * I
-            / 3.0
-            * (1.0 + S * (1.0 - math.cos(H) / math.cos(1.047196667 - H)))
-        )
-        r = 255.0 * I / 3.0 * (1.0 - S)
-    else:
-        H = H - 4.188787
-        b = 255.0 * I / 3.0 * (1.0 + S * math.cos(H) / math.cos(1.047196667 - H))
-        r = (
-            255.0
-            * I
-            / 3.0
-            * (1.0 + S * (1.0 - math.cos(H) / math.cos(1.047196667 - H)))
-        )
-        g = 255.0 * I / 3.0 * (1.0 - S)
+        return 1, H - 2.09439
+    return 2, H - 4.188787
 
-    return (
-        constrain(int(r * 3.0), 0, 255),
-        constrain(int(g * 3.0), 0, 255),
-        constrain(int(b * 3.0), 0, 255),
-    )  # for some reason, the rgb numbers need to be X3...
+
+def _hue_cosines(H, trig="exact"):
+    """
+    (cos(H), cos(1.047196667 - H)) for H radians into an hsi sector.  In table
+    mode the ratio of the two comes from the table instead, returned as
+    (ratio, 1.0) so callers can divide either way.
+    """
+    if trig == "table" and H >= 0.0:
+        k = int(H / HUE_TABLE_STEP + 0.5)
+        if k < len(_HUE_RATIO_TABLE):
+            return _HUE_RATIO_TABLE[k], 1.0
+    else:
+        assert trig in ("exact", "table"), "trig must be 'exact' or 'table'"
+    return math.cos(H), math.cos(1.047196667 - H)
 
 
 # https://www.neltnerlabs.com/saikoled/how-to-convert-from-hsi-to-rgb-white
-def hsi_to_rgb_2nd(H, S, I):
-    r = 0.0
-    g = 0.0
-    b = 0.0
-
-    H = math.fmod(H, 360.0)
-    H = 3.14159 * H / 180.0
+def hsi_to_rgb(H, S, I, trig="exact"):
+    sector, H = _hsi_sector(H)
     S = constrain(S, 0.0, 1.0)
     I = constrain(I, 0.0, 1.0)
-
-    if H < 2.09439:
-        r = 255.0 * I / 3.0 * (1.0 + S * math.cos(H) / math.cos(1.047196667 - H))
-        g = (
-            255.0
-            * I
-            / 3.0
-            * (1.0 + S * (1.0 - math.cos(H) / math.cos(1.047196667 - H)))
-        )
-        b = 255.0 * I / 3.0 * (1.0 - S)
-    elif H < 4.188787:
-        H = H - 2.09439
-        g = 255.0 * I / 3.0 * (1.0 + S * math.cos(H) / math.cos(1.047196667 - H))
-        b = (
-            255.0
-            * I
-            / 3.0
-            * (1.0 + S * (1.0 - math.cos(H) / math.cos(1.047196667 - H)))
-        )
-        r = 255.0 * I / 3.0 * (1.0 - S)
+    cos_h, cos_1047_h = _hue_cosines(H, trig)
+
+    first = 255.0 * I / 3.0 * (1.0 + S * cos_h / cos_1047_h)
+    second = 255.0 * I / 3.0 * (1.0 + S * (1.0 - cos_h / cos_1047_h))
+    third = 255.0 * I / 3.0 * (1.0 - S)
+    if sector == 0:
+        r, g, b = first, second, third
+    elif sector == 1:
+        g, b, r = first, second, third
     else:
-        H = H - 4.188787
-        b = 255.0 * I / 3.0 * (1.0 + S * math.cos(H) / math.cos(1.047196667 - H))
-        r = (
-            255.0
-            * I
-            / 3.0
-            * (1.0 + S * (1.0 - math.cos(H) / math.cos(1.047196667 - H)))
-        )
-        g = 255.0 * I / 3.0 * (1.0 - S)
+        b, r, g = first, second, third
 
     return (
         constrain(int(r * 3.0), 0, 255),
@@ -239,42 +210,26 @@ def hsi_to_rgb_2nd(H, S, I):
 
 
 # https://www.neltnerlabs.com/saikoled/how-to-convert-from-hsi-to-rgb-white
-def hsi_to_rgbw(H, S, I):
-    r = 0
-    g = 0
-    b = 0
-    w = 0
-    cos_h = 0.0
-    cos_1047_h = 0.0
+def hsi_to_rgb_2nd(H, S, I, trig="exact"):
+    return hsi_to_rgb(H, S, I, trig)
 
-    H = float(math.fmod(H, 360))  # cycle H around to 0-360 degrees
-    H = 3.14159 * H / 180.0  # Convert to radians.
+
+# https://www.neltnerlabs.com/saikoled/how-to-convert-from-hsi-to-rgb-white
+def hsi_to_rgbw(H, S, I, trig="exact"):
+    sector, H = _hsi_sector(H)
     S = constrain(S, 0.0, 1.0)
     I = constrain(I, 0.0, 1.0)
-
-    if H < 2.09439:
-        cos_h = math.cos(H)
-        cos_1047_h = math.cos(1.047196667 - H)
-        r = S * 255.0 * I / 3.0 * (1.0 + cos_h / cos_1047_h)
-        g = S * 255.0 * I / 3.0 * (1.0 + (1.0 - cos_h / cos_1047_h))
-        b = 0.0
-        w = 255.0 * (1.0 - S) * I
-    elif H < 4.188787:
-        H = H - 2.09439
-        cos_h = math.cos(H)
-        cos_1047_h = math.cos(1.047196667 - H)
-        g = S * 255.0 * I / 3.0 * (1.0 + cos_h / cos_1047_h)
-        b = S * 255.0 * I / 3.0 * (1.0 + (1.0 - cos_h / cos_1047_h))
-        r = 0.0
-        w = 255.0 * (1.0 - S) * I
+    cos_h, cos_1047_h = _hue_cosines(H, trig)
+
+    first = S * 255.0 * I / 3.0 * (1.0 + cos_h / cos_1047_h)
+    second = S * 255.0 * I / 3.0 * (1.0 + (1.0 - cos_h / cos_1047_h))
+    w = 255.0 * (1.0 - S) * I
+    if sector == 0:
+        r, g, b = first, second, 0.0
+    elif sector == 1:
+        r, g, b = 0.0, first, second
     else:
-        H = H - 4.188787
-        cos_h = math.cos(H)
-        cos_1047_h = math.cos(1.047196667 - H)
-        b = S * 255.0 * I / 3.0 * (1.0 + cos_h / cos_1047_h)
-        r = S * 255.0 * I / 3.0 * (1.0 + (1.0 - cos_h / cos_1047_h))
-        g = 0.0
-        w = 255.0 * (1.0 - S) * I
+        r, g, b = second, 0.0, first
 
     return (
         int(constrain(r * 3, 0, 255)),
@@ -354,11 +309,198 @@ def rgb_to_hsi(r, g, b):
     return (hue, abs(saturation), intensity)
 
 
+def hsv_to_rgbw(h, s, v, trig="exact"):
+    """
+    HSV[0.0-1.0] straight to an RGBW tuple.  Bit for bit the same answer as
+    hsv_to_rgb -> rgb_to_hsi -> hsi_to_rgbw (ie: Color.rgbw), with the three
+    steps inlined so no intermediate tuples or calls are made, and only trig
+    is checked.  trig="table" matches hsi_to_rgbw(..., trig="table") instead.
+    """
+    assert trig in ("exact", "table"), "trig must be 'exact' or 'table'"
+    # hsv_to_rgb, colorsys.hsv_to_rgb truncated to 8 bits
+    if s == 0.0:
+        r = g = b = v
+    else:
+        i = int(h * 6.0)
+        f = (h * 6.0) - i
+        p = v * (1.0 - s)
+        q = v * (1.0 - s * f)
+        t = v * (1.0 - s * (1.0 - f))
+        i = i % 6
+        if i == 0:
+            r, g, b = v, t, p
+        elif i == 1:
+            r, g, b = q, v, p
+        elif i == 2:
+            r, g, b = p, v, t
+        elif i == 3:
+            r, g, b = p, q, v
+        elif i == 4:
+            r, g, b = t, p, v
+        else:
+            r, g, b = v, p, q
+    r = float(int(r * 0xFF)) / 255.0
+    g = float(int(g * 0xFF)) / 255.0
+    b = float(int(b * 0xFF)) / 255.0
+
+    # rgb_to_hsi
+    intensity = 0.33333 * (r + g + b)
+    M = max(r, g, b)
+    m = min(r, g, b)
+    S = 0.0 if intensity == 0.0 else abs(1.0 - (m / intensity))
+    if M == m:
+        H = 0.0
+    elif M == b:
+        H = 60.0 * (4.0 + ((r - g) / (M - m)))
+    elif M == g:
+        H = 60.0 * (2.0 + ((b - r) / (M - m)))
+    else:
+        H = 60.0 * (0.0 + ((g - b) / (M - m)))
+    if H < 0.0:
+        H = H + 360
+
+    # hsi_to_rgbw
+    H = 3.14159 * math.fmod(H, 360) / 180.0
+    if S >= 1.0:
+        S = 1.0
+    if H < 2.09439:
+        sector = 0
+    elif H < 4.188787:
+        sector = 1
+        H = H - 2.09439
+    else:
+        sector = 2
+        H = H - 4.188787
+    if trig == "table":
+        ratio = _HUE_RATIO_TABLE[int(H / HUE_TABLE_STEP + 0.5)]
+    else:
+        ratio = math.cos(H) / math.cos(1.047196667 - H)
+    first = S * 255.0 * intensity / 3.0 * (1.0 + ratio) * 3
+    second = S * 255.0 * intensity / 3.0 * (1.0 + (1.0 - ratio)) * 3
+    w = 255.0 * (1.0 - S) * intensity
+    # constrain(x, 0, 255) then int(), as hsi_to_rgbw does
+    first = 0 if first <= 0 else 255 if first >= 255 else int(first)
+    second = 0 if second <= 0 else 255 if second >= 255 else int(second)
+    w = 0 if w <= 0 else 255 if w >= 255 else int(w)
+
+    if sector == 0:
+        return (first, second, 0, w)
+    if sector == 1:
+        return (0, first, second, w)
+    return (second, 0, first, w)
+
+
+# Decoding RGBW.  hsi_to_rgbw puts S * I into the two color channels (they sum
+# to 3 * 255 * S * I) and (1 - S) * I into white, and the split between the two
+# color channels is cos(H) / cos(1.047196667 - H), so H, S and I come straight
+# back out.  The H that went in was rgb_to_hsi's (hexagonal) hue, so
+# _hsi_hue_to_rgb undoes rgb_to_hsi, not hsi_to_rgb.  What can't be undone is
+# the int() truncation, so rgbw_to_rgb finishes by trying the rgb values one
+# step around its estimate until one encodes back to the same rgbw.
+#
+# Over every 8 bit rgb, decoding Color.rgbw gives back an rgb that encodes to
+# the same rgbw for all but 0.03% of them (those are off by 1), and gets every
+# channel of the original rgb within +/-2 (78.7% exactly, 99.2% within +/-1).
+# The rest is lost in the encoding, several rgb values share one rgbw.
+def rgbw_to_hsi(r, g, b, w):
+    """
+    The hsi (H 0-360, S/I 0.0-1.0) that hsi_to_rgbw would turn into this rgbw.
+    hsi_to_rgbw never lights all three color channels, so any white shared by
+    r, g and b is moved into w first.
+    """
+    m = min(r, g, b)
+    r, g, b, w = r - m, g - m, b - m, w + m
+    # hsi_to_rgbw truncates, so a lit color channel was on average half a step
+    # higher (w comes out whole, it is 255 * the rgb minimum)
+    r, g, b = (c + 0.5 if c > 0 else 0.0 for c in (r, g, b))
+    # which channel is dark picks the sector, then (first, second) are the
+    # channels hsi_to_rgbw wrote first and second in it
+    if r == 0 and g != 0:
+        sector, first, second = 1, g, b
+    elif b == 0 and r != 0:
+        sector, first, second = 0, r, g
+    else:
+        sector, first, second = 2, b, r
+
+    chroma = (first + second) / 765.0  # S * I
+    intensity = chroma + w / 255.0
+    if intensity == 0.0 or chroma == 0.0:
+        return (0.0, 0.0, intensity)
+
+    # first / (first + second) == (1 + ratio) / 3, solved for H
+    ratio = 3.0 * first / (first + second) - 1.0
+    H = math.atan2(1.0 - ratio * math.cos(1.047196667), ratio * math.sin(1.047196667))
+    H = (max(H, 0.0) + (0.0, 2.09439, 4.188787)[sector]) * 180.0 / 3.14159
+    return (math.fmod(H, 360.0), chroma / intensity, intensity)
+
+
+def _hsi_hue_to_rgb(H, S, I):
+    "undo rgb_to_hsi, giving back float r, g, b[0-255]"
+    total = I / 0.33333  # r + g + b, 0.0-3.0
+    m = (1.0 - S) * I  # rgb_to_hsi has S = 1 - min / I
+    sector = int(H / 60.0)
+    f = H / 60.0 - sector
+    sector = sector % 6
+    if sector % 2:
+        f = 1.0 - f
+    # total == M + mid + m with M - m == C and mid - m == C * f
+    C = (total - 3.0 * m) / (1.0 + f)
+    M, mid = m + C, m + C * f
+    r, g, b = (
+        (M, mid, m),
+        (mid, M, m),
+        (m, M, mid),
+        (m, mid, M),
+        (mid, m, M),
+        (M, m, mid),
+    )[sector]
+    return (r * 255.0, g * 255.0, b * 255.0)
+
+
+# rgb steps to try around a decoded color, nearest first
+_RGB_NUDGES = sorted(
+    ((dr, dg, db) for dr in (-1, 0, 1) for dg in (-1, 0, 1) for db in (-1, 0, 1)),
+    key=lambda d: (abs(d[0]) + abs(d[1]) + abs(d[2]), d),
+)
+
+
+def rgbw_to_rgb(r, g, b, w):
+    "the rgb[0-255] whose Color.rgbw is this rgbw, or as near as one exists"
+    rgb = _hsi_hue_to_rgb(*rgbw_to_hsi(r, g, b, w))
+    rgb = tuple(int(constrain(round(c), 0, 255)) for c in rgb)
+    want = (r, g, b, w)
+    for nudge in _RGB_NUDGES:
+        cand = tuple(constrain(c + d, 0, 255) for c, d in zip(rgb, nudge))
+        if hsi_to_rgbw(*rgb_to_hsi(*cand)) == want:
+            return cand
+    return rgb
+
+
+# Packed integers: 0xRRGGBB for rgb (input) and 0xRRGGBBWW for rgbw (output),
+# one machine word per color instead of a tuple.
+def rgb_to_int(r, g, b):
+    "pack rgb[0-255] into 0xRRGGBB"
+    return r << 16 | g << 8 | b
+
+
+def int_to_rgb(n):
+    "unpack 0xRRGGBB into a rgb[0-255] tuple"
+    return (n >> 16 & 0xFF, n >> 8 & 0xFF, n & 0xFF)
+
+
+def rgbw_to_int(r, g, b, w):
+    "pack rgbw[0-255] into 0xRRGGBBWW"
+    return r << 24 | g << 16 | b << 8 | w
+
+
+def int_to_rgbw(n):
+    "unpack 0xRRGGBBWW into a rgbw[0-255] tuple"
+    return (n >> 24 & 0xFF, n >> 16 & 0xFF, n >> 8 & 0xFF, n & 0xFF)
+
+
 def RGBW(r, g, b, w):
     "Create RGBW color"
-    raise Exception(
-        "Gotcha!  We can't yet reverse calculate RGBW back to any other color spaces.... work in one of the other spaces and get your RGBW values back from Color.rgbw.  Sorry."
-    )
+    return Color.from_rgbw(r, g, b, w)
 
 
 def HSI(h, s, i):
@@ -386,48 +528,119 @@ def HSL(h, s, l):
     t = (h, s, l)
     assert is_hsi_hsl_tuple(t)
     (h, s, v) = hsl_to_hsv(t[0], t[1], t[2])
-    print(h, s, v)
     return Color((constrain(h / 360.0, 0.0, 1.0), s, v))
 
 
+# byte value -> two hex digits, for formatting Color.hex
+_HEX_PAIRS = ["%02x" % i for i in range(256)]
+
+
+def hex_to_rgb(value):
+    "parse '#rrggbb' or '#rgb' (with or without the '#') to a rgb[0-255] tuple"
+    digits = value[1:] if value.startswith("#") else value
+    if len(digits) not in (3, 6) or digits.strip("0123456789abcdefABCDEF"):
+        raise ValueError("malformed hex color: " + repr(value))
+    n = int(digits, 16)
+    if len(digits) == 3:
+        return ((n >> 8) * 17, (n >> 4 & 0xF) * 17, (n & 0xF) * 17)
+    return (n >> 16, n >> 8 & 0xFF, n & 0xFF)
+
+
 def Hex(value):
     "Create a new Color from a hex string"
-    value = value.lstrip("#")
-    lv = len(value)
-    rgb_t = (int(value[i : i + int(lv / 3)], 16) for i in range(0, lv, int(lv / 3)))
-    return Color(RGB(*rgb_t).hsv_t)
+    return Color(rgb_to_hsv(hex_to_rgb(value)))
 
 
 class Color:
+    # Derived color spaces are computed on first use and kept until one of the
+    # hsv_* / rgb_* setters actually changes the color.  hsv_t is still the
+    # state of record, so don't modify it directly or the cache goes stale.
+    __slots__ = ("hsv_t", "_rgb", "_rgbw", "_hsi", "_hsl", "_hex")
+
     def __init__(self, hsv_tuple):
         self._set_hsv(hsv_tuple)
 
+    @classmethod
+    def from_rgbw(cls, r, g, b, w):
+        "the Color whose rgbw is (closest to) r, g, b, w, see rgbw_to_hsi"
+        t = (r, g, b, w)
+        assert is_rgbw_tuple(t), "malformed rgbw tuple:" + str(t)
+        return cls(rgb_to_hsv(rgbw_to_rgb(r, g, b, w)))
+
+    @classmethod
+    def from_int(cls, n):
+        "the Color for a packed 0xRRGGBB value"
+        assert 0 <= n <= 0xFFFFFF, "packed rgb out of range: " + hex(n)
+        return cls(rgb_to_hsv(int_to_rgb(n)))
+
+    def to_int(self):
+        "rgb packed as 0xRRGGBB"
+        r, g, b = self.rgb
+        return r << 16 | g << 8 | b
+
+    def to_rgbw_int(self):
+        "rgbw packed as 0xRRGGBBWW"
+        r, g, b, w = self.rgbw
+        return r << 24 | g << 16 | b << 8 | w
+
+    # Colors compare and hash by their packed rgb, ie: what they put on the
+    # wire, so two Colors whose hsv differs below 8 bits are equal.  Colors are
+    # mutable, so don't change one while it is a dict key or in a set.
+    def __eq__(self, other):
+        if not isinstance(other, Color):
+            return NotImplemented
+        return self.to_int() == other.to_int()
+
+    def __hash__(self):
+        return self.to_int()
+
     def __repr__(self):
         return f"rgb={self.rgb} rgbw={self.rgbw} hsv={self.hsv} hsl={self.hsl} hsi={self.hsi} hex={self.hex}"
 
     def copy(self):
-        return deepcopy(self)
+        new = self.__class__.__new__(self.__class__)
+        for name in Color.__slots__:
+            setattr(new, name, getattr(self, name))
+        new.hsv_t = list(self.hsv_t)
+        return new
+
+    def _clear_cache(self):
+        self._rgb = self._rgbw = self._hsi = self._hsl = self._hex = None
 
     def _set_hsv(self, hsv_tuple):
         assert is_hsv_tuple(hsv_tuple)
         # convert to a list for component reassignment
-        self.hsv_t = list(hsv_tuple)
+        hsv_t = list(hsv_tuple)
+        if getattr(self, "hsv_t", None) != hsv_t:
+            self.hsv_t = hsv_t
+            self._clear_cache()
+
+    def _set_hsv_component(self, i, val):
+        v = round(clamp(val, 0.0, 1.0), 8)
+        if self.hsv_t[i] != v:
+            self.hsv_t[i] = v
+            self._clear_cache()
 
     @property
     def rgbw(self):
         "returns a tuple of 4 values each in the range of 0-255"
-        hsi = rgb_to_hsi(self.rgb[0], self.rgb[1], self.rgb[2])
-        return hsi_to_rgbw(hsi[0], hsi[1], hsi[2])
+        if self._rgbw is None:
+            self._rgbw = hsv_to_rgbw(self.hsv_t[0], self.hsv_t[1], self.hsv_t[2])
+        return self._rgbw
 
     @property
     def hsi(self):
-        return rgb_to_hsi(self.rgb[0], self.rgb[1], self.rgb[2])
+        if self._hsi is None:
+            rgb = self.rgb
+            self._hsi = rgb_to_hsi(rgb[0], rgb[1], rgb[2])
+        return self._hsi
 
     @property
     def rgb(self):
         "returns a rgb[0-255] tuple"
-        new_t = (self.hsv_t[0], self.hsv_t[1], self.hsv_t[2])
-        return hsv_to_rgb(new_t)
+        if self._rgb is None:
+            self._rgb = hsv_to_rgb((self.hsv_t[0], self.hsv_t[1], self.hsv_t[2]))
+        return self._rgb
 
     @property
     def hsv(self):
@@ -438,14 +651,19 @@ class Color:
     @property
     def hex(self):
         "returns a hexadecimal string"
-        return "#%02x%02x%02x" % self.rgb
+        if self._hex is None:
+            r, g, b = self.rgb
+            self._hex = "#" + _HEX_PAIRS[r] + _HEX_PAIRS[g] + _HEX_PAIRS[b]
+        return self._hex
 
     @property
     def hsl(self):
         "returns HSL tuple"
-        (h, s, l) = hsv_to_hsl(self.hsv_t[0], self.hsv_t[1], self.hsv_t[2])
-        h = constrain(h * 360.0, 0.0, 360.0)
-        return (h, s, l)
+        if self._hsl is None:
+            (h, s, l) = hsv_to_hsl(self.hsv_t[0], self.hsv_t[1], self.hsv_t[2])
+            h = constrain(h * 360.0, 0.0, 360.0)
+            self._hsl = (h, s, l)
+        return self._hsl
 
     """
     Properties representing individual HSV compnents
@@ -460,8 +678,7 @@ class Color:
 
     @hsv_h.setter
     def hsv_h(self, val):
-        v = clamp(val, 0.0, 1.0)
-        self.hsv_t[0] = round(v, 8)
+        self._set_hsv_component(0, val)
 
     @property
     def hsv_s(self):
@@ -469,8 +686,7 @@ class Color:
 
     @hsv_s.setter
     def hsv_s(self, val):
-        v = clamp(val, 0.0, 1.0)
-        self.hsv_t[1] = round(v, 8)
+        self._set_hsv_component(1, val)
 
     @property
     def hsv_v(self):
@@ -478,8 +694,7 @@ class Color:
 
     @hsv_v.setter
     def hsv_v(self, val):
-        v = clamp(val, 0.0, 1.0)
-        self.hsv_t[2] = round(v, 8)
+        self._set_hsv_component(2, val)
 
     """
     Properties representing individual RGB components
@@ -520,3 +735,10 @@ class Color:
         new = (r, g, val)
         assert is_rgb_tuple(new)
         self._set_hsv(rgb_to_hsv(new))
+
+
+# opt-in call counting, see instrument.py
+if os.environ.get("RGBW_CC_INSTRUMENT"):
+    from rgbw_colorspace_converter.colors import instrument
+
+    instrument._from_environment()
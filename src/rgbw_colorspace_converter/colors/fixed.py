@@ -0,0 +1,184 @@
+"""
+Fixed point
+
+An integer only version of the Color.rgbw path (rgb_to_hsi -> hsi_to_rgbw),
+for output that doesn't depend on the platform's floating point, and for
+frames kept as uint8 / uint16 rather than float64.  Select it with
+engine="fixed" in batch.rgb_to_rgbw / batch.hsv_to_rgbw, or call it directly:
+
+    >>> rgb_to_rgbw([[255, 0, 0], [176, 205, 230]])
+    array([[254,   0,   0,   0],
+           [  0,  28,  54, 176]], dtype=uint8)
+
+How the float math maps onto integers:
+
+  * hue is kept in 1/HUE_UNITS degree steps, so the three hsi sectors are
+    whole numbers (120 * HUE_UNITS) and picking one is an integer division
+  * the cos(H) / cos(1.047196667 - H) ratio comes from a table with one
+    entry per hue step, scaled by 2**RATIO_BITS
+  * S * I and (1 - S) * I never need computing, with rgb in they are just
+    the rgb sum less three times its minimum, and the minimum
+  * the 0.33333 in rgb_to_hsi (which is why full red comes out 254) is kept,
+    as a sum / 100000 correction
+
+Every rgb -> rgbw intermediate fits in an int32.  Over every 8 bit rgb the
+output is within 1 of the float path on every channel: r, g and b are
+identical for 99.7% of colors, w for 74%.  The fixed point w is exactly the
+rgb minimum, the float path's 255 * (1 - S) * I lands just under it (and
+truncates to one less) about a quarter of the time.  See tests/test_fixed.py.
+
+hsv goes in as Q15 integers (HSV_ONE == 1.0) since that's what hsv stored
+as uint16 looks like, to_q15 converts float hsv.  Q15 hsv -> rgb is done in
+int64 and is exact: it matches the float path's rgb for every Q15 input, so
+Q15 hsv -> rgbw end to end is within 1 as well.  That bound is for Q15 input
+only.  Float hsv rounded by to_q15 is a slightly different color, which can
+truncate to a different rgb, and rgb -> hsi -> rgbw magnifies that: for the
+hsv of every 8 bit rgb the result is within 3 of the float path on the
+original float hsv (15% of them more than 1 off), for arbitrary float hsv
+within 2.
+"""
+import math
+
+import numpy as np
+
+__all__ = [
+    "HUE_UNITS",
+    "RATIO_BITS",
+    "HSV_ONE",
+    "to_q15",
+    "rgb_to_rgbw",
+    "hsv_to_rgb",
+    "hsv_to_rgbw",
+]
+
+HUE_UNITS = 64  # per degree
+RATIO_BITS = 14
+HSV_ONE = 1 << 15
+
+_SECTOR = 120 * HUE_UNITS
+_ONE = 1 << RATIO_BITS
+# cos(H) / cos(1.047196667 - H) for every hue step into a sector, built with
+# the same radians (3.14159) as hsi_to_rgbw.  Rounded to RATIO_BITS, so the
+# last bit differences between platform cos() implementations don't reach it.
+_RATIO = np.array(
+    [
+        round(
+            _ONE
+            * math.cos(3.14159 * k / HUE_UNITS / 180.0)
+            / math.cos(1.047196667 - 3.14159 * k / HUE_UNITS / 180.0)
+        )
+        for k in range(_SECTOR + 1)
+    ],
+    dtype=np.int32,
+)
+
+
+def to_q15(hsv):
+    "float hsv[0.0-1.0] rows to Q15 uint16 rows, rounded to nearest"
+    hsv = np.asarray(hsv, dtype=np.float64)
+    assert ((hsv >= 0.0) & (hsv <= 1.0)).all(), "hsv must be 0.0-1.0"
+    # scaling by a power of two is exact, the only rounding is the last step
+    return np.rint(np.ldexp(hsv, 15)).astype(np.uint16)
+
+
+def _channels(a, n, what):
+    a = np.asarray(a)
+    assert a.shape[-1:] == (n,), f"expected an (N,{n}) array of {what}, got {a.shape}"
+    return [a[..., c].astype(np.int32) for c in range(n)]
+
+
+def _hue(r, g, b, M, d):
+    "rgb_to_hsi's hue in 1/HUE_UNITS degrees, rounded, 0 for greys"
+    d = np.maximum(d, 1)
+    step = 60 * HUE_UNITS
+    # later channels win ties, same as rgb_to_hsi
+    num = np.where(M == b, r - g, np.where(M == g, b - r, g - b))
+    base = np.where(M == b, 4 * step, np.where(M == g, 2 * step, 0))
+    H = base + (2 * step * num + d) // (2 * d)
+    return np.where(H < 0, H + 360 * HUE_UNITS, H)
+
+
+def _rgbw(r, g, b):
+    "the fixed point rgb -> rgbw on int32 channel arrays, (..., 4) uint8"
+    M = np.maximum(np.maximum(r, g), b)
+    m = np.minimum(np.minimum(r, g), b)
+    d = M - m
+    total = r + g + b
+
+    H = np.where(d == 0, 0, _hue(r, g, b, M, d))
+    sector = H // _SECTOR
+    ratio = _RATIO[H - sector * _SECTOR]
+
+    # first == (total / 3 - m - total / 300000) * (1 + ratio), second the same
+    # with (2 - ratio), done in thirds of RATIO_BITS fixed point
+    chroma = total - 3 * m
+    out = []
+    for scale in (_ONE + ratio, 2 * _ONE - ratio):
+        x = chroma * scale - (total * scale + 99999) // 100000
+        out.append(np.clip(x // (3 * _ONE), 0, 255))
+    first, second = out
+    zero = np.zeros_like(first)
+
+    # white is the rgb minimum, greys lose a little more to the 0.33333
+    w = np.where(d == 0, m * 99998 // 100000, m)
+
+    rgbw = np.empty(r.shape + (4,), dtype=np.uint8)
+    rgbw[..., 0] = np.choose(sector, (first, zero, second))
+    rgbw[..., 1] = np.choose(sector, (second, first, zero))
+    rgbw[..., 2] = np.choose(sector, (zero, second, first))
+    rgbw[..., 3] = w
+    return rgbw
+
+
+def rgb_to_rgbw(rgb):
+    "convert rgb[0-255] integer rows to rgbw[0-255] uint8 rows"
+    r, g, b = _channels(rgb, 3, "rgb")
+    assert ((r | g | b) >> 8 == 0).all(), "rgb values must be 0-255"
+    return _rgbw(r, g, b)
+
+
+def _hsv_to_rgb_channels(h, s, v):
+    """
+    colorsys.hsv_to_rgb on Q15 ints, scaled to 0-255 and truncated.  With
+    Q15 in, every product the float path forms is exact (v * (1 - s * f) is
+    at most 46 bits, times 255 under 53), so doing the same products exactly
+    in int64 and flooring gives the float path's rgb bit for bit.
+    """
+    h, s, v = (x.astype(np.int64) for x in (h, s, v))
+    h6 = h * 6
+    i = h6 >> 15
+    f = h6 & (HSV_ONE - 1)
+    # colorsys short circuits greys to (v, v, v); s == 0 makes p, q and t
+    # all v, so sector 0 gives the same
+    i = np.where(s == 0, 0, i % 6)
+    one30 = HSV_ONE << 15
+    v8 = v * 255 >> 15
+    p = v * (HSV_ONE - s) * 255 >> 30
+    q = v * (one30 - s * f) * 255 >> 45
+    t = v * (one30 - s * (HSV_ONE - f)) * 255 >> 45
+    return tuple(
+        x.astype(np.int32)
+        for x in (
+            np.choose(i, (v8, q, p, p, t, v8)),
+            np.choose(i, (t, v8, v8, q, p, p)),
+            np.choose(i, (p, p, t, v8, v8, q)),
+        )
+    )
+
+
+def _q15_channels(hsv):
+    h, s, v = _channels(hsv, 3, "hsv")
+    for x in (h, s, v):
+        assert ((x >= 0) & (x <= HSV_ONE)).all(), "Q15 hsv values must be 0-HSV_ONE"
+    return h, s, v
+
+
+def hsv_to_rgb(hsv):
+    "convert Q15 hsv rows to rgb[0-255] uint8 rows"
+    rgb = _hsv_to_rgb_channels(*_q15_channels(hsv))
+    return np.stack(rgb, axis=-1).astype(np.uint8)
+
+
+def hsv_to_rgbw(hsv):
+    "convert Q15 hsv rows to rgbw[0-255] uint8 rows, the Color.rgbw path"
+    return _rgbw(*_hsv_to_rgb_channels(*_q15_channels(hsv)))
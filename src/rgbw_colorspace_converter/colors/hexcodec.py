@@ -0,0 +1,145 @@
+"""
+Hex codec
+
+Hex strings in bulk, for palettes, cue files and web previews, without a
+Color (or even a python int) per entry.
+
+    >>> parse_hex(["#ff0000", "0f0", b"#0000FF"])
+    array([[255,   0,   0],
+           [  0, 255,   0],
+           [  0,   0, 255]], dtype=uint8)
+    >>> format_hex([[255, 0, 0], [176, 205, 230]])
+    array(['#ff0000', '#b0cde6'], dtype='<U7')
+
+parse_hex accepts '#rrggbb', '#rgb' (each digit doubled, as in CSS) and both
+without the '#', in either case, as str or bytes.  A single bytes / str
+blob is split on whitespace first, so a palette file can be handed over as
+read.  The entries are laid out as one fixed width array of character codes
+and every digit is decoded through a 256 entry table in one step, so the cost
+per entry is a few array operations rather than a str method call each.
+
+Entries that don't parse are reported by index: errors="raise" (the default)
+raises HexError, whose .rows holds every bad index, and errors="mask" returns
+(rgb, ok) instead, with the bad rows black and False in ok.
+"""
+import numpy as np
+
+from rgbw_colorspace_converter.colors.batch import bad_rows, is_rgb_array
+
+__all__ = ["HexError", "parse_hex", "format_hex"]
+
+# character code -> nibble value, _BAD for anything that isn't a hex digit
+_BAD = 0xFF
+_NIBBLE = np.full(256, _BAD, dtype=np.uint8)
+for _i, _c in enumerate(b"0123456789abcdef"):
+    _NIBBLE[_c] = _i
+    _NIBBLE[ord(chr(_c).upper())] = _i
+
+# byte value -> its two lower case hex digits, as one 2 byte (bytes) or one
+# 8 byte (two UCS4 characters, str) item so a lookup moves both at once
+_PAIRS_S = np.array(["%02x" % i for i in range(256)], dtype="S2").view(np.uint16)
+_PAIRS_U = np.array(["%02x" % i for i in range(256)], dtype="U2").view(np.uint64)
+
+
+class HexError(ValueError):
+    "raised by parse_hex, .rows holds the indices of the entries that failed"
+
+    def __init__(self, rows):
+        self.rows = rows
+        super().__init__(f"malformed hex entries at rows: {rows}")
+
+
+def _as_str(v):
+    if isinstance(v, (bytes, bytearray, memoryview)):
+        return bytes(v).decode("latin-1")
+    return v if isinstance(v, str) else ""
+
+
+def _char_codes(values):
+    "(N, width) array of character codes, 0 padded on the right"
+    if isinstance(values, (bytearray, memoryview)):
+        values = bytes(values)
+    if isinstance(values, (bytes, str)):
+        values = values.split()
+    elif not isinstance(values, (list, tuple, np.ndarray)):
+        values = list(values)
+    if len(values) == 0:
+        return np.zeros((0, 1), dtype=np.uint8)
+
+    try:
+        a = np.asarray(values)
+    except ValueError:
+        # ragged, ie: memoryviews numpy took for sequences
+        a = np.empty(0, dtype=object)
+    if a.dtype.kind not in "SU":
+        # a mix of str and bytes, or something else entirely: anything that
+        # isn't text becomes "", which never parses
+        a = np.array([_as_str(v) for v in values])
+    width = max(a.dtype.itemsize // (4 if a.dtype.kind == "U" else 1), 1)
+    codes = a.reshape(-1).view(np.uint32 if a.dtype.kind == "U" else np.uint8)
+    codes = codes.reshape(-1, width)
+    if codes.dtype != np.uint8:
+        # anything past latin-1 can't be a hex digit, fold it onto one that isn't
+        codes = np.minimum(codes, 0xFF).astype(np.uint8)
+    return codes
+
+
+def parse_hex(values, errors="raise"):
+    """
+    Parse hex color strings into (N,3) rgb[0-255] uint8 rows.  `values` is an
+    iterable of str / bytes, or one whitespace separated blob of them (bytes,
+    bytearray, memoryview or str).  Entries that aren't text are bad rows.
+    """
+    assert errors in ("raise", "mask"), "errors must be 'raise' or 'mask'"
+    codes = _char_codes(values)
+    width = codes.shape[1]
+
+    # drop a leading '#' by shifting those rows left one character
+    hashed = codes[:, 0] == ord("#")
+    if hashed.any():
+        codes = codes.copy()
+        codes[hashed, :-1] = codes[hashed, 1:]
+        codes[hashed, -1] = 0
+    if width < 6:
+        codes = np.pad(codes, ((0, 0), (0, 6 - width)))
+    length = (codes != 0).sum(axis=1)
+
+    # a row of 3 or 6 hex digits is exactly 3 or 6 non padding characters
+    nibbles = _NIBBLE[codes[:, :6]]
+    long_form = length == 6
+    ok = (long_form & (nibbles != _BAD).all(axis=1)) | (
+        (length == 3) & (nibbles[:, :3] != _BAD).all(axis=1)
+    )
+
+    rgb = np.where(
+        long_form[:, None],
+        nibbles[:, 0:6:2] << 4 | nibbles[:, 1:6:2],
+        nibbles[:, :3] * 17,
+    ).astype(np.uint8)
+    rgb[~ok] = 0
+
+    if errors == "mask":
+        return rgb, ok
+    if not ok.all():
+        raise HexError(bad_rows(ok))
+    return rgb
+
+
+def format_hex(rgb, as_bytes=False):
+    """
+    Format rgb[0-255] rows as '#rrggbb' strings, a (...,) array of str (or of
+    7 byte bytes with as_bytes=True, ready to write out).
+    """
+    rgb = np.asarray(rgb)
+    assert rgb.shape[-1:] == (3,), f"expected an (N,3) array of rgb, got {rgb.shape}"
+    if rgb.dtype != np.uint8:
+        ok = is_rgb_array(rgb)
+        assert ok.all(), "malformed rgb rows:" + str(bad_rows(ok))
+    # build the characters at the width of the output dtype, so the result is
+    # a view of the buffer rather than a conversion of it
+    pairs = (_PAIRS_S if as_bytes else _PAIRS_U)[rgb.astype(np.uint8)]
+    char = np.uint8 if as_bytes else np.uint32
+    out = np.empty(rgb.shape[:-1] + (7,), dtype=char)
+    out[..., 0] = ord("#")
+    out[..., 1:] = pairs.view(char)
+    return out.view("S7" if as_bytes else "U7")[..., 0]
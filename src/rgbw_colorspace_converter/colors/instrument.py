@@ -0,0 +1,181 @@
+"""
+Instrument
+
+Opt-in call counts and wall time for the converter functions and the Color
+properties, to see how many conversions a frame does and where its time
+goes.  Turn it on with the environment (read when converters is imported):
+
+    $ RGBW_CC_INSTRUMENT=1 python show.py
+
+or from code, then read it per frame:
+
+    >>> instrument.enable()
+    >>> render(frame)
+    >>> instrument.snapshot(reset=True)
+    {'hsv_to_rgbw': {'calls': 40000, 'seconds': 0.071}, 'Color.rgbw': {...}, ...}
+
+enable() swaps the functions in converters (and wherever the package imported
+them by name, ie: morph's HSV) and the Color properties for timed wrappers,
+disable() puts the originals back.  So when it's off nothing is wrapped and
+there is nothing to pay, not even a flag check.
+
+Times are inclusive: Color.rgbw counts the hsv_to_rgbw it calls as well.
+Counting isn't locked, totals from several threads at once can come up a
+little short.
+"""
+import functools
+import os
+import sys
+import time
+
+from rgbw_colorspace_converter.colors import converters
+
+__all__ = [
+    "ENV_VAR",
+    "FUNCTIONS",
+    "PROPERTIES",
+    "enable",
+    "disable",
+    "enabled",
+    "snapshot",
+    "reset",
+]
+
+ENV_VAR = "RGBW_CC_INSTRUMENT"
+
+FUNCTIONS = (
+    "rgb_to_hsv",
+    "hsv_to_rgb",
+    "hsi_to_rgb",
+    "hsi_to_rgb_2nd",
+    "hsi_to_rgbw",
+    "hsv_to_hsl",
+    "hsl_to_hsv",
+    "rgb_to_hsi",
+    "hsv_to_rgbw",
+    "rgbw_to_hsi",
+    "rgbw_to_rgb",
+    "rgb_to_int",
+    "int_to_rgb",
+    "rgbw_to_int",
+    "int_to_rgbw",
+    "hex_to_rgb",
+    "RGB",
+    "HSV",
+    "HSL",
+    "HSI",
+    "Hex",
+    "RGBW",
+)
+# getters are counted as Color.<name>, setters as Color.<name>=
+PROPERTIES = (
+    "rgb",
+    "rgbw",
+    "hsv",
+    "hsi",
+    "hsl",
+    "hex",
+    "hsv_h",
+    "hsv_s",
+    "hsv_v",
+    "rgb_r",
+    "rgb_g",
+    "rgb_b",
+)
+
+_PACKAGE = "rgbw_colorspace_converter"
+_counters = {}  # name: [calls, seconds]
+_originals = {}  # name: original function / property, while enabled
+
+
+def _timed(name, fn):
+    counter = _counters.setdefault(name, [0, 0.0])
+    clock = time.perf_counter
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        t0 = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            counter[0] += 1
+            counter[1] += clock() - t0
+
+    return wrapper
+
+
+def _timed_property(name, prop):
+    return property(
+        _timed(f"Color.{name}", prop.fget),
+        _timed(f"Color.{name}=", prop.fset) if prop.fset else None,
+        None,
+        prop.__doc__,
+    )
+
+
+def _rebind(old, new):
+    "point every package module's global that is `old` at `new`"
+    for modname, module in list(sys.modules.items()):
+        if module is None or not modname.startswith(_PACKAGE):
+            continue
+        names = [k for k, v in vars(module).items() if v is old]
+        for k in names:
+            setattr(module, k, new)
+
+
+def enabled():
+    return bool(_originals)
+
+
+def enable():
+    "start counting, a no-op if already on"
+    if _originals:
+        return
+    for name in FUNCTIONS:
+        fn = getattr(converters, name)
+        _originals[name] = fn
+        _rebind(fn, _timed(name, fn))
+    for name in PROPERTIES:
+        prop = converters.Color.__dict__[name]
+        _originals["Color." + name] = prop
+        setattr(converters.Color, name, _timed_property(name, prop))
+
+
+def disable():
+    "stop counting and restore the originals, counts are kept until reset()"
+    for name, original in _originals.items():
+        if name.startswith("Color."):
+            setattr(converters.Color, name[len("Color.") :], original)
+        else:
+            _rebind(getattr(converters, name), original)
+    _originals.clear()
+
+
+def snapshot(reset=False):
+    """
+    {name: {"calls": n, "seconds": s}} for everything called since the last
+    reset, reset=True starts the next count (ie: once per frame).
+    """
+    out = {
+        name: {"calls": c[0], "seconds": c[1]} for name, c in _counters.items() if c[0]
+    }
+    if reset:
+        _zero()
+    return out
+
+
+def _zero():
+    for c in _counters.values():
+        c[0] = 0
+        c[1] = 0.0
+
+
+def reset():
+    "zero every count"
+    _zero()
+
+
+def _from_environment():
+    "enable() if $RGBW_CC_INSTRUMENT is set to anything but 0 / false / no"
+    if os.environ.get(ENV_VAR, "").strip().lower() not in ("", "0", "false", "no"):
+        enable()
@@ -0,0 +1,197 @@
+"""
+LUT
+
+Every 8 bit RGB input has exactly one RGBW answer on the Color.rgbw path
+(rgb_to_hsi -> hsi_to_rgbw), so all 16,777,216 of them can be computed once
+and written to disk.  The table is 64MB (4 bytes per entry, indexed by the
+packed 0xRRGGBB value) behind a small header.
+
+Build it once (in parallel, one chunk of the table per worker):
+
+    $ build_rgbw_lut.py                     # or build_lut() from python
+
+and then memory map it read only at runtime.  Because the mapping is backed
+by the file, every process that loads the table shares the same pages, and a
+lookup is a single fancy-index:
+
+    >>> lut = load_lut()
+    >>> lut.lookup([[176, 205, 230], [69, 13, 152]])
+    array([[  0,  28,  54, 176],
+           [ 56,   0, 138,  12]], dtype=uint8)
+
+The header records LUT_VERSION and a fingerprint of the current algorithm's
+output on a fixed set of probe colors.  If either no longer matches when the
+table is loaded, the table is stale (the conversion math changed since it was
+built) and load_lut raises ValueError rather than hand out old answers.  A
+sha256 of the table body is stored too, checked with verify=True.
+"""
+import hashlib
+import os
+import struct
+import tempfile
+from multiprocessing import Pool
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors.batch import pack_rgb, rgb_to_rgbw, unpack_rgb
+
+__all__ = [
+    "LUT_VERSION",
+    "default_cache_dir",
+    "default_lut_path",
+    "build_lut",
+    "load_lut",
+    "RGBWLookupTable",
+]
+
+# Bump this whenever rgb_to_hsi or hsi_to_rgbw change in a way that moves output
+LUT_VERSION = 1
+
+ENTRIES = 1 << 24
+MAGIC = b"RGBWLUT\x00"
+# the table body starts on a page boundary so the mapping shares cleanly
+HEADER_SIZE = 4096
+# magic, lut version, entries, algorithm fingerprint, sha256 of the table body
+_HEADER = struct.Struct("<8sII32s32s")
+_CHUNK = 1 << 20
+
+_loaded = {}
+
+
+def default_cache_dir():
+    "where precomputed tables live, $RGBW_CC_CACHE overrides it"
+    return os.environ.get("RGBW_CC_CACHE") or os.path.join(
+        os.path.expanduser("~"), ".cache", "rgbw_colorspace_converter"
+    )
+
+
+def default_lut_path():
+    "where the table lives unless told otherwise"
+    return os.path.join(default_cache_dir(), f"rgb_to_rgbw.v{LUT_VERSION}.lut")
+
+
+def _probe_indices():
+    "a fixed spread of colors: a coarse cube through every hue sector plus noise"
+    levels = np.array(sorted(set(range(0, 256, 15)) | {1, 127, 128, 254, 255}))
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    cube = (r << 16 | g << 8 | b).ravel().astype(np.uint32)
+    noise = np.random.default_rng(20210617).integers(0, ENTRIES, 4096, np.uint32)
+    return np.concatenate((cube, noise))
+
+
+def algorithm_fingerprint():
+    "sha256 of LUT_VERSION and the current rgb->rgbw output for the probe colors"
+    idx = _probe_indices()
+    h = hashlib.sha256(struct.pack("<I", LUT_VERSION))
+    h.update(idx.tobytes())
+    h.update(rgb_to_rgbw(unpack_rgb(idx)).tobytes())
+    return h.digest()
+
+
+def _table_digest(table):
+    h = hashlib.sha256()
+    for start in range(0, ENTRIES, _CHUNK):
+        h.update(np.ascontiguousarray(table[start : start + _CHUNK]).data)
+    return h.digest()
+
+
+def _open_table(path, mode):
+    return np.memmap(
+        path, dtype=np.uint8, mode=mode, offset=HEADER_SIZE, shape=(ENTRIES, 4)
+    )
+
+
+def _fill_rows(job):
+    "worker: compute one slice of the table straight into the mapped file"
+    path, start, stop = job
+    table = _open_table(path, "r+")
+    idx = np.arange(start, stop, dtype=np.uint32)
+    table[start:stop] = rgb_to_rgbw(unpack_rgb(idx))
+    table.flush()
+    del table
+
+
+def build_lut(path=None, workers=None):
+    """
+    Compute the full rgb->rgbw table and write it to `path` (default_lut_path()
+    if None).  `workers` processes each fill a chunk of the file in place, None
+    uses every cpu, 1 builds in this process.  The table is written next to
+    `path` and renamed over it when complete, so readers never see half a table.
+    """
+    path = path or default_lut_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.truncate(HEADER_SIZE + ENTRIES * 4)
+
+        jobs = [(tmp, s, min(s + _CHUNK, ENTRIES)) for s in range(0, ENTRIES, _CHUNK)]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for job in jobs:
+                _fill_rows(job)
+        else:
+            with Pool(workers) as pool:
+                pool.map(_fill_rows, jobs)
+
+        table = _open_table(tmp, "r")
+        digest = _table_digest(table)
+        del table
+        with open(tmp, "r+b") as fh:
+            fh.write(
+                _HEADER.pack(
+                    MAGIC, LUT_VERSION, ENTRIES, algorithm_fingerprint(), digest
+                )
+            )
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+class RGBWLookupTable:
+    """
+    A read only memory mapped view of a table written by build_lut().
+    Raises ValueError if the file is not a table, or was built by a different
+    version of the conversion math.  verify=True also re-hashes the body.
+    """
+
+    def __init__(self, path=None, verify=False):
+        self.path = path or default_lut_path()
+        with open(self.path, "rb") as fh:
+            header = fh.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f"{self.path} is not an rgbw lookup table")
+        magic, version, entries, fingerprint, digest = _HEADER.unpack(header)
+        if magic != MAGIC or entries != ENTRIES:
+            raise ValueError(f"{self.path} is not an rgbw lookup table")
+        if version != LUT_VERSION or fingerprint != algorithm_fingerprint():
+            raise ValueError(
+                f"{self.path} is stale (built by lut version {version}, this is "
+                f"{LUT_VERSION}, or the conversion math changed), rebuild it "
+                "with build_rgbw_lut.py"
+            )
+
+        self.table = _open_table(self.path, "r")
+        self.digest = digest
+        if verify and _table_digest(self.table) != digest:
+            raise ValueError(f"{self.path} is corrupt, rebuild it")
+
+    def lookup(self, rgb):
+        "rgbw uint8 rows for rgb[0-255] rows"
+        return self.table[pack_rgb(rgb)]
+
+    __call__ = lookup
+
+    def lookup_packed(self, packed):
+        "rgbw uint8 rows for 0xRRGGBB packed values"
+        return self.table[np.asarray(packed, dtype=np.uint32) & 0xFFFFFF]
+
+
+def load_lut(path=None, verify=False):
+    "load (once per process) and return the table at `path`"
+    path = os.path.abspath(path or default_lut_path())
+    if path not in _loaded or verify:
+        _loaded[path] = RGBWLookupTable(path, verify=verify)
+    return _loaded[path]
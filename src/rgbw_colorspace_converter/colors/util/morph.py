@@ -22,18 +22,43 @@ Takes a list of Color points and returns a sequence that
 transitions between all points.
 Can optionally generate a sequence that cycles, returning an
 infinite list of colors useful for indefinite length
-animations
+animations (see PeriodicTransition, which also allows jumping
+straight to any step)
+
+For playback there is also a batch version of the first:
+
+- color_ramp(start_color, end_color, steps=20, space="rgbw")
+
+Returns the whole transition as one array, (steps + 1, 4) rgbw or
+(steps + 1, 3) hsv, computed once per (start, end, steps, space) and
+kept in an LRU cache, so replaying the same cue costs a dict lookup.
+ramp_cache_info() reports the cache's hits and misses.
 """
 
 
+import bisect
+import functools
 import itertools
 
 from math import ceil
 
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
 from rgbw_colorspace_converter.colors.converters import HSV
 from rgbw_colorspace_converter.colors.converters import Color
 
-__all__ = ["color_transition", "multistep_color_transition"]
+__all__ = [
+    "color_transition",
+    "multistep_color_transition",
+    "color_ramp",
+    "ramp_cache_info",
+    "ramp_cache_clear",
+    "PeriodicTransition",
+]
+
+# how many distinct ramps color_ramp keeps
+RAMP_CACHE_SIZE = 256
 
 # http://stackoverflow.com/questions/477486/python-decimal-range-step-value
 def frange(start, stop=None, step=1):
@@ -59,6 +84,24 @@ def should_wrap(p1, p2):
     return abs(p2 - p1) > abs((p1 + 1) - p2)
 
 
+def _transition_steps(h1, h2, steps=20, wrap=False):
+    "(first value, step size, number of values) of hsv_transition(h1, h2, ...)"
+    if h1 == h2:
+        return h1, 0.0, steps + 1  # XXX check number of steps!
+    if wrap and should_wrap(h1, h2):
+        if h1 < h2:
+            h1 += 1.0
+        else:
+            h2 += 1.0
+
+    dh = abs(h1 - h2)
+    step_size = dh / steps
+    if h1 > h2:
+        step_size *= -1
+    # as many as frange(h1, h2, step_size) gives
+    return h1, step_size, int((h2 - h1) / step_size)
+
+
 def hsv_transition(h1, h2, steps=20, wrap=False):
     """
     Transition between two values in even increments
@@ -67,21 +110,10 @@ def hsv_transition(h1, h2, steps=20, wrap=False):
     (only for hue in HSV, I don't think anything else
     needs to wrap.
     """
-    # print "transition:", h1, h2, steps
-    if h1 == h2:
-        return itertools.repeat(h1, steps + 1)  # XXX check number of steps!
-    else:
-        if wrap and should_wrap(h1, h2):
-            if h1 < h2:
-                h1 += 1.0
-            else:
-                h2 += 1.0
-
-        dh = abs(h1 - h2)
-        step_size = dh / steps
-        if h1 > h2:
-            step_size *= -1
-        return frange(h1, h2, step_size)
+    start, step_size, count = _transition_steps(h1, h2, steps, wrap)
+    if not step_size:
+        return itertools.repeat(start, count)
+    return (start + step_size * i for i in range(count))
 
 
 def pairwise(iterable):  # from the itertools documentation
@@ -111,19 +143,123 @@ def color_transition(start_color, end_color, steps=20):
         yield HSV(h % 1, s, v)
 
 
+def _hsv_ramp(h1, h2, steps, wrap=False):
+    "hsv_transition as an array of exactly steps + 1 values, ending on h2"
+    if wrap and should_wrap(h1, h2):
+        if h1 < h2:
+            h1 += 1.0
+        else:
+            h2 += 1.0
+    return np.linspace(h1, h2, steps + 1)
+
+
+@functools.lru_cache(maxsize=RAMP_CACHE_SIZE)
+def _ramp(hsv1, hsv2, steps, space):
+    hsv = np.empty((steps + 1, 3))
+    hsv[:, 0] = _hsv_ramp(hsv1[0], hsv2[0], steps, wrap=True) % 1
+    hsv[:, 1] = _hsv_ramp(hsv1[1], hsv2[1], steps)
+    hsv[:, 2] = _hsv_ramp(hsv1[2], hsv2[2], steps)
+    ramp = batch.hsv_to_rgbw(hsv) if space == "rgbw" else hsv
+    # shared by every caller that asks for this ramp
+    ramp.flags.writeable = False
+    return ramp
+
+
+def color_ramp(start_color, end_color, steps=20, space="rgbw"):
+    """
+    color_transition(start_color, end_color, steps) as one read only array:
+    row i is the transition's i-th color, and the last row (steps) is
+    end_color itself.  `space` is "rgbw" for (steps + 1, 4) uint8 rows or
+    "hsv" for (steps + 1, 3) floats.  Ramps are cached on their endpoints'
+    hsv, steps and space.
+    """
+    assert isinstance(start_color, Color), "start_color must be a Color instance"
+    assert isinstance(end_color, Color), "end_color must be a Color instance"
+    assert space in ("rgbw", "hsv"), "space must be 'rgbw' or 'hsv'"
+    assert steps >= 1, "steps must be at least 1"
+    return _ramp(tuple(start_color.hsv), tuple(end_color.hsv), int(steps), space)
+
+
+def ramp_cache_info():
+    "hits, misses, maxsize and currsize of color_ramp's cache"
+    return _ramp.cache_info()
+
+
+def ramp_cache_clear():
+    "empty color_ramp's cache"
+    _ramp.cache_clear()
+
+
 def multistep_color_transition(color_list, steps=20, continuous=False):
     """
     Takes a list of Colors and returns a sequence of Colors that
     transitions between them.
     `steps` indicates the number of intermediate steps between each
     color in the list.
-    `continuous` will create an infinite sequence
+    `continuous` will create an infinite sequence (a PeriodicTransition's,
+    which keeps none of the colors it has produced)
     """
-    if continuous and color_list[0] != color_list[-1]:
-        # smooth things out with a transition back to the first color
-        color_list.append(color_list[0])
-    transitions = [color_transition(a, b, steps) for (a, b) in pairwise(color_list)]
-    chain = itertools.chain.from_iterable(transitions)
     if continuous:
-        chain = itertools.cycle(chain)
-    return chain
+        return iter(PeriodicTransition(color_list, steps))
+    transitions = [color_transition(a, b, steps) for (a, b) in pairwise(color_list)]
+    return itertools.chain.from_iterable(transitions)
+
+
+class PeriodicTransition:
+    """
+    The endless sequence multistep_color_transition(color_list, steps,
+    continuous=True) gives, computed from the step number rather than
+    replayed from a stored cycle: memory stays flat however long it runs,
+    and any step can be had directly (transition[k], k taken modulo the
+    period).  color_list isn't modified; a transition back to the first
+    color is added here unless the list already ends on it.
+    """
+
+    def __init__(self, color_list, steps=20):
+        colors = list(color_list)
+        assert len(colors) >= 1, "color_list must not be empty"
+        assert all(isinstance(c, Color) for c in colors), "expected Colors"
+        if colors[0] != colors[-1]:
+            # smooth things out with a transition back to the first color
+            colors.append(colors[0])
+        self.colors = tuple(colors)
+        self.steps = steps
+        # per leg: (first, step) for each of h, s and v, and how many steps
+        # the leg's color_transition gives
+        self._legs = []
+        self._starts = []
+        period = 0
+        for a, b in pairwise(colors):
+            (h1, s1, v1), (h2, s2, v2) = a.hsv, b.hsv
+            h = _transition_steps(h1, h2, steps, wrap=True)
+            s = _transition_steps(s1, s2, steps)
+            v = _transition_steps(v1, v2, steps)
+            count = min(h[2], s[2], v[2])
+            self._legs.append((h[0], h[1], s[0], s[1], v[0], v[1], count))
+            self._starts.append(period)
+            period += count
+        self.period = period
+
+    def __len__(self):
+        "the number of colors before the sequence repeats"
+        return self.period
+
+    def __repr__(self):
+        return f"PeriodicTransition({len(self.colors)} colors, period {self.period})"
+
+    def __getitem__(self, k):
+        "the color at step k of the endless sequence"
+        assert self.period, "the transition has no steps"
+        k %= self.period
+        leg = bisect.bisect_right(self._starts, k) - 1
+        h, dh, s, ds, v, dv, _ = self._legs[leg]
+        i = k - self._starts[leg]
+        return HSV((h + dh * i) % 1, s + ds * i, v + dv * i)
+
+    def __iter__(self):
+        # a single color has nothing to transition through, like cycling
+        # an empty chain
+        while self.period:
+            for h, dh, s, ds, v, dv, count in self._legs:
+                for i in range(count):
+                    yield HSV((h + dh * i) % 1, s + ds * i, v + dv * i)
@@ -0,0 +1,200 @@
+"""
+Keyframe timelines
+
+A Timeline is a list of Color keyframes, how long each transition between
+them takes and how it eases, which can be sampled at any time rather than
+played through in order:
+
+    >>> tl = Timeline([RGB(255, 0, 0), RGB(0, 0, 255), RGB(255, 255, 255)],
+    ...               durations=[2.0, 0.5], easing=["linear", "ease_in_out"])
+    >>> tl.sample(1.25)                                  # a Color
+    >>> tl.sample_rgbw(np.arange(0, 2.5, 1 / 40))        # every frame at 40fps
+    >>> tl.pixels(t, offsets=np.linspace(0, 1, 300))     # a chase down 300 LEDs
+
+Colors move linearly through HSV, hue taking the shortest way round, like
+morph.color_transition, with the easing applied to the position within
+each segment.  Finding the segment for a time is a bisect over the
+segments' start times, so seeking anywhere in a long show is O(log n)
+and a time vector is sampled with one searchsorted.
+
+Times before the start hold the first color and after the end hold the
+last, unless the timeline is continuous: then it returns to its first
+keyframe and times wrap around.
+"""
+import bisect
+import math
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors.converters import HSV, Color
+from rgbw_colorspace_converter.colors.util.morph import should_wrap
+
+__all__ = ["EASINGS", "Timeline"]
+
+
+def linear(u):
+    return u
+
+
+def ease_in(u):
+    return u * u
+
+
+def ease_out(u):
+    return u * (2.0 - u)
+
+
+def ease_in_out(u):
+    "smoothstep"
+    return u * u * (3.0 - 2.0 * u)
+
+
+def sine(u):
+    return 0.5 - 0.5 * np.cos(math.pi * u)
+
+
+def step(u):
+    "hold the segment's first color, then cut"
+    return np.where(u < 1.0, 0.0, 1.0)
+
+
+# easings by name: position in the segment [0, 1] -> fraction of the way
+# [0, 1], written to work on floats and on arrays
+EASINGS = {
+    "linear": linear,
+    "ease_in": ease_in,
+    "ease_out": ease_out,
+    "ease_in_out": ease_in_out,
+    "sine": sine,
+    "step": step,
+}
+
+
+def _per_segment(value, n, what):
+    if isinstance(value, (list, tuple)):
+        assert (
+            len(value) == n
+        ), f"expected {n} {what}, one per segment, got {len(value)}"
+        return list(value)
+    return [value] * n
+
+
+class Timeline:
+    """
+    keyframes: a list of at least two Colors
+    durations: seconds per segment, one number for all or one per segment
+    easing: an EASINGS name or a function of u in [0, 1], or one per segment
+    continuous: add a segment back to the first keyframe (unless the last
+    one already is) and wrap time around, for shows that loop
+    """
+
+    def __init__(self, keyframes, durations=1.0, easing="linear", continuous=False):
+        keyframes = list(keyframes)
+        assert len(keyframes) >= 2, "a timeline needs at least two keyframes"
+        assert all(
+            isinstance(c, Color) for c in keyframes
+        ), "keyframes must be Color instances"
+        if continuous and keyframes[0] != keyframes[-1]:
+            keyframes.append(keyframes[0])
+        n = len(keyframes) - 1
+        durations = [float(d) for d in _per_segment(durations, n, "durations")]
+        assert all(d > 0 for d in durations), "durations must be positive"
+        easings = [
+            EASINGS[e] if isinstance(e, str) else e
+            for e in _per_segment(easing, n, "easings")
+        ]
+        assert all(callable(e) for e in easings), "unknown easing"
+
+        self.keyframes = keyframes
+        self.continuous = continuous
+        self._durations = np.array(durations)
+        starts = np.concatenate([[0.0], np.cumsum(self._durations)])
+        self.duration = float(starts[-1])
+        self._starts = starts[:-1]
+        self._starts_list = self._starts.tolist()
+        self._easings = easings
+        # each segment as a start hsv and the change across it, hue unwrapped
+        # to go the short way
+        hsv = np.array([c.hsv for c in keyframes], dtype=np.float64)
+        begin, end = hsv[:-1].copy(), hsv[1:].copy()
+        for i in range(n):
+            h1, h2 = begin[i, 0], end[i, 0]
+            if should_wrap(h1, h2):
+                if h1 < h2:
+                    begin[i, 0] += 1.0
+                else:
+                    end[i, 0] += 1.0
+        self._begin = begin
+        self._delta = end - begin
+        self._begin_list = begin.tolist()
+        self._delta_list = self._delta.tolist()
+
+    def __len__(self):
+        "the number of segments"
+        return len(self._easings)
+
+    def __repr__(self):
+        return f"Timeline({len(self.keyframes)} keyframes, {self.duration:g}s" + (
+            ", continuous)" if self.continuous else ")"
+        )
+
+    def _time(self, t):
+        if self.continuous:
+            return t % self.duration
+        return min(max(t, 0.0), self.duration)
+
+    def _sample(self, t):
+        t = self._time(float(t))
+        i = max(0, min(len(self) - 1, bisect.bisect_right(self._starts_list, t) - 1))
+        u = (t - self._starts_list[i]) / self._durations[i]
+        f = float(self._easings[i](min(max(u, 0.0), 1.0)))
+        (h, s, v), (dh, ds, dv) = self._begin_list[i], self._delta_list[i]
+        return (
+            (h + dh * f) % 1.0,
+            min(max(s + ds * f, 0.0), 1.0),
+            min(max(v + dv * f, 0.0), 1.0),
+        )
+
+    def sample(self, t):
+        "the Color at time t, seconds from the start"
+        return HSV(*self._sample(t))
+
+    def sample_hsv(self, t):
+        "hsv at every time in t (any shape), as (*t.shape, 3) floats"
+        t = np.asarray(t, dtype=np.float64)
+        if self.continuous:
+            t = np.mod(t, self.duration)
+        else:
+            t = np.clip(t, 0.0, self.duration)
+        i = np.searchsorted(self._starts, t, side="right") - 1
+        i = np.clip(i, 0, len(self) - 1)
+        u = np.clip((t - self._starts[i]) / self._durations[i], 0.0, 1.0)
+        f = np.empty_like(u)
+        easings = self._easings
+        if all(e is easings[0] for e in easings):
+            f[...] = easings[0](u)
+        else:
+            for e in set(easings):
+                segs = [k for k, x in enumerate(easings) if x is e]
+                mask = np.isin(i, segs)
+                f[mask] = e(u[mask])
+        hsv = self._begin[i] + self._delta[i] * f[..., None]
+        np.mod(hsv[..., 0], 1.0, out=hsv[..., 0])
+        # easings that overshoot could leave s or v a hair outside [0, 1]
+        np.clip(hsv[..., 1:], 0.0, 1.0, out=hsv[..., 1:])
+        return hsv
+
+    def sample_rgbw(self, t):
+        "rgbw at every time in t (any shape), as (*t.shape, 4) uint8"
+        return batch.hsv_to_rgbw(self.sample_hsv(t))
+
+    def pixels(self, t, offsets, space="rgbw"):
+        """
+        Many pixels each running the timeline `offsets` seconds ahead (a
+        phase per pixel).  A scalar t gives (len(offsets), 4) rgbw, a vector
+        of times (len(t), len(offsets), 4).  space="hsv" for hsv instead.
+        """
+        assert space in ("rgbw", "hsv"), "space must be 'rgbw' or 'hsv'"
+        times = np.add.outer(t, np.asarray(offsets, dtype=np.float64))
+        return self.sample_rgbw(times) if space == "rgbw" else self.sample_hsv(times)
@@ -0,0 +1,277 @@
+"""
+DMX
+
+Packetize RGBW frames into DMX universes for sACN (E1.31) and Art-Net.
+
+A PatchMap says where every channel of every pixel goes (universe and slot).
+It is built once, then a packetizer lays out one reusable buffer holding a
+packet per universe, headers filled in, and each frame only writes the
+payload bytes and sequence numbers:
+
+    >>> patch = PatchMap.linear(40000)                  # 128 RGBW pixels a universe
+    >>> sacn = SACNPacketizer(patch, source_name="pyramid")
+    >>> for universe, packet in sacn.fill(frame.rgbw):
+    ...     sock.sendto(packet, ("239.255.%d.%d" % (universe >> 8, universe & 0xFF), 5568))
+
+fill() is one gather from the frame and one scatter into the packet buffer,
+whatever the number of universes.  The packets it returns are memoryviews
+into that buffer, so they are only good until the next fill().
+
+Universe boundaries: PatchMap.linear never splits a pixel across two
+universes, a pixel that doesn't fit in what's left of a universe starts the
+next one at slot 0.  PatchMap.from_runs takes explicit runs of pixels and
+refuses any run that would spill over the end of its universe.
+"""
+import uuid
+
+import numpy as np
+
+__all__ = [
+    "DMX_SLOTS",
+    "PatchMap",
+    "SACNPacketizer",
+    "ArtNetPacketizer",
+]
+
+DMX_SLOTS = 512
+_CHANNEL = {"R": 0, "G": 1, "B": 2, "W": 3}
+
+
+class PatchMap:
+    """
+    One entry per patched DMX slot: `pixel` index into the frame, `channel`
+    (0-3 for r, g, b, w), and the `universe` and 0 based `slot` it goes to.
+    """
+
+    def __init__(self, pixel, channel, universe, slot):
+        self.pixel = np.asarray(pixel, dtype=np.intp)
+        self.channel = np.asarray(channel, dtype=np.intp)
+        self.universe = np.asarray(universe, dtype=np.intp)
+        self.slot = np.asarray(slot, dtype=np.intp)
+        n = len(self.pixel)
+        assert len(self.channel) == len(self.universe) == len(self.slot) == n
+        assert ((0 <= self.slot) & (self.slot < DMX_SLOTS)).all(), "slot out of range"
+        assert ((0 <= self.channel) & (self.channel < 4)).all(), "channel out of range"
+        where = self.universe * DMX_SLOTS + self.slot
+        assert len(np.unique(where)) == n, "two channels patched to the same slot"
+
+    def __repr__(self):
+        return f"PatchMap({self.pixels} pixels, {len(self.universes)} universes)"
+
+    @property
+    def pixels(self):
+        "number of pixels a frame needs, the highest patched pixel + 1"
+        return int(self.pixel.max()) + 1 if len(self.pixel) else 0
+
+    @property
+    def universes(self):
+        "the patched universes, sorted"
+        return np.unique(self.universe)
+
+    @classmethod
+    def from_runs(cls, runs, order="RGBW"):
+        """
+        Patch runs of (first_pixel, count, universe, start_slot), each pixel
+        taking len(order) consecutive slots in `order`.
+        """
+        width, channels = _order(order)
+        parts = []
+        for first_pixel, count, universe, start_slot in runs:
+            assert (
+                start_slot + count * width <= DMX_SLOTS
+            ), f"run of {count} pixels at universe {universe} slot {start_slot} spills out of the universe"
+            k = np.arange(count * width)
+            parts.append(
+                (
+                    first_pixel + k // width,
+                    channels[k % width],
+                    np.full(len(k), universe),
+                    start_slot + k,
+                )
+            )
+        if not parts:
+            return cls([], [], [], [])
+        return cls(*(np.concatenate(p) for p in zip(*parts)))
+
+    @classmethod
+    def linear(
+        cls,
+        pixels,
+        start_universe=1,
+        start_slot=0,
+        order="RGBW",
+        pixels_per_universe=None,
+    ):
+        """
+        Patch pixels 0..pixels-1 in order, from start_universe / start_slot
+        on.  Each universe takes as many whole pixels as fit (or at most
+        pixels_per_universe), the next pixel starts the next universe.
+        """
+        width, _ = _order(order)
+        per_universe = DMX_SLOTS // width
+        if pixels_per_universe is not None:
+            assert 0 < pixels_per_universe <= per_universe
+            per_universe = pixels_per_universe
+        runs = []
+        pixel, universe, slot = 0, start_universe, start_slot
+        while pixel < pixels:
+            fit = min(per_universe, (DMX_SLOTS - slot) // width, pixels - pixel)
+            if fit > 0:
+                runs.append((pixel, fit, universe, slot))
+            pixel += fit
+            universe, slot = universe + 1, 0
+        return cls.from_runs(runs, order)
+
+
+def _order(order):
+    order = order.upper()
+    assert order and all(c in _CHANNEL for c in order), "order must be R/G/B/W"
+    assert len(set(order)) == len(order), "order repeats a channel"
+    return len(order), np.array([_CHANNEL[c] for c in order])
+
+
+class _Packetizer:
+    """
+    A buffer holding one packet per patched universe back to back, plus the
+    index arrays that move a frame's bytes into their payloads.  Subclasses
+    provide the header layout.
+    """
+
+    HEADER = 0
+    SEQUENCE_AT = 0
+
+    def __init__(self, patch):
+        self.patch = patch
+        self.universes = [int(u) for u in patch.universes]
+        # each universe's packet carries slots up to its highest patched one
+        slots = np.zeros(len(self.universes), dtype=np.intp)
+        index = np.searchsorted(self.universes, patch.universe)
+        np.maximum.at(slots, index, patch.slot + 1)
+        slots = [self._payload_size(int(n)) for n in slots]
+
+        sizes = [self.HEADER + n for n in slots]
+        self.offsets = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.intp)
+        self.buffer = bytearray(int(sum(sizes)))
+        self._bytes = np.frombuffer(self.buffer, dtype=np.uint8)
+
+        for i, (universe, n) in enumerate(zip(self.universes, slots)):
+            start = int(self.offsets[i])
+            self.buffer[start : start + self.HEADER] = self._header(universe, n)
+        self.packets = [
+            (u, memoryview(self.buffer)[int(o) : int(o) + s])
+            for u, o, s in zip(self.universes, self.offsets, sizes)
+        ]
+
+        self._src = patch.pixel * 4 + patch.channel
+        self._dst = self.offsets[index] + self.HEADER + patch.slot
+        self._sequence_at = self.offsets + self.SEQUENCE_AT
+        self.sequence = 0
+
+    def _payload_size(self, slots):
+        return slots
+
+    def _header(self, universe, slots):
+        raise NotImplementedError
+
+    def _next_sequence(self):
+        self.sequence = (self.sequence + 1) & 0xFF
+        return self.sequence
+
+    def fill(self, rgbw):
+        """
+        Write a frame of (N,4) rgbw uint8 rows (N >= patch.pixels) into the
+        packets, bump the sequence number, and return [(universe, packet)].
+        """
+        rgbw = np.asarray(rgbw)
+        assert rgbw.dtype == np.uint8, "expected uint8 rgbw rows"
+        assert rgbw.shape[-1:] == (4,), f"expected (N,4) rgbw, got {rgbw.shape}"
+        assert len(rgbw) >= self.patch.pixels, "frame is smaller than the patch"
+        self._bytes[self._dst] = rgbw.reshape(-1)[self._src]
+        self._bytes[self._sequence_at] = self._next_sequence()
+        return self.packets
+
+
+class SACNPacketizer(_Packetizer):
+    """
+    E1.31 data packets: root layer, framing layer, DMP layer, then the start
+    code and slots.  `cid` is this source's 16 byte component id (random if
+    None, keep it stable across runs if receivers track sources).
+    """
+
+    HEADER = 126
+    SEQUENCE_AT = 111
+    ACN_ID = b"ASC-E1.17\x00\x00\x00"
+
+    def __init__(
+        self, patch, source_name="rgbw_colorspace_converter", cid=None, priority=100
+    ):
+        self.source_name = source_name.encode("utf-8")[:63]
+        self.cid = bytes(cid) if cid is not None else uuid.uuid4().bytes
+        assert len(self.cid) == 16, "cid is 16 bytes"
+        assert 0 <= priority <= 200, "priority is 0-200"
+        self.priority = priority
+        super().__init__(patch)
+        assert all(
+            1 <= u <= 63999 for u in self.universes
+        ), "sACN universes are 1-63999"
+
+    def _header(self, universe, slots):
+        length = self.HEADER + slots
+        h = bytearray(self.HEADER)
+        h[0:2] = (0x0010).to_bytes(2, "big")  # preamble size
+        h[4:16] = self.ACN_ID
+        h[16:18] = (0x7000 | (length - 16)).to_bytes(2, "big")
+        h[18:22] = (0x00000004).to_bytes(4, "big")  # VECTOR_ROOT_E131_DATA
+        h[22:38] = self.cid
+        h[38:40] = (0x7000 | (length - 38)).to_bytes(2, "big")
+        h[40:44] = (0x00000002).to_bytes(4, "big")  # VECTOR_E131_DATA_PACKET
+        h[44 : 44 + len(self.source_name)] = self.source_name
+        h[108] = self.priority
+        # 109-110 sync address, 111 sequence, 112 options, all 0
+        h[113:115] = universe.to_bytes(2, "big")
+        h[115:117] = (0x7000 | (length - 115)).to_bytes(2, "big")
+        h[117] = 0x02  # VECTOR_DMP_SET_PROPERTY
+        h[118] = 0xA1  # address & data type
+        # 119-120 first property address 0
+        h[121:123] = (0x0001).to_bytes(2, "big")  # address increment
+        h[123:125] = (slots + 1).to_bytes(2, "big")  # property values, with start code
+        # 125 DMX start code 0
+        return h
+
+
+class ArtNetPacketizer(_Packetizer):
+    """
+    ArtDmx packets.  Universes are 15 bit port addresses (net, sub-net and
+    universe), the payload is padded to an even length as the spec asks.
+    Sequence numbers run 1-255, 0 would tell receivers not to reorder.
+    """
+
+    HEADER = 18
+    SEQUENCE_AT = 12
+    ID = b"Art-Net\x00"
+
+    def __init__(self, patch, physical=0):
+        self.physical = physical
+        super().__init__(patch)
+        assert all(
+            0 <= u <= 0x7FFF for u in self.universes
+        ), "Art-Net universes are 0-32767"
+
+    def _payload_size(self, slots):
+        return max(2, slots + (slots & 1))
+
+    def _header(self, universe, slots):
+        h = bytearray(self.HEADER)
+        h[0:8] = self.ID
+        h[8:10] = (0x5000).to_bytes(2, "little")  # OpDmx
+        h[10:12] = (14).to_bytes(2, "big")  # protocol version
+        # 12 sequence
+        h[13] = self.physical
+        h[14] = universe & 0xFF  # SubUni
+        h[15] = universe >> 8  # Net
+        h[16:18] = slots.to_bytes(2, "big")
+        return h
+
+    def _next_sequence(self):
+        self.sequence = self.sequence % 255 + 1
+        return self.sequence
@@ -0,0 +1,231 @@
+"""
+Sharded
+
+Render frames too big for one process: the pixel range is split into one
+shard per worker process, every worker runs the effect for its shard and
+converts it to rgbw straight into a shared memory frame buffer.
+
+    >>> def rainbow(index, t):                          # hsv rows for `index`
+    ...     hsv = np.empty((len(index), 3))
+    ...     hsv[:, 0] = (index / 1000.0 + t) % 1.0
+    ...     hsv[:, 1:] = 1.0
+    ...     return hsv
+    >>> with ShardedRenderer(rainbow, pixels=200000, workers=4) as renderer:
+    ...     frame = renderer.render(t=0.5)               # (200000, 4) uint8
+
+Workers are started once and live as long as the renderer.  Per frame the
+parent publishes `t` and passes a start barrier, the workers render and meet
+it again at a done barrier, so render() returns only when the whole frame is
+written.  No pixel data is pickled either way: the workers see the frame
+buffer through multiprocessing.shared_memory, and `t` goes through a shared
+double.
+
+`effect(index, t)` gets the shard's pixel indices (an intp array) and the
+frame time, and returns (len(index), 3) hsv rows, converted with
+batch.hsv_to_rgbw.  With space="rgbw" it returns (len(index), 4) rgbw rows
+that are copied in as they are.  It has to be a module level function, so
+it can be sent to workers started with "spawn".
+
+Shard boundaries are rounded to SHARD_ALIGN pixels so no two workers write
+to the same cache line.  If an effect raises in a worker, render() raises
+RuntimeError with the worker's traceback and the renderer is closed.  A
+worker that dies without raising (killed, a crash in native code) is
+noticed by a watchdog thread, which breaks the barriers so render() raises
+RuntimeError with its exit code rather than waiting forever.
+"""
+import multiprocessing
+import multiprocessing.connection
+import queue
+import threading
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors.batch import hsv_to_rgbw
+
+__all__ = ["SHARD_ALIGN", "ShardedRenderer", "shard_bounds"]
+
+# 16 rgbw pixels == one 64 byte cache line
+SHARD_ALIGN = 16
+
+
+def shard_bounds(pixels, shards, align=SHARD_ALIGN):
+    "[(start, stop)] splitting range(pixels) into `shards` aligned runs"
+    assert shards > 0, "need at least one shard"
+    edges = [
+        min(pixels, (pixels * i // shards + align - 1) // align * align)
+        for i in range(shards)
+    ]
+    edges.append(pixels)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _render_shard(effect, space, frame, start, stop, t):
+    if start == stop:
+        return
+    index = np.arange(start, stop, dtype=np.intp)
+    rows = effect(index, t)
+    if space == "hsv":
+        hsv_to_rgbw(rows, out=frame[start:stop])
+    else:
+        frame[start:stop] = rows
+
+
+def _worker(effect, space, name, pixels, start, stop, t, running, go, done, errors):
+    shm = shared_memory.SharedMemory(name=name)
+    frame = np.ndarray((pixels, 4), dtype=np.uint8, buffer=shm.buf)
+    try:
+        while True:
+            go.wait()
+            if not running.value:
+                break
+            try:
+                _render_shard(effect, space, frame, start, stop, t.value)
+            except Exception:
+                errors.put(f"shard {start}:{stop}\n" + traceback.format_exc())
+                done.abort()
+                break
+            done.wait()
+    except threading.BrokenBarrierError:
+        pass
+    finally:
+        del frame
+        shm.close()
+
+
+class ShardedRenderer:
+    """
+    Renders `pixels` pixels with `workers` processes (None for one per cpu).
+    workers=0 renders in this process, for comparison.  `context` is a
+    multiprocessing start method name, or None for the platform default.
+    """
+
+    def __init__(self, effect, pixels, workers=None, space="hsv", context=None):
+        assert space in ("hsv", "rgbw"), "space is 'hsv' or 'rgbw'"
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        self.effect = effect
+        self.pixels = pixels
+        self.space = space
+        self.workers = workers
+        self.shards = shard_bounds(pixels, max(workers, 1))
+        self._shm = shared_memory.SharedMemory(create=True, size=max(pixels * 4, 1))
+        self.frame = np.ndarray((pixels, 4), dtype=np.uint8, buffer=self._shm.buf)
+        self.frame[...] = 0
+        self._procs = []
+        if workers == 0:
+            return
+
+        ctx = multiprocessing.get_context(context)
+        self._t = ctx.Value("d", 0.0, lock=False)
+        self._running = ctx.Value("b", 1, lock=False)
+        self._go = ctx.Barrier(workers + 1)
+        self._done = ctx.Barrier(workers + 1)
+        self._errors = ctx.Queue()
+        for start, stop in self.shards:
+            p = ctx.Process(
+                target=_worker,
+                args=(
+                    effect,
+                    space,
+                    self._shm.name,
+                    pixels,
+                    start,
+                    stop,
+                    self._t,
+                    self._running,
+                    self._go,
+                    self._done,
+                    self._errors,
+                ),
+                daemon=True,
+            )
+            p.start()
+            self._procs.append(p)
+        self._watchdog = threading.Thread(target=self._watch, daemon=True)
+        self._watchdog.start()
+
+    def _watch(self):
+        "break the barriers as soon as any worker exits, so nothing waits on it"
+        multiprocessing.connection.wait([p.sentinel for p in self._procs])
+        self._go.abort()
+        self._done.abort()
+
+    def __repr__(self):
+        return f"ShardedRenderer({self.pixels} pixels, workers={self.workers})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def render(self, t=0.0):
+        """
+        Render the frame at time `t` and return it, a (pixels, 4) uint8 view
+        of the shared buffer (overwritten by the next render, copy it to keep
+        it).
+        """
+        assert self._shm is not None, "renderer is closed"
+        if not self._procs:
+            _render_shard(self.effect, self.space, self.frame, 0, self.pixels, t)
+            return self.frame
+        self._t.value = t
+        try:
+            self._go.wait()
+            self._done.wait()
+        except threading.BrokenBarrierError:
+            # a worker that raised exits cleanly after queueing its traceback,
+            # one that died has nothing to queue.  Its sentinel fires a moment
+            # before the exit code can be collected, join it for that
+            ended = multiprocessing.connection.wait(
+                [p.sentinel for p in self._procs], timeout=0
+            )
+            for p in self._procs:
+                if p.sentinel in ended:
+                    p.join()
+            errors = [
+                f"shard {start}:{stop} worker died with exit code {p.exitcode}"
+                for p, (start, stop) in zip(self._procs, self.shards)
+                if p.exitcode not in (None, 0)
+            ]
+            try:
+                if not errors:
+                    errors.append(self._errors.get(timeout=5))
+                while True:
+                    errors.append(self._errors.get_nowait())
+            except queue.Empty:
+                pass
+            self.close()
+            raise RuntimeError("worker failed rendering:\n" + "\n".join(errors))
+        return self.frame
+
+    def close(self):
+        "stop the workers and release the shared buffer"
+        if self._shm is None:
+            return
+        if self._procs:
+            self._running.value = 0
+            if not self._done.broken:
+                # release the workers waiting for a frame, they see running == 0
+                try:
+                    self._go.wait(timeout=5)
+                except threading.BrokenBarrierError:
+                    pass
+            self._go.abort()
+            self._done.abort()
+            for p in self._procs:
+                p.join(timeout=5)
+                if p.is_alive():
+                    p.terminate()
+                    p.join()
+            self._watchdog.join()
+            self._procs = []
+        del self.frame
+        self._shm.unlink()
+        try:
+            self._shm.close()
+        except BufferError:
+            pass  # a caller still holds a frame, the mapping goes when it does
+        self._shm = None
@@ -0,0 +1,236 @@
+"""
+Streamer
+
+An asyncio service that sends rendered RGBW frames to controllers over UDP
+at a steady frame rate.
+
+    >>> sacn = SACNPacketizer(PatchMap.linear(40000))
+    >>> streamer = FrameStreamer(sacn, routes={1: ("10.0.0.21", 5568)}, fps=40)
+    >>> task = asyncio.ensure_future(streamer.run())
+    >>> streamer.submit(frame.rgbw)                     # from the render loop
+
+Rendering and sending are decoupled by a double buffer: submit() copies a
+frame into the back buffer and returns, the sender swaps it to the front at
+its next tick.  A renderer never waits on the network (it can live in another
+thread), and a slow renderer just means the last frame goes out again, which
+is what DMX receivers expect anyway.
+
+Ticks are scheduled on absolute deadlines (start + n / fps) rather than by
+sleeping a period after each send, so pacing doesn't drift.  A tick that is
+already a whole period late is skipped rather than bunched up, and counted.
+
+Packets are grouped by destination once, on the first tick, and each
+tick sends each controller's packets back to back.  With max_datagram set,
+consecutive packets to the same controller are also joined into datagrams of
+up to that many bytes, for protocols whose receivers take several packets in
+one datagram.  Leave it off for sACN / Art-Net, which need one packet per
+datagram.
+
+JitterListener is a local stand-in for a controller: it records arrival times
+and sequence numbers, and reports loss and inter-frame jitter.
+"""
+import asyncio
+import statistics
+import threading
+import time
+
+import numpy as np
+
+__all__ = ["FrameStreamer", "JitterListener", "StreamStats"]
+
+
+class StreamStats:
+    def __init__(self):
+        self.frames = 0  # ticks that went out
+        self.repeats = 0  # of those, ticks with no new frame submitted
+        self.skipped = 0  # ticks dropped because the sender was a period late
+        self.datagrams = 0
+        self.bytes = 0
+        self.send_time = 0.0
+
+    def __repr__(self):
+        return (
+            f"StreamStats(frames={self.frames}, repeats={self.repeats}, "
+            f"skipped={self.skipped}, datagrams={self.datagrams}, bytes={self.bytes})"
+        )
+
+
+class FrameStreamer:
+    """
+    Send frames through `packetizer` (anything with fill(frame) returning
+    [(key, packet)], ie: the dmx packetizers) to `routes`, a {key: (host,
+    port)} dict or a function of the key.  Keys with no route are not sent.
+    """
+
+    def __init__(self, packetizer, routes, fps=40.0, pixels=None, max_datagram=0):
+        assert fps > 0, "fps must be > 0"
+        self.packetizer = packetizer
+        self.routes = routes if callable(routes) else routes.get
+        self.period = 1.0 / fps
+        self.max_datagram = max_datagram
+        pixels = pixels or packetizer.patch.pixels
+        self._front = np.zeros((pixels, 4), dtype=np.uint8)
+        self._back = np.zeros((pixels, 4), dtype=np.uint8)
+        self._fresh = False
+        self._lock = threading.Lock()
+        self._running = False
+        self._plan = None
+        self.transport = None
+        self.stats = StreamStats()
+
+    def submit(self, rgbw):
+        "copy a (N,4) uint8 rgbw frame into the back buffer, never blocks on sending"
+        with self._lock:
+            self._back[...] = rgbw
+            self._fresh = True
+
+    def _swap(self):
+        with self._lock:
+            fresh = self._fresh
+            if fresh:
+                self._front, self._back = self._back, self._front
+                self._fresh = False
+        return fresh
+
+    def _route(self, packets):
+        "[(addr, [packet index, ...])], packets grouped by destination, in key order"
+        by_addr = {}
+        for i, (key, _) in enumerate(packets):
+            addr = self.routes(key)
+            if addr is not None:
+                by_addr.setdefault(addr, []).append(i)
+        return list(by_addr.items())
+
+    def _datagrams(self, packets, indices):
+        if not self.max_datagram:
+            for i in indices:
+                yield packets[i][1]
+            return
+        run, size = [], 0
+        for i in indices:
+            packet = packets[i][1]
+            if run and size + len(packet) > self.max_datagram:
+                yield b"".join(run)
+                run, size = [], 0
+            run.append(packet)
+            size += len(packet)
+        if run:
+            yield b"".join(run)
+
+    def send_frame(self):
+        "fill the packets from the front buffer and send them, one tick's work"
+        self.stats.frames += 1
+        if not self._swap():
+            self.stats.repeats += 1
+        t0 = time.perf_counter()
+        packets = self.packetizer.fill(self._front)
+        if self._plan is None:
+            self._plan = self._route(packets)
+        for addr, indices in self._plan:
+            for datagram in self._datagrams(packets, indices):
+                self.transport.sendto(datagram, addr)
+                self.stats.datagrams += 1
+                self.stats.bytes += len(datagram)
+        self.stats.send_time += time.perf_counter() - t0
+
+    async def run(self, frames=None):
+        """
+        Stream until stop() (or for `frames` ticks).  Opens its own UDP
+        transport unless one was set on .transport beforehand.
+        """
+        loop = asyncio.get_running_loop()
+        own = self.transport is None
+        if own:
+            self.transport, _ = await loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol, local_addr=("0.0.0.0", 0)
+            )
+        self._running = True
+        start = loop.time()
+        tick = 0
+        try:
+            while self._running and (frames is None or self.stats.frames < frames):
+                deadline = start + tick * self.period
+                late = loop.time() - deadline
+                if late >= self.period:
+                    # skip the ticks we missed rather than send them in a burst
+                    missed = int(late / self.period)
+                    self.stats.skipped += missed
+                    tick += missed
+                    continue
+                if late < 0:
+                    await asyncio.sleep(-late)
+                self.send_frame()
+                tick += 1
+        finally:
+            self._running = False
+            if own:
+                self.transport.close()
+                self.transport = None
+
+    def stop(self):
+        self._running = False
+
+
+class JitterListener(asyncio.DatagramProtocol):
+    """
+    Collects datagrams as a controller would.  Streams are told apart by the
+    bytes at key_at and sequenced by the byte at sequence_at, which counts
+    through the last sequence_period values of a byte before wrapping.  The
+    defaults are sACN's: universe, sequence number and 0..255.  For Art-Net,
+    whose sequence goes 1..255 (0 means unsequenced), use key_at=(14, 16),
+    sequence_at=12, sequence_period=255.
+    """
+
+    def __init__(self, key_at=(113, 115), sequence_at=111, sequence_period=256):
+        assert 1 < sequence_period <= 256, "sequence_period must be 2..256"
+        self.key_at = key_at
+        self.sequence_at = sequence_at
+        self.sequence_period = sequence_period
+        self.arrivals = {}
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        key = bytes(data[self.key_at[0] : self.key_at[1]])
+        self.arrivals.setdefault(key, []).append(
+            (time.perf_counter(), data[self.sequence_at])
+        )
+
+    @classmethod
+    async def start(cls, host="127.0.0.1", port=0, **kwargs):
+        "listen on host:port (0 picks a free port), returns the listener"
+        loop = asyncio.get_running_loop()
+        _, listener = await loop.create_datagram_endpoint(
+            lambda: cls(**kwargs), local_addr=(host, port)
+        )
+        return listener
+
+    @property
+    def address(self):
+        return self.transport.get_extra_info("sockname")
+
+    def close(self):
+        self.transport.close()
+
+    def report(self):
+        """
+        Per stream: packets received, lost (gaps in the sequence numbers),
+        mean interval between packets and its standard deviation (jitter), in
+        seconds.
+        """
+        out = {}
+        for key, arrivals in self.arrivals.items():
+            times = [t for t, _ in arrivals]
+            seqs = [s for _, s in arrivals]
+            period = self.sequence_period
+            lost = sum((b - a - 1) % period for a, b in zip(seqs, seqs[1:]))
+            gaps = [b - a for a, b in zip(times, times[1:])]
+            out[key] = {
+                "received": len(arrivals),
+                "lost": lost,
+                "interval": statistics.mean(gaps) if gaps else 0.0,
+                "jitter": statistics.pstdev(gaps) if len(gaps) > 1 else 0.0,
+            }
+        return out
@@ -0,0 +1,110 @@
+"""
+Wire
+
+Encoders from RGBW frames to the byte stream an LED strip controller wants,
+written straight into a preallocated buffer.
+
+    >>> enc = WireEncoder(300, order="GRBW")           # SK6812 RGBW
+    >>> sock.send(enc.encode(frame.rgbw))               # a memoryview of enc.buffer
+
+`order` is any arrangement of the letters R, G, B and W (or a subset, ie:
+"GRB" for an RGB strip fed from an RGBW frame), one byte per letter per pixel.
+`start` and `end` are bytes sent before / after the pixels (start frames,
+latch padding), written into the buffer once and never touched again.
+`brightness` (0.0-1.0) scales every channel on the way through, via a 256
+entry table, so dimming costs nothing extra.
+
+Frames can be (N,4) uint8 rgbw rows (batch.hsv_to_rgbw, ColorArray.rgbw,
+lut lookups) or (N,) 0xRRGGBBWW uint32 words (batch.pack_rgbw).  Either way
+the pixel bytes are gathered into the buffer one channel at a time as
+strided copies, with no per pixel python and no intermediate frame.
+"""
+import sys
+
+import numpy as np
+
+__all__ = ["WireEncoder", "SK6812_RGBW", "WS2812_RGB", "APA102_START"]
+
+# common strips, as WireEncoder keyword arguments
+SK6812_RGBW = {"order": "GRBW"}
+WS2812_RGB = {"order": "GRB"}
+APA102_START = b"\x00\x00\x00\x00"
+
+_CHANNEL = {"R": 0, "G": 1, "B": 2, "W": 3}
+
+
+class WireEncoder:
+    def __init__(self, pixels, order="GRBW", brightness=1.0, start=b"", end=b""):
+        order = order.upper()
+        assert order and all(c in _CHANNEL for c in order), "order must be R/G/B/W"
+        assert len(set(order)) == len(order), "order repeats a channel"
+        self.pixels = pixels
+        self.order = order
+        self.start = bytes(start)
+        self.end = bytes(end)
+        self.stride = len(order)
+        self.size = len(self.start) + pixels * self.stride + len(self.end)
+        self.brightness = brightness
+        self.buffer = bytearray(self.size)
+        self._write_padding(self.buffer)
+
+    def __repr__(self):
+        return f"WireEncoder({self.pixels}, order={self.order!r}, brightness={self.brightness})"
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, val):
+        assert 0.0 <= val <= 1.0, "brightness must be 0.0-1.0"
+        self._brightness = val
+        # round(x * brightness) for every byte value, None when it's a no-op
+        self._scale = None
+        if val < 1.0:
+            self._scale = np.floor(np.arange(256) * val + 0.5).astype(np.uint8)
+
+    def _write_padding(self, buf):
+        n = len(self.start)
+        buf[:n] = self.start
+        if self.end:
+            buf[self.size - len(self.end) : self.size] = self.end
+
+    def _channels(self, frame):
+        "frame as (N,4) uint8 rows plus where r, g, b, w sit in each row"
+        frame = np.asarray(frame)
+        if frame.dtype == np.uint32 and frame.ndim == 1:
+            # 0xRRGGBBWW words, the bytes in memory depend on the host
+            rows = frame.view(np.uint8).reshape(-1, 4)
+            if sys.byteorder == "little":
+                return rows, (3, 2, 1, 0)
+            return rows, (0, 1, 2, 3)
+        assert frame.dtype == np.uint8, "frames are uint8 rgbw rows or uint32 words"
+        return frame.reshape(-1, 4), (0, 1, 2, 3)
+
+    def encode(self, frame, out=None):
+        """
+        Write `frame` into `out` (any writable buffer of at least self.size
+        bytes, start / end padding included) or into self.buffer, and return
+        a memoryview of the encoded bytes.
+        """
+        rows, where = self._channels(frame)
+        assert (
+            len(rows) == self.pixels
+        ), f"expected {self.pixels} pixels, got {len(rows)}"
+        if out is None:
+            out = self.buffer
+        else:
+            assert len(memoryview(out).cast("B")) >= self.size, "out is too small"
+            self._write_padding(memoryview(out).cast("B"))
+
+        dest = np.frombuffer(
+            out, dtype=np.uint8, count=self.pixels * self.stride, offset=len(self.start)
+        ).reshape(self.pixels, self.stride)
+        for i, c in enumerate(self.order):
+            src = rows[:, where[_CHANNEL[c]]]
+            if self._scale is None:
+                dest[:, i] = src
+            else:
+                np.take(self._scale, src, out=dest[:, i], mode="clip")
+        return memoryview(out)[: self.size]
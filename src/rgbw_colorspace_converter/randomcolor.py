@@ -31,7 +31,7 @@ from numbers import Number
 import itertools
 import random
 
-from color import HSV
+from rgbw_colorspace_converter.colors.converters import HSV
 
 __all__ = ["random_color"]
 
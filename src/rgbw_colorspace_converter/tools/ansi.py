@@ -0,0 +1,212 @@
+"""
+ANSI
+
+24 bit color straight to the terminal, no shell and no external tools:
+
+    >>> sys.stdout.write(colorize(" hello ", RGB(255, 255, 0), RGB(0, 0, 128)))
+
+The escape sequence for a foreground / background pair is built once and
+cached, keyed by the colors' packed rgb, so a preview that keeps drawing the
+same few colors doesn't rebuild it per row.
+
+AnsiPrinter is what tools.color_printer.print_colors runs on.  It keeps the
+state print_colors used to stash in os.environ (the cycling character string,
+the zigzag counter and direction) on the printer, writes each row to its
+stream in one write, and appends the same bytes to a capture file when asked,
+in place of piping through tee.
+
+Where the terminal doesn't do 24 bit color (tools.palette.color_depth, or
+colors= given explicitly) the nearest xterm-256 or 16 color index is sent
+instead.
+"""
+import functools
+import random
+import shutil
+import sys
+
+from rgbw_colorspace_converter.colors.converters import RGB, Color
+from rgbw_colorspace_converter.tools.palette import (
+    TRUECOLOR,
+    color_depth,
+    color_index,
+    sgr,
+)
+
+__all__ = ["RESET", "fg_bg", "colorize", "AnsiPrinter"]
+
+RESET = "\x1b[0m"
+
+
+@functools.lru_cache(maxsize=4096)
+def _fg_bg(fg, bg, colors=TRUECOLOR):
+    if colors != TRUECOLOR:
+        return (
+            f"\x1b[{sgr(color_index(fg, colors), colors)}m"
+            f"\x1b[{sgr(color_index(bg, colors), colors, background=True)}m"
+        )
+    return (
+        f"\x1b[38;2;{fg >> 16};{fg >> 8 & 0xFF};{fg & 0xFF}m"
+        f"\x1b[48;2;{bg >> 16};{bg >> 8 & 0xFF};{bg & 0xFF}m"
+    )
+
+
+def fg_bg(fg, bg, colors=None):
+    """
+    The escape sequence selecting Color fg on Color bg, in `colors` colors
+    (TRUECOLOR, 256 or 16; None asks color_depth())
+    """
+    assert isinstance(fg, Color) and isinstance(bg, Color), "expected Colors"
+    return _fg_bg(fg.to_int(), bg.to_int(), colors or color_depth())
+
+
+def colorize(text, fg, bg, colors=None):
+    "text in fg on bg, with the attributes reset after it"
+    return fg_bg(fg, bg, colors) + text + RESET
+
+
+def _rjust_width(flag, col_width):
+    """
+    The width a row is right justified to, or 0 for none.  Takes print_colors'
+    colr style "-r N" (N == 0 meaning the terminal width) or a plain int.
+    """
+    if not flag:
+        return 0
+    if isinstance(flag, str):
+        parts = flag.split()
+        flag = int(parts[-1]) if len(parts) > 1 else 0
+    return flag or shutil.get_terminal_size((col_width + 2, 24)).columns
+
+
+class AnsiPrinter:
+    """
+    Prints rows of colored text to `stream` (sys.stdout if None, looked up
+    on every write so redirections are honoured), in `colors` colors (None
+    asks color_depth() on every write, like the stream).
+    """
+
+    _BLACK = RGB(1, 1, 1)
+    _MAGENTA = RGB(255, 0, 255)
+
+    def __init__(self, stream=None, colors=None):
+        self._stream = stream
+        self.colors = colors
+        self.char_string = ""
+        self.zag_ctr = 0
+        self.char_dir = "R"
+        self._captures = {}
+
+    @property
+    def stream(self):
+        return self._stream if self._stream is not None else sys.stdout
+
+    def close(self):
+        "close any capture files"
+        for fh in self._captures.values():
+            fh.close()
+        self._captures.clear()
+
+    def _capture(self, path, text):
+        fh = self._captures.get(path)
+        if fh is None:
+            fh = self._captures[path] = open(path, "a")
+        fh.write(text)
+        fh.flush()
+
+    def write_row(self, text, fg, bg, newline=True, rjust=0, capture=None):
+        """
+        Write one colored row, return 0, or 1 if the stream is gone (ie: a
+        closed pipe), the way a failed colr call used to report it.
+        """
+        if rjust:
+            text = text.rjust(rjust)
+        row = colorize(text, fg, bg, self.colors) + ("\n" if newline else "")
+        try:
+            self.stream.write(row)
+            self.stream.flush()
+        except (OSError, ValueError):
+            return 1
+        if capture:
+            self._capture(capture, row)
+        return 0
+
+    def _cycle(self, zigzag, zag_max):
+        if zigzag:
+            self.zag_ctr += 1
+            if self.zag_ctr > int(zag_max):
+                self.zag_ctr = 0
+                self.char_dir = "R" if self.char_dir == "L" else "L"
+        s = self.char_string
+        if s:
+            if self.char_dir == "R":
+                self.char_string = s[-1] + s[:-1]
+            else:
+                self.char_string = s[1:] + s[0]
+
+    def print_colors(
+        self,
+        color=None,
+        print_chars="_",
+        ansi_bat_f=None,
+        col_width=10,
+        print_color_codes=False,
+        no_newlines=False,
+        right_just_term_width="",
+        check_term_size=True,
+        print_bars=False,
+        capture_output=True,
+        random_block_len=False,
+        n_row=-1,
+        foreground_color=None,
+        background_color=None,
+        cycle_chars=False,
+        zigzag=False,
+        zag_max=100,
+        multiply_txt=True,
+    ):
+        "see tools.color_printer.print_colors"
+        if color is None and foreground_color is None and background_color is None:
+            raise Exception(
+                "\t\t\t\n\n\t\t\tYou must specify color UNLESS you specify both background_color and foreground_color independently."
+            )
+        if foreground_color is None:
+            foreground_color = color
+        if background_color is None:
+            background_color = color if print_bars else self._BLACK
+
+        if check_term_size:
+            col_width = shutil.get_terminal_size((col_width + 2, 24)).columns - 2
+        newline = not no_newlines
+        rjust = _rjust_width(right_just_term_width, col_width)
+        capture = ansi_bat_f if capture_output else None
+
+        if n_row in (-1, 0):
+            self.char_string = print_chars * int(col_width * 2)
+        if n_row == 0:
+            # a placeholder and a blank row to start the session
+            ph = str("pleaseholddlohesaelp" * 40)[0 : col_width - 1]
+            self.write_row(f" {ph} ", self._BLACK, self._MAGENTA, newline, rjust)
+            ll = "O" * (col_width - 2)
+            self.write_row(f" {ll} ", self._BLACK, self._BLACK, True, rjust)
+
+        if print_color_codes:
+            text = "                    " + str(color)
+            ret_code = self.write_row(
+                f" {text} ", foreground_color, background_color, capture=capture
+            )
+            return (ret_code, int(col_width))
+
+        r = 1
+        if random_block_len:
+            r = random.randint(1, int(col_width * 1.85))
+            r = float(r) / float(col_width)
+        cw = int(col_width * r)
+        if multiply_txt:
+            text = (self.char_string * cw)[0:cw]
+        else:
+            text = print_chars
+        if cycle_chars:
+            self._cycle(zigzag, zag_max)
+        ret_code = self.write_row(
+            f" {text} ", foreground_color, background_color, newline, rjust, capture
+        )
+        return (ret_code, int(col_width))
@@ -0,0 +1,175 @@
+"""
+Canvas
+
+A terminal canvas for live previews of whole LED layouts.  Each character
+cell shows two pixels, the upper one as the foreground of a half block
+("▀") and the lower one as its background, in 24 bit color:
+
+    >>> canvas = TerminalCanvas(160, 90)                 # pixels, 160 x 45 cells
+    >>> canvas.begin()                                   # clear, hide the cursor
+    >>> canvas.draw(rgb_frame)                           # (90, 160, 3) uint8
+    >>> canvas.end()
+
+The last frame drawn is kept (as one packed int64 per cell, both pixels'
+rgb) and the next one only redraws the cells that changed: a cursor move
+where the changed cells aren't contiguous, a color escape only when the
+colors differ from the cell before, then the half block.  The whole update
+goes out in one write(), so a mostly static layout costs a few bytes per
+frame, which is what makes 30+ fps over SSH work.
+
+On a terminal without 24 bit color (tools.palette.color_depth, or colors=)
+frames are quantized to xterm-256 or 16 color indices first and cells are
+compared by index, so a change too small for the terminal to show isn't
+redrawn either.
+
+Frames are (height, width, 3) uint8 rgb.  For rgbw frames convert first
+(batch.rgbw_to_rgb).  An odd height gets a black
+row added at the bottom.
+"""
+import sys
+
+import numpy as np
+
+from rgbw_colorspace_converter.tools.palette import (
+    TRUECOLOR,
+    color_depth,
+    quantize,
+    sgr,
+)
+
+__all__ = ["TerminalCanvas", "UPPER_HALF"]
+
+UPPER_HALF = "▀"
+
+_CSI = "\x1b["
+# color escapes per packed rgb, emptied when they get this big
+_CACHE_SIZE = 1 << 16
+_fg_cache = {}
+_bg_cache = {}
+
+
+def _escape(cache, code, rgb):
+    if len(cache) >= _CACHE_SIZE:
+        cache.clear()
+    s = cache[rgb] = f"{_CSI}{code};2;{rgb >> 16};{rgb >> 8 & 0xFF};{rgb & 0xFF}m"
+    return s
+
+
+def _fg(rgb):
+    return _fg_cache.get(rgb) or _escape(_fg_cache, 38, rgb)
+
+
+def _bg(rgb):
+    return _bg_cache.get(rgb) or _escape(_bg_cache, 48, rgb)
+
+
+class TerminalCanvas:
+    """
+    A width x height pixel canvas drawn at terminal row / column `origin`
+    (1 based, the top left by default) on `stream` (sys.stdout if None), in
+    `colors` colors (TRUECOLOR, 256 or 16; None asks color_depth()).
+    """
+
+    def __init__(self, width, height, stream=None, origin=(1, 1), colors=None):
+        assert width > 0 and height > 0, "canvas needs at least one pixel"
+        self.width = width
+        self.height = height
+        self.rows = (height + 1) // 2
+        self.origin = origin
+        self._stream = stream
+        self.colors = colors or color_depth()
+        if self.colors == TRUECOLOR:
+            self._fg, self._bg = _fg, _bg
+        else:
+            # cells hold palette indices, the escapes are a list lookup
+            fg = [f"{_CSI}{sgr(i, self.colors)}m" for i in range(256)]
+            bg = [f"{_CSI}{sgr(i, self.colors, background=True)}m" for i in range(256)]
+            self._fg, self._bg = fg.__getitem__, bg.__getitem__
+        # front holds what the terminal shows, back the frame being drawn
+        self._front = np.full((self.rows, width), -1, dtype=np.int64)
+        self._back = np.empty((self.rows, width), dtype=np.int64)
+        self._pixels = np.zeros((self.rows * 2, width, 3), dtype=np.int64)
+        self.frames = 0
+        self.cells_drawn = 0
+        self.chars_written = 0
+
+    def __repr__(self):
+        return f"TerminalCanvas({self.width}, {self.height}, colors={self.colors})"
+
+    @property
+    def stream(self):
+        return self._stream if self._stream is not None else sys.stdout
+
+    def _write(self, s):
+        self.stream.write(s)
+        self.stream.flush()
+        self.chars_written += len(s)
+
+    def begin(self):
+        "clear the screen and hide the cursor"
+        self._write(f"{_CSI}2J{_CSI}?25l")
+        self.invalidate()
+
+    def end(self):
+        "reset colors, show the cursor, and leave it below the canvas"
+        self._write(f"{_CSI}0m{_CSI}{self.origin[0] + self.rows};1H{_CSI}?25h")
+
+    def invalidate(self):
+        "forget what's on screen, the next draw redraws every cell"
+        self._front[...] = -1
+
+    def _pack(self, frame):
+        frame = np.asarray(frame)
+        assert frame.dtype == np.uint8, "expected uint8 rgb"
+        assert frame.shape == (
+            self.height,
+            self.width,
+            3,
+        ), f"expected a ({self.height}, {self.width}, 3) rgb frame, got {frame.shape}"
+        px = self._pixels
+        if self.colors == TRUECOLOR:
+            px[: self.height] = frame
+            rgb = px[..., 0] << 16 | px[..., 1] << 8 | px[..., 2]
+        else:
+            rgb = px[..., 0]
+            rgb[: self.height] = quantize(frame, self.colors)
+        np.bitwise_or(rgb[0::2] << 24, rgb[1::2], out=self._back)
+
+    def _render(self, frame):
+        "(the escapes and characters that bring the screen up to frame, cells changed)"
+        self._pack(frame)
+        rows, cols = np.nonzero(self._back != self._front)
+        if not len(rows):
+            return "", 0
+        cells = self._back[rows, cols]
+        top0, left0 = self.origin
+        out = []
+        fg = bg = -1
+        at = None  # (row, col) the cursor is at
+        for r, c, cell in zip(rows.tolist(), cols.tolist(), cells.tolist()):
+            if at != (r, c):
+                out.append(f"{_CSI}{top0 + r};{left0 + c}H")
+            top, bottom = cell >> 24, cell & 0xFFFFFF
+            if top != fg:
+                out.append(self._fg(top))
+                fg = top
+            if bottom != bg:
+                out.append(self._bg(bottom))
+                bg = bottom
+            out.append(UPPER_HALF)
+            at = (r, c + 1)
+        out.append(f"{_CSI}0m")
+        return "".join(out), len(cells)
+
+    def draw(self, frame):
+        """
+        Draw `frame`, writing only the cells that changed since the last
+        draw in a single write().  Returns the number of cells redrawn.
+        """
+        s, changed = self._render(frame)
+        self._front, self._back = self._back, self._front
+        self.frames += 1
+        self.cells_drawn += changed
+        if s:
+            self._write(s)
+        return changed
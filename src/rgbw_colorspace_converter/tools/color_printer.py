@@ -1,10 +1,11 @@
-import os
-import random
+from rgbw_colorspace_converter.tools.ansi import AnsiPrinter
 
-from rgbw_colorspace_converter.colors.converters import RGB
+# print_colors' state (the cycling character string, zigzag counter and
+# direction) lives here between calls
+_printer = AnsiPrinter()
 
 
-# Write colors module using colr!
+# Write colors with 24 bit ANSI escapes, see tools/ansi.py
 def print_colors(
     color=None,
     print_chars="_",
@@ -27,88 +28,29 @@ def print_colors(
     zag_max=100,
     multiply_txt=True,
 ):
-
-    if color is None and foreground_color is None and background_color is None:
-        raise Exception(
-            "\t\t\t\n\n\t\t\tYou must specify color UNLESS you specify both background_color and foreground_color independently."
-        )
-
-    if foreground_color is None:
-        foreground_color = color
-    if background_color is None:
-        if print_bars:
-            background_color = color
-        else:
-            background_color = RGB(1, 1, 1)
-
-    no_newlines_flag = ""
-    if no_newlines:
-        no_newlines_flag = " -n "
-
-    if check_term_size:
-        col_width = os.get_terminal_size().columns - 2
-
-    ret_code = None
-    blk = RGB(1, 1, 1)
-
-    cap_o = ""
-    if capture_output is True:
-        cap_o = f" | tee -a {ansi_bat_f} "
-
-    if n_row == -1:
-        os.environ["char_string"] = print_chars * int(col_width * 2)
-
-    if n_row == 0:
-        # Set the env var holding the char string to be used
-        os.environ["char_string"] = print_chars * int(col_width * 2)
-        while n_row < 1:
-            ph = str("pleaseholddlohesaelp" * 40)[0 : col_width - 1]
-            os.system(
-                f"colr {right_just_term_width} {no_newlines_flag}  ' {ph} ' '{blk.hex}' 'ff00ff'; "
-            )
-            ll = "O" * (col_width - 2)
-            cmd = f"""colr {right_just_term_width}  " {ll} " "{blk.hex}" "{blk.hex}"  2>/dev/null;"""
-            ret_code = os.system(cmd)
-            n_row = n_row + 1
-
-    l = ""
-    if print_color_codes is False:
-        # just print colors
-        r = 1
-        if random_block_len:
-            r = random.randint(1, int(col_width * 1.85))
-            r = float(r) / float(col_width)
-
-        cw = int(col_width * r)
-        if multiply_txt:
-            l = str(str(os.environ["char_string"]) * cw)[0:cw]
-        else:
-            l = print_chars
-        if cycle_chars:
-            if zigzag:
-                os.environ["zag_ctr"] = str(int(os.environ["zag_ctr"]) + 1)
-                if int(os.environ["zag_ctr"]) > int(zag_max):
-                    os.environ["zag_ctr"] = "0"
-                    if os.environ["rgbw_char_dir"] == "L":
-                        os.environ["rgbw_char_dir"] = "R"
-                    else:
-                        os.environ["rgbw_char_dir"] = "L"
-
-            if os.environ["rgbw_char_dir"] in ["R"]:
-                os.environ["char_string"] = (
-                    os.environ["char_string"][-1] + os.environ["char_string"][0:-1]
-                )
-            else:
-                os.environ["char_string"] = (
-                    os.environ["char_string"][1:] + os.environ["char_string"][0]
-                )
-
-        cmd = f"""colr  {right_just_term_width}  {no_newlines_flag} " {l} " "{foreground_color.hex}" "{background_color.hex}" {cap_o} 2>/dev/null;"""
-        ret_code = os.system(cmd)
-    else:
-        # Prtint color codes with color blocks
-        l = "                    " + str(color)
-        cmd = f"""colr  " {l} " "{foreground_color.hex}" "{background_color.hex}" {cap_o} 2>/dev/null;"""
-        ret_code = os.system(cmd)
-
-    return (int(ret_code), int(col_width))
+    """
+    Print one row of `color` (or foreground_color on background_color) and
+    return (0, col_width), or a non-zero code if stdout went away.  The row is
+    appended to ansi_bat_f too when capture_output is set.  ansi_html_f and
+    random_col_len are accepted for old callers and unused.
+    """
+    return _printer.print_colors(
+        color=color,
+        print_chars=print_chars,
+        ansi_bat_f=ansi_bat_f,
+        col_width=col_width,
+        print_color_codes=print_color_codes,
+        no_newlines=no_newlines,
+        right_just_term_width=right_just_term_width,
+        check_term_size=check_term_size,
+        print_bars=print_bars,
+        capture_output=capture_output and ansi_bat_f is not None,
+        random_block_len=random_block_len,
+        n_row=n_row,
+        foreground_color=foreground_color,
+        background_color=background_color,
+        cycle_chars=cycle_chars,
+        zigzag=zigzag,
+        zag_max=zag_max,
+        multiply_txt=multiply_txt,
+    )
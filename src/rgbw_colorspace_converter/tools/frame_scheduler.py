@@ -0,0 +1,125 @@
+"""
+Frame scheduler
+
+Run a render callback on a fixed timestep, off a monotonic clock:
+
+    >>> sched = FrameScheduler(fps=30)
+    >>> stats = sched.run(draw, frames=300)              # draw(frame, t)
+    >>> stats = sched.play(spin_hue(color))              # one frame per item
+
+Frame n is due at start + n / fps, so time spent rendering doesn't push the
+rest of the schedule back and the rate doesn't drift.  When rendering falls
+behind by a whole frame or more, `policy` decides what happens:
+
+  * "skip" (the default) drops the frames whose time has passed and renders
+    the next one that is still due, counting the drops.  Right for anything
+    that shows the current state, ie: a terminal or an LED strip.
+  * "catchup" renders the missed frames back to back with no wait, up to
+    max_catchup of them, then skips the rest.  Right when every frame
+    advances a simulation and the step count matters.
+
+Either way the stats count frames rendered, frames that started late (more
+than `tolerance` of a period after their deadline) and frames dropped.
+"""
+import time
+
+__all__ = ["FrameScheduler", "FrameStats", "SKIP", "CATCHUP"]
+
+SKIP = "skip"
+CATCHUP = "catchup"
+
+
+class FrameStats:
+    def __init__(self):
+        self.frames = 0  # render calls
+        self.late = 0  # of those, started more than tolerance past their deadline
+        self.dropped = 0  # frames skipped without rendering
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return (
+            f"FrameStats(frames={self.frames}, late={self.late}, "
+            f"dropped={self.dropped}, elapsed={self.elapsed:.3f})"
+        )
+
+    @property
+    def fps(self):
+        "frames rendered per second of wall clock"
+        return self.frames / self.elapsed if self.elapsed else 0.0
+
+
+class FrameScheduler:
+    """
+    `clock` and `sleep` default to time.monotonic and time.sleep, pass others
+    to drive a scheduler from a simulated clock.
+    """
+
+    def __init__(
+        self,
+        fps=30.0,
+        policy=SKIP,
+        max_catchup=5,
+        tolerance=0.25,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        assert fps > 0, "fps must be > 0"
+        assert policy in (SKIP, CATCHUP), f"unknown policy {policy!r}"
+        self.period = 1.0 / fps
+        self.policy = policy
+        self.max_catchup = max_catchup
+        self.tolerance = tolerance
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = FrameStats()
+
+    @property
+    def fps(self):
+        return 1.0 / self.period
+
+    def run(self, render, frames=None, duration=None):
+        """
+        Call render(frame, t) once per due frame, `frame` counting from 0 on
+        the schedule (so dropped frames leave gaps) and `t` its due time in
+        seconds from the start.  Stops after `frames` renders, `duration`
+        seconds, or when render returns False (that call isn't counted as a
+        frame).  Returns the FrameStats.
+        """
+        stats = self.stats = FrameStats()
+        start = self.clock()
+        frame = 0
+        behind = 0  # frames rendered back to back while catching up
+        while frames is None or stats.frames < frames:
+            due = frame * self.period
+            if duration is not None and due >= duration:
+                break
+            late = self.clock() - start - due
+            if late < 0:
+                self.sleep(-late)
+                behind = 0
+            elif late >= self.period:
+                if self.policy == SKIP or behind >= self.max_catchup:
+                    missed = int(late / self.period + 1e-9)  # 0.7 / 0.1 is 6.99..
+                    stats.dropped += missed
+                    frame += missed
+                    behind = 0
+                    continue
+                behind += 1
+            if render(frame, due) is False:
+                break
+            stats.frames += 1
+            if late > self.tolerance * self.period:
+                stats.late += 1
+            frame += 1
+        stats.elapsed = self.clock() - start
+        return stats
+
+    def play(self, frames, limit=None):
+        """
+        Advance an iterable (typically a generator that draws one frame per
+        step) one item per scheduled frame until it's exhausted, or `limit`
+        frames.  Returns the FrameStats.
+        """
+        it = iter(frames)
+        done = object()
+        return self.run(lambda frame, t: next(it, done) is not done, frames=limit)
@@ -0,0 +1,303 @@
+"""
+Image Writer
+
+PNG and animated GIF straight from rgb frames, in process, with nothing but
+zlib and numpy:
+
+    >>> write_png("swatch.png", frame)                   # (height, width, 3) uint8
+    >>> with GIFWriter("whirl.gif", 160, 90, fps=20) as gif:
+    ...     for frame in frames:
+    ...         gif.add_frame(frame)
+
+Both stream.  PNGWriter takes rows a few at a time and compresses them as
+they come, writing IDAT chunks as the compressor fills them, so an image
+taller than memory would hold is fine.  GIFWriter encodes and writes each
+frame when it is added and keeps none of them.
+
+PNG rows use the "up" filter (the difference from the row above), which is
+what makes the long runs of identical rows the demo scripts produce nearly
+free.  A GIF frame gets its own exact palette when it has 256 colors or
+fewer, otherwise it is quantized to 3-3-2 bit rgb.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+__all__ = ["PNGWriter", "write_png", "GIFWriter", "write_gif"]
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_FILTER_UP = 2
+# flush compressed data into an IDAT chunk once this much is pending
+_IDAT_SIZE = 1 << 16
+
+
+def _open(target):
+    "(binary file, whether we opened it) for a path or an open file"
+    if hasattr(target, "write"):
+        return target, False
+    return open(target, "wb"), True
+
+
+def _rgb(frame, width, height=None):
+    frame = np.asarray(frame)
+    assert frame.dtype == np.uint8, "expected uint8 rgb"
+    assert frame.ndim == 3 and frame.shape[1:] == (
+        width,
+        3,
+    ), f"expected (rows, {width}, 3) rgb, got {frame.shape}"
+    assert (
+        height is None or frame.shape[0] == height
+    ), f"expected {height} rows, got {frame.shape[0]}"
+    return frame
+
+
+class PNGWriter:
+    """
+    A width x height 8 bit rgb PNG, written to `target` (a path or a binary
+    file) as rows arrive.  `level` is the zlib compression level.
+    """
+
+    def __init__(self, target, width, height, level=6):
+        assert width > 0 and height > 0, "image needs at least one pixel"
+        self.width = width
+        self.height = height
+        self.rows = 0
+        self._fh, self._owned = _open(target)
+        self._z = zlib.compressobj(level)
+        self._pending = []
+        self._pending_size = 0
+        self._prev = np.zeros((1, width * 3), dtype=np.uint8)
+        self._fh.write(_PNG_SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _chunk(self, kind, data):
+        self._fh.write(struct.pack(">I", len(data)))
+        self._fh.write(kind)
+        self._fh.write(data)
+        self._fh.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+    def _compressed(self, data):
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+        if self._pending_size >= _IDAT_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._chunk(b"IDAT", b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def write_rows(self, rows):
+        "append (n, width, 3) uint8 rows"
+        rows = _rgb(rows, self.width)
+        assert self.rows + len(rows) <= self.height, "more rows than the image has"
+        if not len(rows):
+            return
+        flat = rows.reshape(len(rows), -1)
+        filtered = np.empty((len(rows), flat.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = _FILTER_UP
+        # uint8 arithmetic wraps, which is the filter's modulo 256
+        np.subtract(flat, np.concatenate([self._prev, flat[:-1]]), out=filtered[:, 1:])
+        self._prev = flat[-1:].copy()
+        self._compressed(self._z.compress(filtered.tobytes()))
+        self.rows += len(rows)
+
+    def close(self):
+        "finish the image; all height rows must have been written"
+        if self._fh is None:
+            return
+        assert self.rows == self.height, f"wrote {self.rows} of {self.height} rows"
+        self._compressed(self._z.flush())
+        self._flush()
+        self._chunk(b"IEND", b"")
+        if self._owned:
+            self._fh.close()
+        else:
+            self._fh.flush()
+        self._fh = None
+
+
+def write_png(target, frame, level=6):
+    "write one (height, width, 3) uint8 frame as a PNG"
+    frame = np.asarray(frame)
+    with PNGWriter(target, frame.shape[1], frame.shape[0], level) as png:
+        png.write_rows(frame)
+
+
+# 3-3-2 bit rgb, each level at the middle of the range it stands for
+_R332 = (np.arange(256) >> 5) * 32 + 16
+_G332 = (np.arange(256) >> 2 & 7) * 32 + 16
+_B332 = (np.arange(256) & 3) * 64 + 32
+_PALETTE_332 = np.stack([_R332, _G332, _B332], axis=-1).astype(np.uint8)
+
+
+def _palettize(frame):
+    "(palette as (n, 3) uint8, indices as a flat uint8 array)"
+    packed = (
+        frame[..., 0].astype(np.uint32) << 16
+        | frame[..., 1].astype(np.uint32) << 8
+        | frame[..., 2]
+    ).ravel()
+    colors, indices = np.unique(packed, return_inverse=True)
+    if len(colors) <= 256:
+        palette = np.stack(
+            [colors >> 16, colors >> 8 & 0xFF, colors & 0xFF], axis=-1
+        ).astype(np.uint8)
+        return palette, indices.astype(np.uint8)
+    indices = frame[..., 0] & 0xE0 | (frame[..., 1] & 0xE0) >> 3 | frame[..., 2] >> 6
+    return _PALETTE_332, indices.ravel()
+
+
+def _lzw(indices, min_code_size):
+    "GIF flavoured LZW of indices, as the packed bytes (not yet in sub-blocks)"
+    clear = 1 << min_code_size
+    eoi = clear + 1
+    out = bytearray()
+    code_size = min_code_size + 1
+    # (prefix code << 8 | index) -> code
+    table = {}
+    next_code = eoi + 1
+
+    acc, nacc = clear, code_size
+    it = iter(indices.tolist())
+    prefix = next(it)
+    for index in it:
+        key = prefix << 8 | index
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        acc |= prefix << nacc
+        nacc += code_size
+        while nacc >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            nacc -= 8
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+            if next_code > 1 << code_size:
+                code_size += 1
+        else:
+            # the table is full: start over
+            acc |= clear << nacc
+            nacc += code_size
+            table.clear()
+            next_code = eoi + 1
+            code_size = min_code_size + 1
+        prefix = index
+    acc |= prefix << nacc
+    nacc += code_size
+    # the decoder adds an entry on reading that last code, which can widen eoi
+    if next_code < 4096 and next_code + 1 > 1 << code_size:
+        code_size += 1
+    acc |= eoi << nacc
+    nacc += code_size
+    while nacc > 0:
+        out.append(acc & 0xFF)
+        acc >>= 8
+        nacc -= 8
+    return bytes(out)
+
+
+def _sub_blocks(data):
+    return (
+        b"".join(
+            bytes([len(data[i : i + 255])]) + data[i : i + 255]
+            for i in range(0, len(data), 255)
+        )
+        + b"\x00"
+    )
+
+
+class GIFWriter:
+    """
+    An animated width x height GIF, written to `target` (a path or a binary
+    file) a frame at a time.  Frames show for 1 / fps seconds unless
+    add_frame gets a delay; `loop` is the repeat count, 0 for forever.
+    """
+
+    def __init__(self, target, width, height, fps=10, loop=0):
+        assert 0 < width < 65536 and 0 < height < 65536, "GIF sides are 1..65535"
+        assert fps > 0, "fps must be positive"
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frames = 0
+        self._fh, self._owned = _open(target)
+        self._fh.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+        # the NETSCAPE2.0 application extension, for looping
+        self._fh.write(
+            b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_frame(self, frame, delay=None):
+        "encode and write a (height, width, 3) uint8 frame, shown for delay seconds"
+        assert self._fh is not None, "GIFWriter is closed"
+        frame = _rgb(frame, self.width, self.height)
+        if delay is None:
+            delay = 1.0 / self.fps
+        palette, indices = _palettize(frame)
+        bits = max(1, (len(palette) - 1).bit_length())
+        table = np.zeros((1 << bits, 3), dtype=np.uint8)
+        table[: len(palette)] = palette
+        min_code_size = max(2, bits)
+
+        fh = self._fh
+        # graphic control: no disposal, delay in centiseconds
+        fh.write(
+            b"\x21\xf9\x04\x04"
+            + struct.pack("<H", max(0, min(65535, round(delay * 100))))
+            + b"\x00\x00"
+        )
+        # image descriptor with a local color table
+        fh.write(
+            b"\x2c"
+            + struct.pack("<HHHHB", 0, 0, self.width, self.height, 0x80 | bits - 1)
+        )
+        fh.write(table.tobytes())
+        fh.write(bytes([min_code_size]))
+        fh.write(_sub_blocks(_lzw(indices, min_code_size)))
+        self.frames += 1
+
+    def close(self):
+        "write the trailer and close the file if we opened it"
+        if self._fh is None:
+            return
+        self._fh.write(b"\x3b")
+        if self._owned:
+            self._fh.close()
+        else:
+            self._fh.flush()
+        self._fh = None
+
+
+def write_gif(target, frames, fps=10, loop=0):
+    "write an iterable of same sized (height, width, 3) uint8 frames as a GIF"
+    gif = None
+    try:
+        for frame in frames:
+            if gif is None:
+                frame = np.asarray(frame)
+                gif = GIFWriter(target, frame.shape[1], frame.shape[0], fps, loop)
+            gif.add_frame(frame)
+    finally:
+        if gif is not None:
+            gif.close()
+    assert gif is not None, "no frames to write"
+    return gif.frames
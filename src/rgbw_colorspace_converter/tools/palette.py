@@ -0,0 +1,168 @@
+"""
+Palette
+
+Terminal colors for terminals without 24 bit color.  Maps Colors and rgb
+arrays to the nearest xterm-256 (or basic 16) color index:
+
+    >>> color_index(RGB(255, 100, 0))
+    202
+    >>> quantize(frame, colors=16)                       # (h, w, 3) -> (h, w)
+
+Rather than search the palette for every pixel, the nearest index for every
+cell of a 64 x 64 x 64 rgb cube (CUBE_BITS per channel) is found once, on
+first use, and every lookup after that is a single fancy-index on the top
+bits of each channel.
+
+The 256 color mapping only picks from the 6x6x6 cube and the gray ramp
+(16..255): the first 16 are set by the terminal's theme and can be
+anything.  The 16 color mapping assumes xterm's default colors for them.
+
+color_depth() guesses what the terminal can show from the environment.
+tools.ansi and tools.canvas fall back to these indices on their own when
+it says truecolor isn't available.
+"""
+import functools
+import os
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors.converters import Color
+
+__all__ = [
+    "TRUECOLOR",
+    "CUBE_BITS",
+    "XTERM_256",
+    "color_depth",
+    "cube",
+    "quantize",
+    "color_index",
+    "sgr",
+]
+
+TRUECOLOR = 1 << 24
+CUBE_BITS = 6
+
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+# xterm's defaults for the 16 basic colors
+_BASIC_16 = (
+    (0, 0, 0),
+    (205, 0, 0),
+    (0, 205, 0),
+    (205, 205, 0),
+    (0, 0, 238),
+    (205, 0, 205),
+    (0, 205, 205),
+    (229, 229, 229),
+    (127, 127, 127),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (92, 92, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+)
+
+
+def _xterm_256():
+    cube_rgb = [
+        (r, g, b) for r in _CUBE_LEVELS for g in _CUBE_LEVELS for b in _CUBE_LEVELS
+    ]
+    grays = [(v, v, v) for v in range(8, 248, 10)]
+    return np.array(list(_BASIC_16) + cube_rgb + grays, dtype=np.uint8)
+
+
+XTERM_256 = _xterm_256()
+XTERM_256.flags.writeable = False
+
+
+def color_depth(environ=None):
+    """
+    How many colors the terminal shows, from $COLORTERM and $TERM: TRUECOLOR,
+    256 or 16.
+    """
+    env = os.environ if environ is None else environ
+    if env.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return TRUECOLOR
+    term = env.get("TERM", "")
+    if "direct" in term:
+        return TRUECOLOR
+    if "256" in term:
+        return 256
+    return 16
+
+
+def _search(points, first, palette):
+    "the nearest of palette's rows to each point, by trying them all"
+    pal = palette.astype(np.float64)
+    # |p - c|^2 = |p|^2 - 2 p.c + |c|^2, and |p|^2 doesn't change the argmin
+    weights = (pal**2).sum(axis=-1)
+    return (np.argmin(weights - 2.0 * (points @ pal.T), axis=1) + first).astype(
+        np.uint8
+    )
+
+
+def _nearest_256(points):
+    """
+    The nearest of 16..255.  The 6x6x6 part is a grid, so its nearest entry is
+    the nearest level per channel, and the nearest gray is the one nearest the
+    channels' mean; then whichever of the two is closer.
+    """
+    levels = np.array(_CUBE_LEVELS, dtype=np.float64)
+    level = np.abs(points[..., None] - levels).argmin(axis=-1)
+    cube_d = ((points - levels[level]) ** 2).sum(axis=-1)
+    gray = np.clip(np.rint((points.mean(axis=-1) - 8) / 10), 0, 23)
+    gray_d = ((points - (8 + 10 * gray)[:, None]) ** 2).sum(axis=-1)
+    in_cube = 16 + 36 * level[:, 0] + 6 * level[:, 1] + level[:, 2]
+    return np.where(gray_d < cube_d, 232 + gray, in_cube).astype(np.uint8)
+
+
+@functools.lru_cache(maxsize=None)
+def cube(colors=256):
+    """
+    The (n, n, n) uint8 table, n = 2 ** CUBE_BITS, of the nearest palette index
+    for each cell's center.  Computed on first use.
+    """
+    assert colors in (16, 256), "colors must be 16 or 256"
+    n = 1 << CUBE_BITS
+    step = 256 // n
+    centers = np.arange(n) * step + (step - 1) / 2.0
+    r, g, b = np.meshgrid(centers, centers, centers, indexing="ij")
+    points = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=-1)
+    if colors == 256:
+        best = _nearest_256(points)
+    else:
+        best = _search(points, 0, XTERM_256[:16])
+    table = best.reshape(n, n, n)
+    table.flags.writeable = False
+    return table
+
+
+def quantize(rgb, colors=256):
+    "the nearest palette index of each (..., 3) rgb row, as uint8 (...)"
+    rgb = np.asarray(rgb)
+    assert rgb.shape[-1:] == (3,), "expected (..., 3) rgb"
+    top = (rgb.astype(np.uint8, copy=False) >> (8 - CUBE_BITS)).astype(np.intp)
+    return cube(colors)[top[..., 0], top[..., 1], top[..., 2]]
+
+
+@functools.lru_cache(maxsize=4096)
+def _packed_index(packed, colors):
+    shift = 8 - CUBE_BITS
+    r, g, b = packed >> 16, packed >> 8 & 0xFF, packed & 0xFF
+    return int(cube(colors)[r >> shift, g >> shift, b >> shift])
+
+
+def color_index(color, colors=256):
+    "the nearest palette index to a Color (or packed 0xRRGGBB int)"
+    if isinstance(color, Color):
+        color = color.to_int()
+    return _packed_index(color, colors)
+
+
+def sgr(index, colors=256, background=False):
+    "the SGR parameters (the part between ESC[ and m) selecting palette index"
+    if colors == 256:
+        return f"{48 if background else 38};5;{index}"
+    base = 40 if background else 30
+    return str(base + index if index < 8 else base + 60 + index - 8)
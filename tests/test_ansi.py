@@ -0,0 +1,119 @@
+import io
+import os
+
+import pytest
+
+from rgbw_colorspace_converter.colors.converters import RGB
+from rgbw_colorspace_converter.tools import ansi
+from rgbw_colorspace_converter.tools.ansi import RESET, AnsiPrinter, colorize
+
+
+@pytest.fixture(autouse=True)
+def truecolor(monkeypatch):
+    monkeypatch.setenv("COLORTERM", "truecolor")
+
+
+def _rows(out):
+    "the text of each printed row, escapes stripped"
+    rows = []
+    for line in out.getvalue().split("\n")[:-1]:
+        assert line.endswith(RESET)
+        rows.append(line[: -len(RESET)].split("m")[-1])
+    return rows
+
+
+def test_colorize():
+    s = colorize("hi", RGB(255, 128, 0), RGB(0, 0, 7))
+    assert s == "\x1b[38;2;255;128;0m\x1b[48;2;0;0;7mhi\x1b[0m"
+
+
+def test_escape_cached_per_pair():
+    ansi._fg_bg.cache_clear()
+    for _ in range(3):
+        colorize("x", RGB(1, 2, 3), RGB(4, 5, 6))
+    info = ansi._fg_bg.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
+def test_bars_and_color_codes():
+    out = io.StringIO()
+    p = AnsiPrinter(out)
+    red = RGB(255, 0, 0)
+    assert p.print_colors(
+        red, print_chars="ab", col_width=6, check_term_size=False, print_bars=True
+    ) == (0, 6)
+    p.print_colors(red, col_width=6, check_term_size=False, print_color_codes=True)
+    first, second = out.getvalue().split("\n")[:2]
+    assert first.startswith(ansi.fg_bg(red, red))
+    assert str(red) in second
+    assert _rows(out)[0] == " ababab "
+
+
+def test_cycle_chars_and_zigzag_keep_state_off_environ():
+    before = dict(os.environ)
+    out = io.StringIO()
+    p = AnsiPrinter(out)
+    kwargs = dict(
+        print_chars="abc",
+        col_width=3,
+        check_term_size=False,
+        cycle_chars=True,
+        zigzag=True,
+        zag_max=2,
+    )
+    p.print_colors(RGB(0, 255, 0), n_row=-1, **kwargs)
+    for n in range(1, 6):
+        p.print_colors(RGB(0, 255, 0), n_row=n, **kwargs)
+    # rotates right, then left once the zigzag counter passes zag_max
+    assert _rows(out) == [" abc ", " cab ", " bca ", " cab ", " abc ", " bca "]
+    assert os.environ == before
+
+
+def test_random_block_len_and_no_newlines():
+    out = io.StringIO()
+    p = AnsiPrinter(out)
+    for _ in range(20):
+        p.print_colors(
+            RGB(0, 0, 255), col_width=10, check_term_size=False, random_block_len=True
+        )
+    lengths = {len(r) - 2 for r in _rows(out)}
+    assert len(lengths) > 1 and max(lengths) <= 18
+
+    out = io.StringIO()
+    AnsiPrinter(out).print_colors(
+        RGB(0, 0, 255), col_width=4, check_term_size=False, no_newlines=True
+    )
+    assert "\n" not in out.getvalue()
+
+
+def test_capture_file(tmp_path):
+    path = str(tmp_path / "session.asc")
+    out = io.StringIO()
+    p = AnsiPrinter(out)
+    for v in (10, 20):
+        p.print_colors(
+            RGB(v, v, v), ansi_bat_f=path, col_width=4, check_term_size=False
+        )
+    p.close()
+    with open(path) as fh:
+        assert fh.read() == out.getvalue()
+
+
+def test_closed_stream_reports_failure():
+    out = io.StringIO()
+    out.close()
+    rc, _ = AnsiPrinter(out).print_colors(RGB(1, 1, 1), check_term_size=False)
+    assert rc != 0
+
+
+def test_palette_fallback_without_truecolor(monkeypatch):
+    monkeypatch.delenv("COLORTERM")
+    monkeypatch.setenv("TERM", "xterm-256color")
+    assert (
+        colorize("x", RGB(255, 0, 0), RGB(0, 0, 0))
+        == "\x1b[38;5;196m\x1b[48;5;16mx" + RESET
+    )
+    assert ansi.fg_bg(RGB(255, 0, 0), RGB(0, 0, 0), colors=16) == "\x1b[91m\x1b[40m"
+    out = io.StringIO()
+    AnsiPrinter(out, colors=256).write_row("y", RGB(0, 0, 255), RGB(255, 255, 255))
+    assert out.getvalue() == "\x1b[38;5;21m\x1b[48;5;231my" + RESET + "\n"
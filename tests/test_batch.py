@@ -0,0 +1,86 @@
+import random
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors import converters
+
+# every 5th level per channel, plus the extremes, is enough to hit all the
+# hue sectors and the grey / black special cases
+LEVELS = sorted(set(range(0, 256, 5)) | {1, 254, 255})
+RGB_GRID = np.array([(r, g, b) for r in LEVELS for g in LEVELS for b in LEVELS])
+
+
+def random_rows(n, ranges, seed=7):
+    rnd = random.Random(seed)
+    return np.array([[rnd.uniform(lo, hi) for (lo, hi) in ranges] for _ in range(n)])
+
+
+def test_rgb_to_hsv_hsi_match_scalar():
+    hsv = batch.rgb_to_hsv(RGB_GRID)
+    hsi = batch.rgb_to_hsi(RGB_GRID)
+    for i, rgb in enumerate(RGB_GRID.tolist()):
+        assert tuple(hsv[i]) == converters.rgb_to_hsv(rgb)
+        assert tuple(hsi[i]) == converters.rgb_to_hsi(*rgb)
+
+
+def test_hsv_to_rgb_matches_scalar():
+    hsv = np.concatenate(
+        [batch.rgb_to_hsv(RGB_GRID), random_rows(5000, [(0.0, 1.0)] * 3)]
+    )
+    rgb = batch.hsv_to_rgb(hsv)
+    assert rgb.dtype == np.uint8
+    for i, t in enumerate(hsv.tolist()):
+        assert tuple(rgb[i]) == converters.hsv_to_rgb(tuple(t))
+
+
+def test_hsi_to_rgb_and_rgbw_match_scalar():
+    hsi = np.concatenate(
+        [
+            batch.rgb_to_hsi(RGB_GRID),
+            random_rows(5000, [(-30.0, 400.0), (-0.1, 1.1), (-0.1, 1.1)]),
+        ]
+    )
+    rgb = batch.hsi_to_rgb(hsi)
+    rgbw = batch.hsi_to_rgbw(hsi)
+    assert rgbw.shape == (len(hsi), 4)
+    for i, t in enumerate(hsi.tolist()):
+        assert tuple(rgb[i]) == converters.hsi_to_rgb(*t)
+        assert tuple(rgbw[i]) == converters.hsi_to_rgbw(*t)
+
+
+def test_hsv_hsl_match_scalar():
+    rows = random_rows(5000, [(0.0, 360.0), (0.0, 1.0), (0.0, 1.0)])
+    rows[:3] = [[10.0, 0.0, 0.0], [20.0, 1.0, 1.0], [30.0, 0.0, 1.0]]
+    hsl = batch.hsv_to_hsl(rows)
+    hsv = batch.hsl_to_hsv(rows)
+    for i, t in enumerate(rows.tolist()):
+        assert tuple(hsl[i]) == converters.hsv_to_hsl(*t)
+        assert tuple(hsv[i]) == converters.hsl_to_hsv(*t)
+
+
+def test_leading_shape_is_kept():
+    image = RGB_GRID[:12].reshape(3, 4, 3)
+    assert batch.hsi_to_rgbw(batch.rgb_to_hsi(image)).shape == (3, 4, 4)
+
+
+def test_validation_reports_bad_rows():
+    hsv = [[0.1, 0.2, 0.3], [1.5, 0.2, 0.3], [0.1, 0.2, 0.3], [0.1, -0.2, 0.3]]
+    mask = batch.is_hsv_array(hsv)
+    assert batch.bad_rows(mask).tolist() == [1, 3]
+    assert batch.bad_rows(batch.is_rgb_array([[0, 0, 0], [0, 256, 0]])).tolist() == [1]
+    assert batch.is_rgbw_array([[0, 0, 0, 255], [0, 0, 0, -1]]).tolist() == [
+        True,
+        False,
+    ]
+    assert batch.is_hsi_hsl_array([[361, 0.5, 0.5], [360, 0.5, 0.5]]).tolist() == [
+        False,
+        True,
+    ]
+
+    try:
+        batch.hsv_to_rgb(hsv)
+    except AssertionError as e:
+        assert "[1 3]" in str(e)
+    else:
+        raise AssertionError("malformed hsv rows were not reported")
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import calibration
+from rgbw_colorspace_converter.colors.calibration import (
+    FixtureProfile,
+    apply_calibration,
+    compile_profile,
+)
+
+FRAME = np.random.default_rng(8).integers(0, 256, (5000, 4)).astype(np.uint8)
+
+
+def test_identity_profile_passes_through():
+    cal = compile_profile(FixtureProfile("ideal"), use_cache=False)
+    assert (apply_calibration(FRAME, cal) == FRAME).all()
+
+
+def test_gamma_gain_and_tint_tables():
+    profile = FixtureProfile(
+        "warm",
+        gamma=(2.2, 2.2, 2.2, 1.8),
+        gain=(1.0, 0.9, 1.0, 0.5),
+        white_tint=(1.0, 0.8, 0.5),
+    )
+    cal = compile_profile(profile, use_cache=False)
+    x = np.arange(256) / 255.0
+    assert (cal.tables[0] == np.floor(255 * x**2.2 + 0.5)).all()
+    assert (cal.tables[1] == np.floor(255 * 0.9 * x**2.2 + 0.5)).all()
+    assert cal.tables[3][255] == 128
+    assert cal.tint[0].max() == 0
+    assert cal.tint[1][255] == 51 and cal.tint[2][255] == 128
+
+    out = cal(FRAME)
+    r, g, b, w = (FRAME[:, c].astype(int) for c in range(4))
+    assert (out[:, 0] == cal.tables[0][r]).all()
+    assert (out[:, 2] == cal.tables[2][np.minimum(b + cal.tint[2][w], 255)]).all()
+    assert (out[:, 3] == cal.tables[3][w]).all()
+
+
+def test_numpy_scalar_values():
+    profile = FixtureProfile(
+        "np", gamma=np.float64(2.2), gain=np.uint8(1), white_tint=np.float32(0.5)
+    )
+    assert profile.gamma == (2.2,) * 4 and profile.gain == (1.0,) * 4
+    assert profile.white_tint == (0.5,) * 3
+    assert profile.digest() == FixtureProfile("np", 2.2, 1, 0.5).digest()
+
+
+def test_mixed_fixtures_in_one_pass():
+    cals = [
+        compile_profile(FixtureProfile("a", gamma=2.0), use_cache=False),
+        compile_profile(
+            FixtureProfile("b", white_tint=(1.0, 0.9, 0.7)), use_cache=False
+        ),
+    ]
+    fixtures = np.arange(len(FRAME)) % 2
+    out = np.empty_like(FRAME)
+    assert apply_calibration(FRAME, cals, fixtures=fixtures, out=out) is out
+    for i, cal in enumerate(cals):
+        assert (out[fixtures == i] == cal(FRAME[fixtures == i])).all()
+
+
+def test_compiled_profiles_cached_on_disk(tmp_path):
+    profile = FixtureProfile("cached", gamma=2.4, gain=0.8)
+    cal = compile_profile(profile, cache_dir=str(tmp_path))
+    path = os.path.join(str(tmp_path), "calibration", profile.digest() + ".npz")
+    assert os.path.exists(path)
+    assert compile_profile(profile, cache_dir=str(tmp_path)) is cal
+
+    calibration._compiled.clear()
+    again = compile_profile(profile, cache_dir=str(tmp_path))
+    assert again is not cal and (again.tables == cal.tables).all()
+
+    # the key is what goes into the tables, not what the fixture is called
+    renamed = FixtureProfile.from_dict(dict(profile.to_dict(), name="other"))
+    assert renamed.digest() == profile.digest()
+    assert FixtureProfile("x", gamma=2.5).digest() != profile.digest()
@@ -0,0 +1,129 @@
+import io
+import re
+
+import numpy as np
+import pytest
+
+from rgbw_colorspace_converter.tools.canvas import UPPER_HALF, TerminalCanvas
+
+
+@pytest.fixture(autouse=True)
+def truecolor(monkeypatch):
+    monkeypatch.setenv("COLORTERM", "truecolor")
+
+
+_ESCAPE = re.compile(r"\x1b\[([0-9;?]*)([A-Za-z])")
+
+
+class Screen:
+    "just enough of a terminal to replay the canvas output: cursor, colors, cells"
+
+    def __init__(self):
+        self.cells = {}
+        self.row = self.col = 1
+        self.fg = self.bg = None
+
+    def feed(self, s):
+        pos = 0
+        for m in _ESCAPE.finditer(s):
+            self._text(s[pos : m.start()])
+            args, cmd = m.group(1), m.group(2)
+            if cmd == "H":
+                self.row, self.col = (int(x) for x in args.split(";"))
+            elif cmd == "m" and args.startswith("38;2;"):
+                self.fg = tuple(int(x) for x in args.split(";")[2:])
+            elif cmd == "m" and args.startswith("48;2;"):
+                self.bg = tuple(int(x) for x in args.split(";")[2:])
+            pos = m.end()
+        self._text(s[pos:])
+
+    def _text(self, text):
+        for ch in text:
+            assert ch == UPPER_HALF
+            self.cells[(self.row, self.col)] = (self.fg, self.bg)
+            self.col += 1
+
+    def pixels(self, height, width):
+        out = np.zeros((height + height % 2, width, 3), dtype=np.uint8)
+        for (r, c), (fg, bg) in self.cells.items():
+            out[2 * (r - 1), c - 1] = fg
+            out[2 * (r - 1) + 1, c - 1] = bg
+        return out[:height]
+
+
+def _frame(h, w, seed):
+    return np.random.default_rng(seed).integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+
+def test_full_then_differential_redraw():
+    out = io.StringIO()
+    canvas = TerminalCanvas(7, 5, stream=out)
+    screen = Screen()
+    first = _frame(5, 7, 1)
+    assert canvas.draw(first) == 3 * 7
+    screen.feed(out.getvalue())
+    np.testing.assert_array_equal(screen.pixels(5, 7), first)
+
+    second = first.copy()
+    second[0, 2] = (1, 2, 3)
+    second[4, 6] = (9, 9, 9)  # the padded last row
+    out.seek(0)
+    out.truncate()
+    assert canvas.draw(second) == 2
+    written = out.getvalue()
+    assert written.count(UPPER_HALF) == 2
+    screen.feed(written)
+    np.testing.assert_array_equal(screen.pixels(5, 7), second)
+
+    out.seek(0)
+    out.truncate()
+    assert canvas.draw(second) == 0
+    assert out.getvalue() == ""
+
+
+def test_one_write_per_frame_and_no_redundant_escapes():
+    writes = []
+
+    class Stream:
+        def write(self, s):
+            writes.append(s)
+
+        def flush(self):
+            pass
+
+    canvas = TerminalCanvas(40, 20, stream=Stream())
+    frame = np.zeros((20, 40, 3), dtype=np.uint8)
+    frame[:, :, 0] = 200
+    canvas.draw(frame)
+    assert len(writes) == 1
+    # a flat frame: one cursor move, one pair of colors, then just half blocks
+    # (plus a move at the start of each row)
+    s = writes[0]
+    assert s.count("38;2;") == 1 and s.count("48;2;") == 1
+    assert s.count("H") == 10
+
+
+def test_origin_and_invalidate():
+    out = io.StringIO()
+    canvas = TerminalCanvas(2, 2, stream=out, origin=(5, 10))
+    frame = _frame(2, 2, 3)
+    canvas.draw(frame)
+    assert out.getvalue().startswith("\x1b[5;10H")
+    canvas.invalidate()
+    assert canvas.draw(frame) == 2
+    assert canvas.frames == 2 and canvas.cells_drawn == 4
+
+
+def test_indexed_colors_skip_changes_the_terminal_cannot_show():
+    out = io.StringIO()
+    canvas = TerminalCanvas(3, 2, stream=out, colors=256)
+    frame = np.zeros((2, 3, 3), dtype=np.uint8)
+    frame[0] = (255, 0, 0)
+    assert canvas.draw(frame) == 3
+    assert "\x1b[38;5;196m\x1b[48;5;16m" in out.getvalue()
+    assert "38;2;" not in out.getvalue()
+    # both still the nearest xterm red
+    frame[0, 1] = (250, 3, 2)
+    assert canvas.draw(frame) == 0
+    frame[0, 1] = (0, 0, 255)
+    assert canvas.draw(frame) == 1
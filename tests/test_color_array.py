@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from rgbw_colorspace_converter.colors.color_array import ColorArray
+from rgbw_colorspace_converter.colors.converters import HSV, RGB
+
+
+@pytest.fixture
+def colors():
+    return [RGB(176, 205, 230), RGB(69, 13, 152), RGB(234, 56, 137), HSV(0.5, 1, 1)]
+
+
+def test_properties_match_color(colors):
+    frame = ColorArray.from_colors(colors)
+    assert len(frame) == 4
+    for i, c in enumerate(colors):
+        assert tuple(frame.rgb[i]) == c.rgb
+        assert tuple(frame.rgbw[i]) == c.rgbw
+        assert tuple(frame.hsi[i]) == c.hsi
+        assert tuple(frame.hsl[i]) == pytest.approx(c.hsl)
+        assert frame.hex[i] == c.hex
+        assert frame.hsv_h[i] == c.hsv_h
+        assert frame.rgb_g[i] == c.rgb_g
+
+
+def test_empty_frame():
+    frame = ColorArray.from_colors([])
+    assert len(frame) == 0 and frame.hsv.shape == (0, 3)
+    assert frame.rgb.shape == (0, 3) and frame.rgbw.shape == (0, 4)
+    assert frame.hex.shape == (0,) and frame.to_colors() == []
+
+
+def test_round_trip_to_colors(colors):
+    frame = ColorArray.from_colors(colors)
+    assert [c.hsv for c in frame.to_colors()] == [c.hsv for c in colors]
+    assert frame[1].rgbw == colors[1].rgbw
+    from_rgb = ColorArray.from_rgb([(176, 205, 230), (69, 13, 152), (234, 56, 137)])
+    assert (from_rgb.hsv == frame[:3].hsv).all()
+
+
+def test_setters_match_color(colors):
+    frame = ColorArray.from_colors(colors)
+    frame.hsv_v = frame.hsv_v * 0.5
+    frame.rgb_r = 10
+    for c in colors:
+        c.hsv_v = c.hsv_v * 0.5
+        c.rgb_r = 10
+    assert [tuple(t) for t in frame.rgbw] == [c.rgbw for c in colors]
+
+    frame.hsv_s = 2.0
+    assert (frame.hsv_s == 1.0).all()
+
+
+def test_slices_are_views(colors):
+    frame = ColorArray.from_colors(colors)
+    tail = frame[2:]
+    tail.hsv_v = 0.0
+    assert frame.rgb[2:].sum() == 0
+    assert frame.rgb[:2].sum() > 0
+
+    frame[0] = RGB(0, 0, 255)
+    assert tuple(frame.rgb[0]) == (0, 0, 255)
+    with pytest.raises(AssertionError):
+        frame[1] = (2.0, 0.0, 0.0)
+
+
+def test_buffer_is_shared_without_copy(colors):
+    frame = ColorArray.from_colors(colors)
+    view = np.asarray(frame)
+    assert view.shape == (4, 3)
+    view[0, 2] = 0.0
+    assert frame.rgb_r[0] == 0
+    assert frame.data.nbytes == 4 * 3 * 8
+    assert bytes(frame.data) == frame.hsv.tobytes()
+
+
+def test_bad_rows_are_reported():
+    with pytest.raises(AssertionError, match=r"\[1\]"):
+        ColorArray([[0.1, 0.1, 0.1], [0.1, 1.1, 0.1]])
@@ -0,0 +1,55 @@
+import pytest
+
+from rgbw_colorspace_converter.colors.converters import HSV, RGB
+
+
+def test_color_is_slotted():
+    c = RGB(176, 205, 230)
+    assert not hasattr(c, "__dict__")
+    with pytest.raises(AttributeError):
+        c.not_a_color_space = 1
+
+
+def test_derived_values_are_cached_until_a_setter_changes_state():
+    c = HSV(0.25, 0.5, 0.75)
+    rgbw = c.rgbw
+    assert c.rgbw is rgbw
+    assert c.hex is c.hex
+
+    # setting the same value again keeps the cache
+    c.hsv_h = 0.25
+    c.hsv_s = c.hsv_s
+    assert c.rgbw is rgbw
+    assert c.rgbw is rgbw
+
+    c.rgb_r = 69
+    assert c.rgb[0] == 69
+    assert c.rgbw is not rgbw
+    assert c.rgbw == RGB(*c.rgb).rgbw
+
+    rgbw = c.rgbw
+    c.rgb_g = c.rgb_g
+    assert c.rgbw is rgbw
+
+    c.hsv_v = 0.0
+    assert c.rgb == (0, 0, 0)
+    assert c.rgbw == (0, 0, 0, 0)
+    assert c.hex == "#000000"
+
+
+def test_copy_is_independent():
+    red = RGB(255, 0, 0)
+    red.rgbw
+    purple = red.copy()
+    purple.rgb_b = 255
+    assert red.rgb == (255, 0, 0)
+    assert purple.rgb == (255, 0, 255)
+    assert purple.hex == "#ff00ff"
+    assert red.hex == "#ff0000"
+
+
+def test_repr_matches_properties():
+    c = HSV(0.3, 0.5, 0.7)
+    assert repr(c) == (
+        f"rgb={c.rgb} rgbw={c.rgbw} hsv={c.hsv} hsl={c.hsl} hsi={c.hsi} hex={c.hex}"
+    )
@@ -0,0 +1,44 @@
+import numpy as np
+
+from rgbw_colorspace_converter.colors.converters import HSV, RGB
+from rgbw_colorspace_converter.colors.util import morph
+from rgbw_colorspace_converter.colors.util.morph import (
+    color_ramp,
+    color_transition,
+    ramp_cache_clear,
+    ramp_cache_info,
+)
+
+
+def test_ramp_matches_color_transition():
+    for start, end, steps in (
+        (RGB(255, 0, 0), RGB(0, 255, 0), 25),
+        (HSV(0.9, 1.0, 0.5), HSV(0.1, 0.2, 1.0), 7),  # shortest way wraps past 0
+        (RGB(10, 20, 30), RGB(10, 20, 30), 5),
+    ):
+        colors = list(color_transition(start, end, steps))
+        hsv = color_ramp(start, end, steps, space="hsv")
+        rgbw = color_ramp(start, end, steps)
+        assert hsv.shape == (steps + 1, 3) and rgbw.shape == (steps + 1, 4)
+        assert rgbw.dtype == np.uint8
+        np.testing.assert_allclose(hsv[: len(colors)], [c.hsv for c in colors])
+        np.testing.assert_array_equal(rgbw[: len(colors)], [c.rgbw for c in colors])
+        np.testing.assert_allclose(hsv[-1], HSV(*end.hsv).hsv, atol=1e-12)
+
+
+def test_wrapping_hue_stays_in_range():
+    hsv = color_ramp(HSV(0.95, 1, 1), HSV(0.05, 1, 1), 10, space="hsv")
+    assert (hsv[:, 0] >= 0).all() and (hsv[:, 0] < 1).all()
+    np.testing.assert_allclose(hsv[5, 0], 0.0, atol=1e-12)
+
+
+def test_cache_hits_and_shared_read_only_result():
+    ramp_cache_clear()
+    a = color_ramp(RGB(255, 255, 0), RGB(0, 0, 255), 30)
+    b = color_ramp(RGB(255, 255, 0), RGB(0, 0, 255), 30)
+    color_ramp(RGB(255, 255, 0), RGB(0, 0, 255), 31)
+    color_ramp(RGB(255, 255, 0), RGB(0, 0, 255), 30, space="hsv")
+    assert a is b and not a.flags.writeable
+    info = ramp_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 3, 3)
+    assert info.maxsize == morph.RAMP_CACHE_SIZE
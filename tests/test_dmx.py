@@ -0,0 +1,115 @@
+import numpy as np
+
+from rgbw_colorspace_converter.output.dmx import (
+    ArtNetPacketizer,
+    PatchMap,
+    SACNPacketizer,
+)
+
+CID = bytes(range(16))
+
+# E1.31 data packet for universe 1, sequence 1, one pixel rgbw (1, 2, 3, 4),
+# written out field by field from the spec
+SACN_GOLDEN = bytes.fromhex(
+    "0010"
+    "0000"
+    "4153432d45312e3137000000"  # preamble, postamble, ACN id
+    "7072"
+    "00000004" + CID.hex() + "705c"  # root flags/length (130 - 16), vector, cid
+    "00000002"  # framing flags/length (130 - 38), vector
+    + "74657374".ljust(128, "0")  # source name "test", 64 bytes
+    + "64"
+    "0000"
+    "01"
+    "00"
+    "0001"  # priority, sync, sequence, options, universe
+    "700f"
+    "02"
+    "a1"
+    "0000"
+    "0001"
+    "0005"  # dmp flags/length (130 - 115) ... count
+    "00"
+    "01020304"  # start code, slots
+)
+
+# ArtDmx for port address 0x0102, sequence 1, the same pixel
+ARTNET_GOLDEN = bytes.fromhex(
+    "4172742d4e657400"
+    "0050"
+    "000e"  # id, OpDmx (little endian), version 14
+    "01"
+    "00"
+    "02"
+    "01"
+    "0004"  # sequence, physical, SubUni, Net, length
+    "01020304"
+)
+
+
+def test_sacn_golden_packet():
+    sacn = SACNPacketizer(PatchMap.linear(1), source_name="test", cid=CID)
+    [(universe, packet)] = sacn.fill(np.array([[1, 2, 3, 4]], np.uint8))
+    assert universe == 1
+    assert bytes(packet) == SACN_GOLDEN
+
+
+def test_artnet_golden_packet_and_padding():
+    artnet = ArtNetPacketizer(PatchMap.linear(1, start_universe=0x0102))
+    [(universe, packet)] = artnet.fill(np.array([[1, 2, 3, 4]], np.uint8))
+    assert universe == 0x0102
+    assert bytes(packet) == ARTNET_GOLDEN
+
+    # odd payloads are padded to even, with the length saying so
+    odd = ArtNetPacketizer(PatchMap.linear(1, start_universe=0, order="RGB"))
+    [(_, packet)] = odd.fill(np.array([[9, 8, 7, 6]], np.uint8))
+    assert bytes(packet[16:]) == b"\x00\x04\x09\x08\x07\x00"
+
+
+def test_linear_patch_never_splits_a_pixel():
+    patch = PatchMap.linear(300, start_universe=5, start_slot=500)
+    # 3 pixels fit nowhere in slots 500-511 for 4 channels each: 3 * 4 = 12
+    assert list(patch.universes) == [5, 6, 7, 8]
+    for u in patch.universes:
+        slots = patch.slot[patch.universe == u]
+        assert slots.max() < 512 and len(slots) % 4 == 0
+    assert patch.pixels == 300
+    assert len(PatchMap.linear(1000, pixels_per_universe=100).universes) == 10
+
+    try:
+        PatchMap.from_runs([(0, 129, 1, 0)])
+    except AssertionError:
+        pass
+    else:
+        raise AssertionError("a run spilling out of its universe was accepted")
+
+
+def test_fill_matches_patch_and_only_updates_payload_and_sequence():
+    frame = np.random.default_rng(6).integers(0, 256, (1000, 4)).astype(np.uint8)
+    runs = PatchMap.from_runs([(0, 100, 1, 0), (100, 100, 3, 12)], order="GRBW")
+    assert list(runs.universes) == [1, 3] and runs.pixels == 200
+    patch = PatchMap.linear(1000, start_universe=10, order="WRGB")
+    sacn = SACNPacketizer(patch, cid=CID)
+    packets = sacn.fill(frame)
+    before = bytes(sacn.buffer)
+
+    for universe, packet in packets:
+        sel = patch.universe == universe
+        data = np.frombuffer(packet, np.uint8)[126:]
+        assert (
+            data[patch.slot[sel]] == frame[patch.pixel[sel], patch.channel[sel]]
+        ).all()
+        assert packet[111] == 1
+
+    again = sacn.fill(frame)
+    after = np.frombuffer(sacn.buffer, np.uint8)
+    changed = np.flatnonzero(after != np.frombuffer(before, np.uint8))
+    assert set(changed) == set(sacn.offsets + 111)
+    assert [p.obj for _, p in again] == [p.obj for _, p in packets]
+
+    artnet = ArtNetPacketizer(patch)
+    for _ in range(255):
+        artnet.fill(frame)
+    assert artnet.packets[0][1][12] == 255
+    artnet.fill(frame)
+    assert artnet.packets[0][1][12] == 1
@@ -0,0 +1,67 @@
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch, fixed
+
+
+def test_rgb_within_one_lsb_of_float_for_every_8bit_rgb():
+    chunk = 1 << 20
+    for start in range(0, 1 << 24, chunk):
+        rgb = batch.unpack_rgb(np.arange(start, start + chunk))
+        diff = fixed.rgb_to_rgbw(rgb).astype(np.int16) - batch.rgb_to_rgbw(rgb)
+        assert np.abs(diff).max() <= 1
+        # w is the exact rgb minimum, the float path only ever lands under it
+        assert diff[:, 3].min() >= 0
+
+
+def test_hsv_to_rgb_matches_float_exactly():
+    hsv = np.random.default_rng(23).random((1000000, 3))
+    hsv[:500, 1] = 0.0
+    hsv[500:1000] = np.round(hsv[500:1000] * 6) / 6
+    q15 = fixed.to_q15(hsv)
+    assert q15.dtype == np.uint16
+    # every Q15 corner and sector edge too
+    edges = np.array([0, 1, fixed.HSV_ONE // 6, fixed.HSV_ONE - 1, fixed.HSV_ONE])
+    grid = np.stack(np.meshgrid(edges, edges, edges), axis=-1).reshape(-1, 3)
+    q15 = np.concatenate([q15, grid.astype(np.uint16)])
+    # the same colors as floats, so this is the Q15 input bound; float input
+    # is rounded first, see the next test
+    hsv = q15 / fixed.HSV_ONE
+
+    rgb = fixed.hsv_to_rgb(q15)
+    assert (rgb == batch.hsv_to_rgb(hsv)).all()
+    # so given the same rgb, hsv -> rgbw is within 1 like rgb -> rgbw above
+    rgbw = fixed.hsv_to_rgbw(q15)
+    assert (rgbw == fixed.rgb_to_rgbw(rgb)).all()
+    diff = rgbw.astype(np.int16) - batch.hsv_to_rgbw(hsv)
+    assert np.abs(diff).max() <= 1
+
+
+def test_float_hsv_within_three_lsb_of_float():
+    # rounding float hsv to Q15 moves it, which the float path doesn't do
+    rgb = np.random.default_rng(29).integers(0, 256, (1000000, 3))
+    rgb[:3] = [(1, 6, 142), (176, 205, 230), (255, 128, 0)]
+    hsv = batch.rgb_to_hsv(rgb)
+    diff = batch.hsv_to_rgbw(hsv, engine="fixed").astype(np.int16)
+    diff -= batch.hsv_to_rgbw(hsv)
+    assert np.abs(diff).max() <= 3
+    assert np.abs(diff[:3]).max(axis=-1).tolist() == [3, 1, 1]
+
+
+def test_engine_selection():
+    rgb = np.random.default_rng(5).integers(0, 256, (1000, 3)).astype(np.uint8)
+    assert (batch.rgb_to_rgbw(rgb, engine="fixed") == fixed.rgb_to_rgbw(rgb)).all()
+    hsv = batch.rgb_to_hsv(rgb)
+    out = np.zeros((1000, 4), dtype=np.uint8)
+    assert batch.hsv_to_rgbw(hsv, out=out, engine="fixed") is out
+    q15 = fixed.to_q15(hsv)
+    assert (out == fixed.hsv_to_rgbw(q15)).all()
+    # integer hsv is already Q15
+    assert (batch.hsv_to_rgbw(q15, engine="fixed") == out).all()
+    assert (batch.hsv_to_rgbw(q15.astype(np.int32), engine="fixed") == out).all()
+    assert fixed.rgb_to_rgbw([255, 0, 0]).tolist() == [254, 0, 0, 0]
+    try:
+        batch.rgb_to_rgbw(rgb, engine="double")
+    except AssertionError:
+        pass
+    else:
+        raise AssertionError("unknown engine was accepted")
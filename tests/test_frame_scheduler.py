@@ -0,0 +1,117 @@
+import time
+
+from rgbw_colorspace_converter.tools.frame_scheduler import (
+    CATCHUP,
+    FrameScheduler,
+)
+
+
+class FakeClock:
+    "a clock that only moves when slept on, or when a frame 'renders' slowly"
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, s):
+        self.slept.append(s)
+        self.now += s
+
+
+def _scheduler(fps=10, **kwargs):
+    clock = FakeClock()
+    return FrameScheduler(fps, clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_fixed_timestep_no_drift():
+    sched, clock = _scheduler()
+    seen = []
+
+    def render(frame, t):
+        seen.append((frame, round(t, 6), round(clock.now - 100.0, 6)))
+        clock.now += 0.03  # render work, less than the 0.1 period
+
+    stats = sched.run(render, frames=5)
+    assert seen == [(i, i / 10, i / 10) for i in range(5)]
+    assert (stats.frames, stats.late, stats.dropped) == (5, 0, 0)
+
+
+def test_skip_policy_drops_missed_frames():
+    sched, clock = _scheduler()
+    frames = []
+
+    def render(frame, t):
+        frames.append(frame)
+        if frame == 2:
+            clock.now += 0.35  # a slow frame, 3 periods lost
+
+    stats = sched.run(render, frames=5)
+    assert frames == [0, 1, 2, 5, 6]
+    assert stats.dropped == 2
+    assert stats.late == 1  # frame 5 starts 0.05 after its deadline
+
+
+def test_catchup_policy_renders_missed_frames():
+    sched, clock = _scheduler(policy=CATCHUP)
+    frames = []
+
+    def render(frame, t):
+        frames.append((frame, round(clock.now - 100.0, 6)))
+        if frame == 2:
+            clock.now += 0.35
+
+    stats = sched.run(render, frames=6)
+    # 3, 4 and 5 back to back at 0.55, then 6 on time
+    assert frames == [(0, 0.0), (1, 0.1), (2, 0.2), (3, 0.55), (4, 0.55), (5, 0.55)]
+    assert stats.dropped == 0
+    assert stats.late == 3
+
+
+def test_catchup_is_bounded():
+    sched, clock = _scheduler(policy=CATCHUP, max_catchup=2)
+    frames = []
+
+    def render(frame, t):
+        frames.append(frame)
+        if frame == 0:
+            clock.now += 1.0
+
+    stats = sched.run(render, frames=4)
+    assert frames == [0, 1, 2, 10]
+    assert stats.dropped == 7
+
+
+def test_stop_on_false_and_duration():
+    sched, _ = _scheduler()
+    stats = sched.run(lambda frame, t: frame < 3)
+    assert stats.frames == 3
+
+    sched, _ = _scheduler()
+    stats = sched.run(lambda frame, t: None, duration=1.0)
+    assert stats.frames == 10
+    assert abs(stats.elapsed - 0.9) < 1e-9
+
+
+def test_play_generator():
+    sched, _ = _scheduler()
+    drawn = []
+
+    def frames():
+        for i in range(4):
+            drawn.append(i)
+            yield
+
+    stats = sched.play(frames())
+    assert drawn == [0, 1, 2, 3]
+    assert stats.frames == 4
+
+
+def test_real_clock():
+    sched = FrameScheduler(fps=100)
+    t0 = time.monotonic()
+    stats = sched.run(lambda frame, t: None, frames=10)
+    assert stats.frames == 10
+    assert time.monotonic() - t0 >= 0.09
@@ -0,0 +1,38 @@
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors.converters import (
+    HSV,
+    hsi_to_rgbw,
+    hsv_to_rgb,
+    hsv_to_rgbw,
+    rgb_to_hsi,
+)
+
+
+def chained(hsv):
+    r, g, b = hsv_to_rgb(hsv)
+    return hsi_to_rgbw(*rgb_to_hsi(r, g, b))
+
+
+def test_scalar_fused_matches_chain():
+    levels = list(range(0, 256, 3)) + [1, 254, 255]
+    rgb = np.array([(r, g, b) for r in levels for g in levels for b in levels])
+    hsv = batch.rgb_to_hsv(rgb).tolist()
+    rnd = np.random.default_rng(11).random((20000, 3)).tolist()
+    for t in hsv + rnd + [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0], [1.0, 0.0, 0.5]]:
+        assert hsv_to_rgbw(*t) == chained(tuple(t)), t
+
+
+def test_batch_fused_matches_chain_for_every_8bit_rgb():
+    chunk = 1 << 20
+    out = np.empty((chunk, 4), dtype=np.uint8)
+    for start in range(0, 1 << 24, chunk):
+        hsv = batch.rgb_to_hsv(batch.unpack_rgb(np.arange(start, start + chunk)))
+        fused = batch.hsv_to_rgbw(hsv, out=out)
+        assert (fused == batch.rgb_to_rgbw(batch.hsv_to_rgb(hsv))).all()
+
+
+def test_color_rgbw_uses_fused_path():
+    c = HSV(0.7, 0.4, 0.9)
+    assert c.rgbw == chained(c.hsv)
@@ -0,0 +1,73 @@
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors.converters import RGB, Hex, hex_to_rgb
+from rgbw_colorspace_converter.colors.hexcodec import HexError, format_hex, parse_hex
+
+
+def test_round_trip_every_form():
+    rgb = batch.unpack_rgb(np.random.default_rng(5).integers(0, 1 << 24, 20000))
+    text = format_hex(rgb)
+    assert (parse_hex(text) == rgb).all()
+    assert (parse_hex([t[1:].upper() for t in text]) == rgb).all()
+    assert (parse_hex(b"\n".join(format_hex(rgb, as_bytes=True))) == rgb).all()
+    assert (parse_hex(iter(text.tolist())) == rgb).all()
+    for i in range(0, len(rgb), 97):
+        c = RGB(*rgb[i].tolist())
+        assert format_hex([c.rgb])[0] == c.hex
+
+
+def test_short_form_and_mixed_input():
+    rgb = parse_hex(["#fff", "0a5", b"#0000ff", "#ABCDEF"])
+    assert rgb.tolist() == [[255, 255, 255], [0, 170, 85], [0, 0, 255], [171, 205, 239]]
+    assert parse_hex([]).shape == (0, 3)
+
+
+def test_bad_entries_reported_by_index():
+    values = ["#123456", "#12", "12345g", "##123456", "#1234567", "", "#é12", "#abc"]
+    rgb, ok = parse_hex(values, errors="mask")
+    assert ok.tolist() == [True, False, False, False, False, False, False, True]
+    assert rgb[1:7].sum() == 0
+    try:
+        parse_hex(values)
+    except HexError as e:
+        assert e.rows.tolist() == [1, 2, 3, 4, 5, 6]
+        assert isinstance(e, ValueError)
+    else:
+        raise AssertionError("bad hex entries were accepted")
+
+
+def test_scalar_hex_matches_codec():
+    for value in ["#b0cde6", "B0CDE6", "#fa0", "000"]:
+        assert hex_to_rgb(value) == tuple(parse_hex([value])[0].tolist())
+        assert Hex(value).rgb == RGB(*hex_to_rgb(value)).rgb
+    for value in ["#12", "# 12345", "0x1234", "+12345", "1_2345"]:
+        try:
+            hex_to_rgb(value)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{value!r} was accepted")
+
+
+def test_bytearray_and_memoryview_blobs():
+    blob = b"ff0000\n#00ff00 0000ff"
+    want = [[255, 0, 0], [0, 255, 0], [0, 0, 255]]
+    assert parse_hex(bytearray(blob)).tolist() == want
+    assert parse_hex(memoryview(blob)).tolist() == want
+    assert parse_hex([bytearray(b"#fa0"), memoryview(b"abc")]).tolist() == [
+        [255, 170, 0],
+        [170, 187, 204],
+    ]
+
+
+def test_non_text_entries_are_bad_rows():
+    rgb, ok = parse_hex([123456, "#123456", None, 0xFFF], errors="mask")
+    assert ok.tolist() == [False, True, False, False]
+    assert rgb[[0, 2, 3]].sum() == 0
+    try:
+        parse_hex([123456])
+    except HexError as e:
+        assert e.rows.tolist() == [0]
+    else:
+        raise AssertionError("an int was parsed as hex")
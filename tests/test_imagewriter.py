@@ -0,0 +1,165 @@
+import io
+import struct
+import zlib
+
+import numpy as np
+
+from rgbw_colorspace_converter.tools.imagewriter import (
+    GIFWriter,
+    PNGWriter,
+    write_gif,
+    write_png,
+)
+
+
+def _read_png(data):
+    "(width, height, rows) from a PNG, checking each chunk's crc"
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, idat, chunks = 8, b"", []
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        kind, body = data[pos + 4 : pos + 8], data[pos + 8 : pos + 8 + length]
+        (crc,) = struct.unpack(">I", data[pos + 8 + length : pos + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        chunks.append(kind)
+        if kind == b"IHDR":
+            width, height, depth, ctype = struct.unpack(">IIBB", body[:10])
+            assert (depth, ctype) == (8, 2)
+        elif kind == b"IDAT":
+            idat += body
+        pos += 12 + length
+    assert chunks[0] == b"IHDR" and chunks[-1] == b"IEND"
+    raw = np.frombuffer(zlib.decompress(idat), dtype=np.uint8)
+    raw = raw.reshape(height, width * 3 + 1)
+    rows = np.zeros((height, width * 3), dtype=np.uint8)
+    prev = np.zeros(width * 3, dtype=np.uint8)
+    for i, row in enumerate(raw):
+        assert row[0] in (0, 2)
+        prev = rows[i] = row[1:] + (prev if row[0] == 2 else 0)
+    return width, height, rows.reshape(height, width, 3)
+
+
+def _lzw_decode(data, min_code_size):
+    clear, eoi = 1 << min_code_size, (1 << min_code_size) + 1
+    bits = int.from_bytes(data, "little")
+    pos, size, out = 0, min_code_size + 1, []
+    table, prev = None, None
+    while True:
+        code = bits >> pos & ((1 << size) - 1)
+        pos += size
+        if code == clear:
+            table = [[i] for i in range(clear)] + [None, None]
+            size, prev = min_code_size + 1, None
+            continue
+        if code == eoi:
+            return out
+        if prev is None:
+            entry = table[code]
+        else:
+            entry = table[code] if code < len(table) else prev + prev[:1]
+            if len(table) < 4096:
+                table.append(prev + entry[:1])
+        out.extend(entry)
+        prev = entry
+        if len(table) >= 1 << size and size < 12:
+            size += 1
+
+
+def _read_gif(data):
+    "(width, height, [(delay, frame)]) from a GIF with local color tables"
+    assert data[:6] == b"GIF89a"
+    width, height, flags = struct.unpack("<HHB", data[6:11])
+    assert flags & 0x80 == 0
+    pos, frames, delay = 13, [], None
+    while data[pos] != 0x3B:
+        if data[pos] == 0x21:
+            label, pos = data[pos + 1], pos + 2
+            if label == 0xF9:
+                (delay,) = struct.unpack("<H", data[pos + 2 : pos + 4])
+            while data[pos]:
+                pos += data[pos] + 1
+            pos += 1
+            continue
+        assert data[pos] == 0x2C
+        x, y, w, h, flags = struct.unpack("<HHHHB", data[pos + 1 : pos + 10])
+        assert (x, y, w, h) == (0, 0, width, height) and flags & 0x80
+        n = 2 << (flags & 7)
+        pos += 10
+        palette = np.frombuffer(data[pos : pos + 3 * n], dtype=np.uint8).reshape(n, 3)
+        pos += 3 * n
+        min_code_size, pos = data[pos], pos + 1
+        lzw = b""
+        while data[pos]:
+            lzw += data[pos + 1 : pos + 1 + data[pos]]
+            pos += data[pos] + 1
+        pos += 1
+        indices = _lzw_decode(lzw, min_code_size)
+        assert len(indices) == width * height
+        frames.append((delay, palette[indices].reshape(height, width, 3)))
+    assert pos == len(data) - 1
+    return width, height, frames
+
+
+def _noise(h, w, seed, levels=256):
+    rng = np.random.default_rng(seed)
+    return (rng.integers(0, levels, (h, w, 3)) * (256 // levels)).astype(np.uint8)
+
+
+def test_png_round_trip():
+    frame = _noise(13, 7, 1)
+    out = io.BytesIO()
+    write_png(out, frame)
+    width, height, rows = _read_png(out.getvalue())
+    assert (width, height) == (7, 13)
+    np.testing.assert_array_equal(rows, frame)
+
+
+def test_png_streams_rows_into_several_idat_chunks(tmp_path):
+    path = tmp_path / "tall.png"
+    frame = _noise(400, 200, 2)
+    with PNGWriter(str(path), 200, 400, level=1) as png:
+        for i in range(0, 400, 7):
+            png.write_rows(frame[i : i + 7])
+    data = path.read_bytes()
+    assert data.count(b"IDAT") > 1
+    np.testing.assert_array_equal(_read_png(data)[2], frame)
+
+
+def test_png_repeated_rows_compress_to_nothing():
+    frame = np.tile(_noise(1, 300, 3), (1000, 1, 1))
+    out = io.BytesIO()
+    write_png(out, frame)
+    assert len(out.getvalue()) < 4000
+    np.testing.assert_array_equal(_read_png(out.getvalue())[2], frame)
+
+
+def test_gif_exact_palette_round_trip():
+    frames = [_noise(9, 11, seed, levels=4) for seed in range(3)]
+    out = io.BytesIO()
+    assert write_gif(out, frames, fps=25) == 3
+    width, height, decoded = _read_gif(out.getvalue())
+    assert (width, height) == (11, 9)
+    for (delay, got), want in zip(decoded, frames):
+        assert delay == 4
+        np.testing.assert_array_equal(got, want)
+
+
+def test_gif_table_resets_and_quantizes_past_256_colors():
+    frame = _noise(120, 150, 4)
+    out = io.BytesIO()
+    with GIFWriter(out, 150, 120) as gif:
+        gif.add_frame(frame, delay=1.5)
+        gif.add_frame(frame[..., ::-1].copy())
+    _, _, decoded = _read_gif(out.getvalue())
+    assert [d for d, _ in decoded] == [150, 10]
+    # 3-3-2 bits: red and green within 16 of the original, blue within 32
+    err = np.abs(decoded[0][1].astype(int) - frame)
+    assert err[..., :2].max() <= 16 and err[..., 2].max() <= 32
+
+
+def test_gif_single_color_and_single_pixel():
+    for shape in ((1, 1, 3), (64, 64, 3)):
+        frame = np.full(shape, 77, dtype=np.uint8)
+        out = io.BytesIO()
+        write_gif(out, [frame])
+        np.testing.assert_array_equal(_read_gif(out.getvalue())[2][0][1], frame)
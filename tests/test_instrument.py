@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+from rgbw_colorspace_converter.colors import converters, instrument
+from rgbw_colorspace_converter.colors.util import morph
+
+
+def test_counts_functions_and_properties():
+    originals = (converters.hsv_to_rgbw, converters.Color.rgbw, morph.HSV)
+    instrument.reset()
+    instrument.enable()
+    try:
+        c = converters.RGB(255, 0, 0)
+        c.rgbw
+        c.rgbw  # cached, no second conversion
+        c.rgb_g = 128
+        c.rgbw
+        steps = list(morph.color_transition(c, converters.RGB(0, 0, 255), steps=3))
+        snap = instrument.snapshot(reset=True)
+    finally:
+        instrument.disable()
+
+    assert snap["RGB"]["calls"] == 2
+    assert snap["Color.rgbw"]["calls"] == 3
+    assert snap["hsv_to_rgbw"]["calls"] == 2
+    assert snap["Color.rgb_g="]["calls"] == 1
+    # morph imported HSV by name, that copy is counted too
+    assert snap["HSV"]["calls"] == len(steps)
+    assert all(v["seconds"] >= 0.0 for v in snap.values())
+    assert instrument.snapshot() == {}
+
+    assert (converters.hsv_to_rgbw, converters.Color.rgbw, morph.HSV) == originals
+    assert not instrument.enabled()
+
+
+def test_disabled_counts_nothing():
+    instrument.reset()
+    converters.RGB(1, 2, 3).rgbw
+    assert instrument.snapshot() == {}
+
+
+def test_enabled_from_environment():
+    code = (
+        "from rgbw_colorspace_converter.colors import converters, instrument;"
+        "converters.HSV(0.5, 1.0, 1.0).hex;"
+        "print(instrument.enabled(), instrument.snapshot()['Color.hex']['calls'])"
+    )
+    env = dict(os.environ, RGBW_CC_INSTRUMENT="1")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert out.stdout.split() == ["True", "1"], out.stderr
@@ -0,0 +1,44 @@
+import struct
+
+import numpy as np
+import pytest
+
+from rgbw_colorspace_converter.colors import batch, lut
+from rgbw_colorspace_converter.colors.converters import RGB
+
+
+@pytest.fixture(scope="module")
+def lut_path(tmp_path_factory):
+    return lut.build_lut(str(tmp_path_factory.mktemp("lut") / "t.lut"), workers=2)
+
+
+def test_lookup_matches_rgbw(lut_path):
+    table = lut.load_lut(lut_path, verify=True)
+    rng = np.random.default_rng(3)
+    rgb = rng.integers(0, 256, (20000, 3), dtype=np.uint8)
+    assert (table.lookup(rgb) == batch.rgb_to_rgbw(rgb)).all()
+    assert (table.lookup_packed(batch.pack_rgb(rgb)) == table(rgb)).all()
+
+    for c in (RGB(176, 205, 230), RGB(69, 13, 152), RGB(234, 56, 137)):
+        assert tuple(table.lookup([c.rgb])[0]) == c.rgbw
+
+
+def test_table_is_read_only(lut_path):
+    table = lut.load_lut(lut_path)
+    with pytest.raises(ValueError):
+        table.table[0] = 1
+
+
+def test_stale_table_is_rejected(lut_path, tmp_path, monkeypatch):
+    stale = tmp_path / "stale.lut"
+    stale.write_bytes(open(lut_path, "rb").read(lut.HEADER_SIZE))
+    with open(stale, "r+b") as fh:
+        fh.seek(8)
+        fh.write(struct.pack("<I", lut.LUT_VERSION + 1))
+    with pytest.raises(ValueError, match="stale"):
+        lut.RGBWLookupTable(str(stale))
+
+    # same version, but the conversion math moved underneath it
+    monkeypatch.setattr(lut, "rgb_to_rgbw", lambda rgb: batch.rgb_to_rgbw(rgb) // 2)
+    with pytest.raises(ValueError, match="stale"):
+        lut.RGBWLookupTable(lut_path)
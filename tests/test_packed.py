@@ -0,0 +1,64 @@
+from array import array
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors.color_array import ColorArray
+from rgbw_colorspace_converter.colors.converters import (
+    HSV,
+    RGB,
+    Color,
+    hsi_to_rgbw,
+    int_to_rgb,
+    int_to_rgbw,
+    rgb_to_hsi,
+    rgb_to_int,
+    rgbw_to_int,
+)
+
+PACKED = np.random.default_rng(17).integers(0, 1 << 24, 5000, dtype=np.uint32)
+
+
+def test_scalar_pack_unpack():
+    assert rgb_to_int(0xB0, 0xCD, 0xE6) == 0xB0CDE6
+    assert int_to_rgb(0xB0CDE6) == (0xB0, 0xCD, 0xE6)
+    assert rgbw_to_int(1, 2, 3, 4) == 0x01020304
+    assert int_to_rgbw(0x01020304) == (1, 2, 3, 4)
+
+
+def test_color_int_round_trip():
+    for n in PACKED[:500].tolist():
+        c = Color.from_int(n)
+        assert c.to_int() == rgb_to_int(*c.rgb)
+        assert c.to_rgbw_int() == rgbw_to_int(*c.rgbw)
+
+
+def test_equality_and_hash_follow_packed_rgb():
+    a, b = RGB(10, 20, 30), RGB(10, 20, 30)
+    assert a == b and a is not b
+    assert hash(a) == hash(b) == a.to_int()
+    assert len({a, b, RGB(10, 20, 31)}) == 2
+    assert a != RGB(10, 20, 31)
+    # hsv that differs below 8 bits of rgb is the same color on the wire
+    assert HSV(0.5, 0.5, 0.5) == HSV(0.5, 0.5, 0.5000001)
+    assert a != a.to_int()
+
+
+def test_batch_packed_rgbw_matches_color():
+    rgbw = batch.int_to_rgbw_int(array("I", PACKED.tolist()))
+    assert rgbw.dtype == np.uint32
+    assert (rgbw == batch.pack_rgbw(batch.rgb_to_rgbw(batch.unpack_rgb(PACKED)))).all()
+    for n, w in zip(PACKED[:300].tolist(), rgbw[:300].tolist()):
+        assert hsi_to_rgbw(*rgb_to_hsi(*int_to_rgb(n))) == int_to_rgbw(w)
+
+    out = np.zeros(len(PACKED), dtype=np.uint32)
+    assert batch.int_to_rgbw_int(PACKED, out=out) is out
+    assert (out == rgbw).all()
+    assert rgbw[:2].astype(">u4").tobytes() == batch.unpack_rgbw(rgbw[:2]).tobytes()
+
+
+def test_color_array_packed():
+    frame = ColorArray.from_int(PACKED)
+    assert (frame.to_int() == batch.pack_rgb(frame.rgb)).all()
+    assert (frame.to_rgbw_int() == batch.pack_rgbw(frame.rgbw)).all()
+    assert (batch.unpack_rgbw(batch.pack_rgbw(frame.rgbw)) == frame.rgbw).all()
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from rgbw_colorspace_converter.colors.converters import RGB
+from rgbw_colorspace_converter.tools import palette
+from rgbw_colorspace_converter.tools.palette import (
+    TRUECOLOR,
+    XTERM_256,
+    color_depth,
+    color_index,
+    quantize,
+    sgr,
+)
+
+
+def _nearest(rgb, colors):
+    "the exhaustive search the cube stands in for"
+    first = 16 if colors == 256 else 0
+    pal = XTERM_256[first : first + (240 if colors == 256 else 16)].astype(float)
+    d = ((rgb[:, None, :].astype(float) - pal[None]) ** 2).sum(axis=-1)
+    return d, d.argmin(axis=1) + first
+
+
+def test_palette_entries():
+    assert XTERM_256.shape == (256, 3)
+    assert tuple(XTERM_256[16]) == (0, 0, 0)
+    assert tuple(XTERM_256[196]) == (255, 0, 0)
+    assert tuple(XTERM_256[231]) == (255, 255, 255)
+    assert tuple(XTERM_256[232]) == (8, 8, 8) and tuple(XTERM_256[255]) == (238,) * 3
+
+
+def test_palette_colors_map_to_themselves():
+    idx = np.arange(16, 256)
+    # grays 8 apart from a cube gray can tie, compare the colors not the index
+    np.testing.assert_array_equal(XTERM_256[quantize(XTERM_256[16:])], XTERM_256[idx])
+    assert color_index(RGB(255, 0, 0)) == 196
+    assert color_index(RGB(255, 0, 0), colors=16) == 9
+    assert color_index(0x5F87AF) == 67
+
+
+@pytest.mark.parametrize("colors", [256, 16])
+def test_cube_close_to_exhaustive_search(colors):
+    rgb = np.random.default_rng(5).integers(0, 256, (20000, 3), dtype=np.uint8)
+    q = quantize(rgb, colors)
+    d, exact = _nearest(rgb, colors)
+    first = 16 if colors == 256 else 0
+    assert (q == exact).mean() > 0.97
+    # when it misses, by no more than the size of a cube cell
+    extra = np.sqrt(d[np.arange(len(rgb)), q - first]) - np.sqrt(d.min(axis=1))
+    step = 256 >> palette.CUBE_BITS
+    assert extra.max() <= step * np.sqrt(3)
+
+
+def test_quantize_keeps_shape():
+    frame = np.zeros((4, 5, 3), dtype=np.uint8)
+    assert quantize(frame).shape == (4, 5)
+    assert quantize(frame).dtype == np.uint8
+
+
+def test_color_depth():
+    assert color_depth({"COLORTERM": "truecolor", "TERM": "xterm"}) == TRUECOLOR
+    assert color_depth({"TERM": "xterm-direct"}) == TRUECOLOR
+    assert color_depth({"TERM": "screen-256color"}) == 256
+    assert color_depth({"TERM": "xterm"}) == 16
+    assert color_depth({}) == 16
+
+
+def test_sgr():
+    assert sgr(202) == "38;5;202"
+    assert sgr(202, background=True) == "48;5;202"
+    assert sgr(1, colors=16) == "31" and sgr(9, colors=16) == "91"
+    assert sgr(0, colors=16, background=True) == "40"
+    assert sgr(15, colors=16, background=True) == "107"
+
+
+def test_grid_shortcut_matches_search():
+    points = np.random.default_rng(6).uniform(0, 255, (5000, 3))
+    fast = palette._nearest_256(points)
+    slow = palette._search(points, 16, XTERM_256[16:])
+    np.testing.assert_array_equal(XTERM_256[fast], XTERM_256[slow])
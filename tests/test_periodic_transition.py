@@ -0,0 +1,81 @@
+import itertools
+import tracemalloc
+
+from rgbw_colorspace_converter.colors.converters import HSV, RGB
+from rgbw_colorspace_converter.colors.util.morph import (
+    PeriodicTransition,
+    color_transition,
+    multistep_color_transition,
+    pairwise,
+)
+
+
+def _stops():
+    return [RGB(255, 0, 0), RGB(0, 255, 0), HSV(0.95, 0.2, 0.7), RGB(9, 9, 9)]
+
+
+def _cycled(color_list, steps):
+    "what continuous=True gave before: every leg chained and cycled"
+    color_list = color_list + [color_list[0]]
+    legs = [color_transition(a, b, steps) for a, b in pairwise(color_list)]
+    return itertools.cycle(itertools.chain.from_iterable(legs))
+
+
+def test_same_colors_as_cycling_the_chain():
+    for steps in (1, 3, 20):
+        want = list(itertools.islice(_cycled(_stops(), steps), 500))
+        got = list(itertools.islice(PeriodicTransition(_stops(), steps), 500))
+        assert [c.hsv for c in got] == [c.hsv for c in want]
+        cont = multistep_color_transition(_stops(), steps, continuous=True)
+        assert [c.hsv for c in itertools.islice(cont, 500)] == [c.hsv for c in want]
+
+
+def test_random_access_by_step_number():
+    pt = PeriodicTransition(_stops(), 10)
+    seq = list(itertools.islice(pt, 2 * len(pt) + 5))
+    assert (
+        len(pt)
+        == pt.period
+        == sum(
+            len(list(color_transition(a, b, 10)))
+            for a, b in pairwise(_stops() + [_stops()[0]])
+        )
+    )
+    for k in (0, 1, 9, 10, 11, len(pt) - 1, len(pt), 2 * len(pt) + 4):
+        assert pt[k].hsv == seq[k].hsv
+    assert pt[-1].hsv == seq[len(pt) - 1].hsv
+
+
+def test_input_list_left_alone():
+    stops = _stops()
+    ids = [id(c) for c in stops]
+    next(multistep_color_transition(stops, 5, continuous=True))
+    PeriodicTransition(stops, 5)
+    assert [id(c) for c in stops] == ids
+    # a list already back at its start gets no extra leg
+    closed = stops + [stops[0]]
+    assert PeriodicTransition(closed, 5).period == PeriodicTransition(stops, 5).period
+
+
+def test_single_color_is_empty():
+    assert list(PeriodicTransition([RGB(1, 2, 3)])) == []
+
+
+def test_memory_stays_flat_over_a_long_run():
+    # 20 stops x 500 steps: a 10,000 color period, run through three times
+    stops = [HSV(i / 20.0, 1.0, 0.5 + (i % 2) / 4.0) for i in range(20)]
+    seq = multistep_color_transition(stops, 500, continuous=True)
+    for _ in itertools.islice(seq, 1000):
+        pass
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        checkpoints = []
+        for n in range(6):
+            for _ in itertools.islice(seq, 5000):
+                pass
+            checkpoints.append(tracemalloc.get_traced_memory()[0] - base)
+    finally:
+        tracemalloc.stop()
+    # itertools.cycle would be holding every Color of the first pass here
+    assert max(checkpoints) < 64 * 1024, checkpoints
@@ -0,0 +1,68 @@
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors.color_array import ColorArray
+from rgbw_colorspace_converter.colors.converters import (
+    RGB,
+    RGBW,
+    Color,
+    rgbw_to_hsi,
+    rgbw_to_rgb,
+)
+
+LEVELS = sorted(set(range(0, 256, 5)) | {1, 2, 254, 255})
+RGB_GRID = np.array([(r, g, b) for r in LEVELS for g in LEVELS for b in LEVELS])
+
+
+def test_decoded_rgb_is_close_and_reencodes():
+    rgbw = batch.rgb_to_rgbw(RGB_GRID)
+    back = batch.rgbw_to_rgb(rgbw)
+    assert back.dtype == np.uint8
+    assert np.abs(back.astype(int) - RGB_GRID).max() <= 2
+    assert (batch.rgb_to_rgbw(back) == rgbw).all(axis=-1).mean() > 0.999
+    assert np.abs(batch.rgb_to_rgbw(back).astype(int) - rgbw).max() <= 1
+
+
+def test_scalar_matches_batch():
+    rgbw = np.concatenate(
+        [
+            batch.rgb_to_rgbw(RGB_GRID[::5]),
+            np.random.default_rng(3).integers(0, 256, (3000, 4)),
+        ]
+    )
+    hsi = batch.rgbw_to_hsi(rgbw)
+    rgb = batch.rgbw_to_rgb(rgbw)
+    for i, t in enumerate(rgbw.tolist()):
+        assert np.allclose(rgbw_to_hsi(*t), hsi[i], rtol=0, atol=1e-9)
+        assert rgbw_to_rgb(*t) == tuple(rgb[i])
+
+
+def test_dark_and_white_channels():
+    assert rgbw_to_hsi(0, 0, 0, 0) == (0.0, 0.0, 0.0)
+    assert rgbw_to_hsi(0, 0, 0, 255) == (0.0, 0.0, 1.0)
+    white = rgbw_to_rgb(0, 0, 0, 254)
+    assert RGB(*white).rgbw == (0, 0, 0, 254)
+    assert max(white) - min(white) <= 1
+    # all three colors lit is never an hsi_to_rgbw output, the shared part is white
+    assert rgbw_to_hsi(10, 10, 10, 0) == rgbw_to_hsi(0, 0, 0, 10)
+
+
+def test_color_from_rgbw():
+    for rgb in [(255, 0, 0), (176, 205, 230), (69, 13, 152), (0, 0, 0)]:
+        rgbw = RGB(*rgb).rgbw
+        c = RGBW(*rgbw)
+        assert isinstance(c, Color)
+        assert c.rgbw == rgbw
+        assert c.hsv == Color.from_rgbw(*rgbw).hsv
+
+    frame = batch.rgb_to_rgbw(RGB_GRID[:500])
+    decoded = ColorArray.from_rgbw(frame)
+    assert len(decoded) == 500
+    assert (decoded.rgbw == [RGBW(*t).rgbw for t in frame.tolist()]).all()
+
+    try:
+        RGBW(0, 0, 0, 256)
+    except AssertionError:
+        pass
+    else:
+        raise AssertionError("malformed rgbw was accepted")
@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pytest
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.output.sharded import (
+    SHARD_ALIGN,
+    ShardedRenderer,
+    shard_bounds,
+)
+
+
+def rainbow(index, t):
+    hsv = np.empty((len(index), 3))
+    hsv[:, 0] = (index / 997.0 + t) % 1.0
+    hsv[:, 1] = 0.25 + (index % 4) / 4.0
+    hsv[:, 2] = 1.0 - (index % 7) / 10.0
+    return hsv
+
+
+def stripes(index, t):
+    rgbw = np.zeros((len(index), 4), dtype=np.uint8)
+    rgbw[:, int(t) % 4] = index % 256
+    return rgbw
+
+
+def broken(index, t):
+    if index[0] > 0:
+        raise ValueError("bad shard")
+    return rainbow(index, t)
+
+
+def dies(index, t):
+    if index[0] > 0:
+        os._exit(3)
+    return rainbow(index, t)
+
+
+def test_shard_bounds():
+    bounds = shard_bounds(1000, 3)
+    assert bounds[0][0] == 0 and bounds[-1][1] == 1000
+    assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+    assert all(start % SHARD_ALIGN == 0 for start, _ in bounds)
+    # fewer pixels than shards leaves some shards empty, still covering it all
+    assert shard_bounds(5, 4) == [(0, 5), (5, 5), (5, 5), (5, 5)]
+
+
+def test_sharded_matches_single_process():
+    expected = batch.hsv_to_rgbw(rainbow(np.arange(5003), 0.3))
+    for workers in (0, 1, 3):
+        with ShardedRenderer(rainbow, 5003, workers=workers) as renderer:
+            for t in (0.1, 0.3):
+                frame = renderer.render(t)
+            np.testing.assert_array_equal(frame, expected)
+
+
+def test_rgbw_space():
+    with ShardedRenderer(stripes, 600, workers=2, space="rgbw") as renderer:
+        frame = renderer.render(2).copy()
+    assert (frame[:, [0, 1, 3]] == 0).all()
+    np.testing.assert_array_equal(frame[:, 2], np.arange(600) % 256)
+
+
+def test_worker_error_is_raised():
+    renderer = ShardedRenderer(broken, 1000, workers=2)
+    with pytest.raises(RuntimeError, match="bad shard"):
+        renderer.render(0.0)
+    renderer.close()  # already closed, a no-op
+
+
+def test_dead_worker_is_raised():
+    renderer = ShardedRenderer(dies, 1000, workers=2)
+    with pytest.raises(RuntimeError, match="exit code 3"):
+        renderer.render(0.0)
+    assert renderer._shm is None
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+
+from rgbw_colorspace_converter.output.dmx import (
+    ArtNetPacketizer,
+    PatchMap,
+    SACNPacketizer,
+)
+from rgbw_colorspace_converter.output.streamer import FrameStreamer, JitterListener
+
+
+def _stream(packetizer, frames, fps, listeners=2, **listener_kwargs):
+    "stream `frames` ticks to local listeners, odd universes to one, even to the other"
+
+    async def go():
+        ls = [await JitterListener.start(**listener_kwargs) for _ in range(listeners)]
+        routes = lambda u: ls[u % listeners].address
+        streamer = FrameStreamer(packetizer, routes, fps=fps)
+        rng = np.random.default_rng(1)
+        streamer.submit(rng.integers(0, 256, (packetizer.patch.pixels, 4), np.uint8))
+        await streamer.run(frames=frames)
+        await asyncio.sleep(0.05)
+        for listener in ls:
+            listener.close()
+        return streamer, ls
+
+    return asyncio.run(go())
+
+
+def test_stream_sacn_no_loss_steady_pacing():
+    sacn = SACNPacketizer(PatchMap.linear(1000))  # 8 universes
+    streamer, listeners = _stream(sacn, frames=40, fps=100)
+    assert streamer.stats.frames == 40
+    assert streamer.stats.repeats == 39
+    assert streamer.stats.datagrams == 40 * 8
+
+    reports = {}
+    for listener in listeners:
+        reports.update(listener.report())
+    assert sorted(int.from_bytes(k, "big") for k in reports) == list(range(1, 9))
+    for r in reports.values():
+        assert r["received"] == 40
+        assert r["lost"] == 0
+        # loose bounds, this has to pass on a busy CI box
+        assert 0.005 < r["interval"] < 0.02
+        assert r["jitter"] < 0.01
+
+
+def test_stream_artnet_listener_keys():
+    artnet = ArtNetPacketizer(PatchMap.linear(300, start_universe=0))
+    streamer, listeners = _stream(
+        artnet,
+        frames=10,
+        fps=200,
+        key_at=(14, 16),
+        sequence_at=12,
+        sequence_period=255,
+    )
+    received = sum(r["received"] for l in listeners for r in l.report().values())
+    assert received == 10 * 3
+    assert all(r["lost"] == 0 for l in listeners for r in l.report().values())
+
+
+def test_listener_counts_sequence_gaps():
+    listener = JitterListener(key_at=(0, 1), sequence_at=1)
+    for seq in (254, 255, 0, 3, 4):
+        listener.datagram_received(bytes([7, seq]), None)
+    (r,) = listener.report().values()
+    assert r["received"] == 5
+    assert r["lost"] == 2
+
+
+def test_listener_art_net_sequence_skips_zero():
+    listener = JitterListener(key_at=(0, 1), sequence_at=1, sequence_period=255)
+    # Art-Net wraps 255 -> 1, then 3 is missing
+    for seq in (254, 255, 1, 2, 4):
+        listener.datagram_received(bytes([7, seq]), None)
+    (r,) = listener.report().values()
+    assert r["received"] == 5
+    assert r["lost"] == 1
+
+
+class _Recorder:
+    def __init__(self):
+        self.sent = []
+
+    def sendto(self, data, addr):
+        self.sent.append((bytes(data), addr))
+
+
+def test_coalesce_per_destination():
+    sacn = SACNPacketizer(PatchMap.linear(1000))
+    routes = {u: ("a", 1) if u <= 5 else ("b", 2) for u in range(1, 9)}
+    streamer = FrameStreamer(sacn, routes, max_datagram=3 * 638)
+    streamer.transport = _Recorder()
+    streamer.send_frame()
+    sizes = [(addr, len(data)) for data, addr in streamer.transport.sent]
+    # 5 packets to a (3 + 2), 3 to b (the last one holds 104 pixels)
+    assert sizes == [
+        (("a", 1), 3 * 638),
+        (("a", 1), 2 * 638),
+        (("b", 2), 2 * 638 + 126 + 104 * 4),
+    ]
+
+
+def test_unrouted_universes_are_dropped():
+    sacn = SACNPacketizer(PatchMap.linear(300))
+    streamer = FrameStreamer(sacn, {2: ("b", 2)})
+    streamer.transport = _Recorder()
+    streamer.send_frame()
+    assert [addr for _, addr in streamer.transport.sent] == [("b", 2)]
+
+
+def test_double_buffer_sends_latest_frame():
+    sacn = SACNPacketizer(PatchMap.linear(4))
+    streamer = FrameStreamer(sacn, {1: ("a", 1)})
+    streamer.transport = _Recorder()
+    first = np.full((4, 4), 1, np.uint8)
+    second = np.full((4, 4), 2, np.uint8)
+    streamer.submit(first)
+    streamer.submit(second)
+    first[...] = 9  # submit copied, later writes don't leak into the frame
+    streamer.send_frame()
+    streamer.send_frame()
+    (a, _), (b, _) = streamer.transport.sent
+    assert a[126:] == bytes([2] * 16) == b[126:]
+    assert streamer.stats.repeats == 1
+
+
+def test_submit_from_render_thread():
+    sacn = SACNPacketizer(PatchMap.linear(128))
+
+    async def go():
+        listener = await JitterListener.start()
+        streamer = FrameStreamer(sacn, {1: listener.address}, fps=200)
+        stop = threading.Event()
+
+        def render():
+            frame = np.zeros((128, 4), np.uint8)
+            while not stop.is_set():
+                frame[...] = frame[0, 0] + 1
+                streamer.submit(frame)
+                time.sleep(0.001)
+
+        t = threading.Thread(target=render)
+        t.start()
+        await streamer.run(frames=20)
+        stop.set()
+        t.join()
+        await asyncio.sleep(0.05)
+        listener.close()
+        return streamer, listener
+
+    streamer, listener = asyncio.run(go())
+    (r,) = listener.report().values()
+    assert r["received"] == 20 and r["lost"] == 0
+    assert streamer.stats.repeats < 20
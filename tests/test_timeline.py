@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from rgbw_colorspace_converter.colors.converters import HSV, RGB
+from rgbw_colorspace_converter.colors.util.morph import color_transition
+from rgbw_colorspace_converter.colors.util.timeline import EASINGS, Timeline
+
+
+def _keys():
+    return [RGB(255, 0, 0), RGB(0, 0, 255), RGB(255, 255, 255)]
+
+
+def test_linear_segment_matches_color_transition():
+    start, end = RGB(255, 255, 0), RGB(0, 0, 255)
+    tl = Timeline([start, end], durations=2.0)
+    steps = 16
+    for k, color in enumerate(color_transition(start, end, steps)):
+        np.testing.assert_allclose(tl.sample(2.0 * k / steps).hsv, color.hsv)
+        np.testing.assert_array_equal(tl.sample(2.0 * k / steps).rgbw, color.rgbw)
+
+
+def test_random_access_and_holds():
+    tl = Timeline(_keys(), durations=[2.0, 0.5])
+    assert tl.duration == 2.5 and len(tl) == 2
+    assert tl.sample(-1).rgb == (255, 0, 0)
+    assert tl.sample(2.0).rgb == (0, 0, 255)
+    assert tl.sample(99).rgb == (255, 255, 255)
+    # halfway through the second segment, white has hue 0: blue goes up to it
+    np.testing.assert_allclose(tl.sample(2.25).hsv, (5 / 6.0, 0.5, 1.0))
+
+
+def test_vector_sampling_matches_scalar():
+    tl = Timeline(
+        _keys() + [HSV(0.05, 0.3, 0.4)],
+        durations=[1.0, 0.25, 3.0],
+        easing=["ease_in", "step", "sine"],
+    )
+    t = np.random.default_rng(1).uniform(-1, 5, (7, 9))
+    hsv = tl.sample_hsv(t)
+    rgbw = tl.sample_rgbw(t)
+    assert hsv.shape == (7, 9, 3) and rgbw.shape == (7, 9, 4)
+    for idx in np.ndindex(t.shape):
+        np.testing.assert_allclose(hsv[idx], tl.sample(t[idx]).hsv, atol=1e-12)
+        np.testing.assert_array_equal(rgbw[idx], tl.sample(t[idx]).rgbw)
+    # a scalar time is a 0-d t
+    for x in (-1, 0.6, 1.1, 2.0, 9):
+        assert tl.sample_hsv(x).shape == (3,) and tl.sample_rgbw(x).shape == (4,)
+        np.testing.assert_allclose(tl.sample_hsv(x), tl.sample(x).hsv, atol=1e-12)
+        np.testing.assert_array_equal(tl.sample_rgbw(x), tl.sample(x).rgbw)
+
+
+def test_hue_takes_the_short_way_round():
+    tl = Timeline([HSV(0.9, 1, 1), HSV(0.1, 1, 1)], durations=1.0)
+    h = tl.sample_hsv(np.linspace(0, 1, 11))[:, 0]
+    assert ((h >= 0.9) | (h <= 0.1 + 1e-12)).all()
+    assert tl.sample(0.5).hsv[0] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_continuous_wraps_time_and_closes_the_loop():
+    tl = Timeline(_keys(), durations=1.0, continuous=True)
+    assert len(tl) == 3 and tl.duration == 3.0
+    np.testing.assert_allclose(tl.sample(3.5).hsv, tl.sample(0.5).hsv)
+    np.testing.assert_allclose(tl.sample(-0.5).hsv, tl.sample(2.5).hsv)
+    assert tl.sample(3.0).rgb == (255, 0, 0)
+
+
+def test_pixels_with_phase_offsets():
+    tl = Timeline(_keys(), durations=1.0, continuous=True)
+    offsets = np.linspace(0, 3, 50, endpoint=False)
+    frame = tl.pixels(0.25, offsets)
+    assert frame.shape == (50, 4) and frame.dtype == np.uint8
+    np.testing.assert_array_equal(frame, tl.sample_rgbw(0.25 + offsets))
+    frames = tl.pixels(np.arange(4) / 40.0, offsets, space="hsv")
+    assert frames.shape == (4, 50, 3)
+    np.testing.assert_allclose(frames[2], tl.sample_hsv(2 / 40.0 + offsets))
+
+
+def test_easings_fix_the_ends():
+    for name, ease in EASINGS.items():
+        u = np.array([0.0, 1.0])
+        np.testing.assert_allclose(ease(u), [0.0, 1.0], err_msg=name)
+    tl = Timeline(_keys()[:2], easing="ease_in_out")
+    assert tl.sample(0.5).hsv == pytest.approx(Timeline(_keys()[:2]).sample(0.5).hsv)
+    assert tl.sample(0.25).hsv[0] != pytest.approx(
+        Timeline(_keys()[:2]).sample(0.25).hsv[0]
+    )
+
+
+def test_bad_arguments():
+    with pytest.raises(AssertionError):
+        Timeline([RGB(1, 2, 3)])
+    with pytest.raises(AssertionError):
+        Timeline(_keys(), durations=[1.0])
+    with pytest.raises(AssertionError):
+        Timeline(_keys(), durations=0)
+    with pytest.raises(KeyError):
+        Timeline(_keys(), easing="bounce")
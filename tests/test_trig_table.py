@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors import converters
+
+LEVELS = sorted(set(range(0, 256, 5)) | {1, 254, 255})
+RGB_GRID = np.array([(r, g, b) for r in LEVELS for g in LEVELS for b in LEVELS])
+
+
+def random_hsi(n, seed=11):
+    rnd = random.Random(seed)
+    return np.array(
+        [[rnd.uniform(0, 360), rnd.random(), rnd.random()] for _ in range(n)]
+    )
+
+
+def max_error(a, b):
+    return int(np.abs(np.asarray(a, np.int16) - np.asarray(b, np.int16)).max())
+
+
+def test_table_within_one_of_exact():
+    hsi = np.concatenate([batch.rgb_to_hsi(RGB_GRID), random_hsi(5000)])
+    for fn in (batch.hsi_to_rgb, batch.hsi_to_rgbw):
+        assert max_error(fn(hsi, trig="table"), fn(hsi)) <= 1
+    assert (
+        max_error(
+            batch.rgb_to_rgbw(RGB_GRID, trig="table"), batch.rgb_to_rgbw(RGB_GRID)
+        )
+        <= 1
+    )
+    hsv = batch.rgb_to_hsv(RGB_GRID)
+    assert max_error(batch.hsv_to_rgbw(hsv, trig="table"), batch.hsv_to_rgbw(hsv)) <= 1
+
+
+def test_scalar_table_matches_batch_table():
+    hsi = np.concatenate([batch.rgb_to_hsi(RGB_GRID[::7]), random_hsi(2000)])
+    rgb = batch.hsi_to_rgb(hsi, trig="table")
+    rgbw = batch.hsi_to_rgbw(hsi, trig="table")
+    for i, t in enumerate(hsi.tolist()):
+        assert tuple(rgb[i]) == converters.hsi_to_rgb(*t, trig="table")
+        assert tuple(rgb[i]) == converters.hsi_to_rgb_2nd(*t, trig="table")
+        assert tuple(rgbw[i]) == converters.hsi_to_rgbw(*t, trig="table")
+
+    hsv = batch.rgb_to_hsv(RGB_GRID[::7])
+    fused = batch.hsv_to_rgbw(hsv, trig="table")
+    for i, t in enumerate(hsv.tolist()):
+        assert tuple(fused[i]) == converters.hsv_to_rgbw(*t, trig="table")
+
+
+def test_single_row_negative_hue():
+    # below the table's range, so the ratio falls back to exact trig
+    for hsi in ([-0.1, 1.0, 0.5], [-30.0, 0.4, 0.7]):
+        rgbw = batch.hsi_to_rgbw(np.array(hsi), trig="table")
+        assert rgbw.shape == (4,)
+        assert tuple(rgbw) == converters.hsi_to_rgbw(*hsi, trig="table")
+        assert max_error(rgbw, batch.hsi_to_rgbw(np.array(hsi))) <= 1
+        rgb = batch.hsi_to_rgb(np.array(hsi), trig="table")
+        assert tuple(rgb) == converters.hsi_to_rgb(*hsi, trig="table")
+
+
+def test_unknown_trig_mode_asserts():
+    for call in (
+        lambda: converters.hsi_to_rgbw(10.0, 0.5, 0.5, trig="fast"),
+        lambda: batch.hsi_to_rgbw([[10.0, 0.5, 0.5]], trig="fast"),
+        lambda: converters.hsv_to_rgbw(0.5, 0.5, 0.5, trig="fast"),
+        lambda: batch.hsv_to_rgbw([[0.5, 0.5, 0.5]], trig="fast"),
+    ):
+        try:
+            call()
+        except AssertionError:
+            pass
+        else:
+            raise AssertionError("unknown trig mode was accepted")
@@ -0,0 +1,63 @@
+import numpy as np
+
+from rgbw_colorspace_converter.colors import batch
+from rgbw_colorspace_converter.colors.color_array import ColorArray
+from rgbw_colorspace_converter.output.wire import APA102_START, SK6812_RGBW, WireEncoder
+
+FRAME = np.random.default_rng(4).integers(0, 256, (300, 4)).astype(np.uint8)
+
+
+def python_encode(frame, order, brightness=1.0):
+    out = bytearray()
+    for r, g, b, w in frame.tolist():
+        px = {"R": r, "G": g, "B": b, "W": w}
+        out += bytes(int(px[c] * brightness + 0.5) for c in order)
+    return bytes(out)
+
+
+def test_channel_orders():
+    for order in ("GRBW", "RGBW", "WRGB", "GRB", "bgr"):
+        enc = WireEncoder(len(FRAME), order=order)
+        data = enc.encode(FRAME)
+        assert isinstance(data, memoryview)
+        assert bytes(data) == python_encode(FRAME, order.upper())
+    assert (
+        WireEncoder(1, **SK6812_RGBW)
+        .encode(np.array([[1, 2, 3, 4]], np.uint8))
+        .tobytes()
+        == b"\x02\x01\x03\x04"
+    )
+
+
+def test_brightness_and_padding():
+    enc = WireEncoder(
+        len(FRAME), "GRBW", brightness=0.5, start=APA102_START, end=b"\xff" * 3
+    )
+    data = bytes(enc.encode(FRAME))
+    assert data[:4] == APA102_START and data[-3:] == b"\xff" * 3
+    assert data[4:-3] == python_encode(FRAME, "GRBW", 0.5)
+    enc.brightness = 1.0
+    assert bytes(enc.encode(FRAME))[4:-3] == python_encode(FRAME, "GRBW")
+
+
+def test_writes_in_place_into_caller_buffers():
+    enc = WireEncoder(len(FRAME), "WRGB", start=b"\x00\x00", end=b"\x01")
+    big = bytearray(enc.size + 10)
+    view = memoryview(big)[10:]
+    data = enc.encode(FRAME, out=view)
+    assert bytes(big[10:]) == b"\x00\x00" + python_encode(FRAME, "WRGB") + b"\x01"
+    assert bytes(data) == bytes(big[10:])
+    # the encoder's own buffer is reused frame to frame
+    first = enc.encode(FRAME)
+    second = enc.encode(FRAME[::-1].copy())
+    assert first.obj is second.obj is enc.buffer
+
+
+def test_packed_words_and_color_arrays():
+    enc = WireEncoder(len(FRAME), "GRBW")
+    want = bytes(enc.encode(FRAME))
+    assert bytes(enc.encode(batch.pack_rgbw(FRAME))) == want
+
+    frame = ColorArray.from_rgb(np.random.default_rng(1).integers(0, 256, (300, 3)))
+    assert bytes(enc.encode(frame.rgbw)) == python_encode(frame.rgbw, "GRBW")
+    assert bytes(enc.encode(frame.to_rgbw_int())) == python_encode(frame.rgbw, "GRBW")